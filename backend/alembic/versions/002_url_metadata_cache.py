@@ -0,0 +1,34 @@
+"""Shared URL metadata cache
+
+Revision ID: 002_url_metadata_cache
+Revises: 001_initial
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002_url_metadata_cache'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'url_metadata',
+        sa.Column('cache_key', sa.String(64), primary_key=True),
+        sa.Column('kind', sa.String(20), nullable=False),
+        sa.Column('canonical_url', sa.Text(), nullable=False),
+        sa.Column('metadata', postgresql.JSONB()),
+        sa.Column('ok', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('etag', sa.String(255)),
+        sa.Column('last_modified', sa.String(64)),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('url_metadata')
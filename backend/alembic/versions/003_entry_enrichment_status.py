@@ -0,0 +1,27 @@
+"""Add enrichment status to entries
+
+Revision ID: 003_entry_enrichment_status
+Revises: 002_url_metadata_cache
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_entry_enrichment_status'
+down_revision = '002_url_metadata_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows were enriched inline at create time
+    op.add_column(
+        'entries',
+        sa.Column('enrichment_status', sa.String(20), server_default='completed'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('entries', 'enrichment_status')
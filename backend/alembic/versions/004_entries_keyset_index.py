@@ -0,0 +1,28 @@
+"""Index entries for keyset pagination
+
+Revision ID: 004_entries_keyset_index
+Revises: 003_entry_enrichment_status
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004_entries_keyset_index'
+down_revision = '003_entry_enrichment_status'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covers the (created_at, id) tie-break so cursor seeks never re-sort
+    op.create_index(
+        'idx_entries_user_created_id', 'entries', ['user_id', 'created_at', 'id']
+    )
+    # Its (user_id, created_at) prefix makes the old index redundant
+    op.drop_index('idx_entries_user_created', table_name='entries')
+
+
+def downgrade() -> None:
+    op.create_index('idx_entries_user_created', 'entries', ['user_id', 'created_at'])
+    op.drop_index('idx_entries_user_created_id', table_name='entries')
@@ -0,0 +1,42 @@
+"""Per-user entry counters
+
+Revision ID: 005_user_stats
+Revises: 004_entries_keyset_index
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '005_user_stats'
+down_revision = '004_entries_keyset_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('stat', sa.String(50), nullable=False),
+        sa.Column('key', sa.String(100), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'stat', 'key'),
+    )
+
+    # Seed from existing entries
+    op.execute(
+        """
+        INSERT INTO user_stats (user_id, stat, key, value)
+        SELECT user_id, 'content_type', content_type, count(*)
+        FROM entries
+        GROUP BY user_id, content_type
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
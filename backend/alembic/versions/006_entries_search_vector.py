@@ -0,0 +1,44 @@
+"""Stored, weighted tsvector for entry full-text search
+
+Revision ID: 006_entries_search_vector
+Revises: 005_user_stats
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006_entries_search_vector'
+down_revision = '005_user_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Title ranks above the AI summary, which ranks above the body
+    op.add_column(
+        'entries',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(ai_summary, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(content, '')), 'C')",
+                persisted=True,
+            ),
+        ),
+    )
+    op.create_index(
+        'idx_entries_search_vector',
+        'entries',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_entries_search_vector', table_name='entries')
+    op.drop_column('entries', 'search_vector')
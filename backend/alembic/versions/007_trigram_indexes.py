@@ -0,0 +1,45 @@
+"""Trigram indexes for typeahead over titles, URLs and tag names
+
+Revision ID: 007_trigram_indexes
+Revises: 006_entries_search_vector
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007_trigram_indexes'
+down_revision = '006_entries_search_vector'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'idx_entries_title_trgm',
+        'entries',
+        ['title'],
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'idx_entries_url_trgm',
+        'entries',
+        ['url'],
+        postgresql_using='gin',
+        postgresql_ops={'url': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'idx_tags_name_trgm',
+        'tags',
+        ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tags_name_trgm', table_name='tags')
+    op.drop_index('idx_entries_url_trgm', table_name='entries')
+    op.drop_index('idx_entries_title_trgm', table_name='entries')
@@ -0,0 +1,40 @@
+"""Entry embeddings for semantic search
+
+Revision ID: 008_entry_embeddings
+Revises: 007_trigram_indexes
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008_entry_embeddings'
+down_revision = '007_trigram_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'entry_embeddings',
+        sa.Column('entry_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('entry_id'),
+    )
+    op.create_index(
+        'idx_entry_embeddings_user_updated',
+        'entry_embeddings',
+        ['user_id', 'updated_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_entry_embeddings_user_updated', table_name='entry_embeddings')
+    op.drop_table('entry_embeddings')
@@ -0,0 +1,59 @@
+"""MinHash signatures, LSH buckets and precomputed related entries
+
+Revision ID: 009_related_entries
+Revises: 008_entry_embeddings
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009_related_entries'
+down_revision = '008_entry_embeddings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'entry_signatures',
+        sa.Column('entry_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('entry_id'),
+    )
+
+    op.create_table(
+        'entry_lsh_buckets',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('band', sa.SmallInteger(), nullable=False),
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('entry_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'band', 'bucket', 'entry_id'),
+    )
+    op.create_index('idx_entry_lsh_buckets_entry', 'entry_lsh_buckets', ['entry_id'])
+
+    op.create_table(
+        'related_entries',
+        sa.Column('entry_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('related_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['related_id'], ['entries.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('entry_id', 'related_id'),
+    )
+    op.create_index('idx_related_entries_related', 'related_entries', ['related_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_related_entries_related', table_name='related_entries')
+    op.drop_table('related_entries')
+    op.drop_index('idx_entry_lsh_buckets_entry', table_name='entry_lsh_buckets')
+    op.drop_table('entry_lsh_buckets')
+    op.drop_table('entry_signatures')
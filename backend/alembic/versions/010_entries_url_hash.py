@@ -0,0 +1,56 @@
+"""Canonical URL and URL hash on entries, for duplicate detection
+
+Revision ID: 010_entries_url_hash
+Revises: 009_related_entries
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.services.url_utils import canonicalize_url, url_hash
+
+# revision identifiers, used by Alembic.
+revision = '010_entries_url_hash'
+down_revision = '009_related_entries'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('entries', sa.Column('canonical_url', sa.Text(), nullable=True))
+    op.add_column('entries', sa.Column('url_hash', sa.String(64), nullable=True))
+
+    # Backfill in batches; canonicalization lives in Python
+    bind = op.get_bind()
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, url FROM entries "
+                "WHERE url IS NOT NULL AND url_hash IS NULL LIMIT 1000"
+            )
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            sa.text(
+                "UPDATE entries SET canonical_url = :canonical_url, url_hash = :url_hash "
+                "WHERE id = :id"
+            ),
+            [
+                {
+                    'id': row.id,
+                    'canonical_url': canonicalize_url(row.url),
+                    'url_hash': url_hash(row.url),
+                }
+                for row in rows
+            ],
+        )
+
+    # Not unique yet: existing duplicates are merged by `dedupe-entries`
+    op.create_index('idx_entries_user_url_hash', 'entries', ['user_id', 'url_hash'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_entries_user_url_hash', table_name='entries')
+    op.drop_column('entries', 'url_hash')
+    op.drop_column('entries', 'canonical_url')
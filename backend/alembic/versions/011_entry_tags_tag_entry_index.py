@@ -0,0 +1,25 @@
+"""Index entry_tags by (tag_id, entry_id) for tag listings
+
+Revision ID: 011_entry_tags_tag_entry_index
+Revises: 010_entries_url_hash
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '011_entry_tags_tag_entry_index'
+down_revision = '010_entries_url_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Supersedes the single-column tag_id index, which is its prefix
+    op.create_index('idx_entry_tags_tag_entry', 'entry_tags', ['tag_id', 'entry_id'])
+    op.drop_index('idx_entry_tags_tag_id', table_name='entry_tags')
+
+
+def downgrade() -> None:
+    op.create_index('idx_entry_tags_tag_id', 'entry_tags', ['tag_id'])
+    op.drop_index('idx_entry_tags_tag_entry', table_name='entry_tags')
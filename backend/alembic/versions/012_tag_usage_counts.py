@@ -0,0 +1,89 @@
+"""Trigger-maintained tag usage counts
+
+Revision ID: 012_tag_usage_counts
+Revises: 011_entry_tags_tag_entry_index
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012_tag_usage_counts'
+down_revision = '011_entry_tags_tag_entry_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'tags',
+        sa.Column('usage_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    # Statement-level triggers see every row of a bulk insert or delete at
+    # once, including the deletes cascaded from entries and tags
+    op.execute(
+        """
+        CREATE FUNCTION entry_tags_count_inserted() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tags SET usage_count = tags.usage_count + changed.n
+            FROM (SELECT tag_id, count(*) AS n FROM inserted GROUP BY tag_id) changed
+            WHERE tags.id = changed.tag_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION entry_tags_count_deleted() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tags SET usage_count = tags.usage_count - changed.n
+            FROM (SELECT tag_id, count(*) AS n FROM deleted GROUP BY tag_id) changed
+            WHERE tags.id = changed.tag_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER entry_tags_count_inserted
+        AFTER INSERT ON entry_tags
+        REFERENCING NEW TABLE AS inserted
+        FOR EACH STATEMENT EXECUTE FUNCTION entry_tags_count_inserted()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER entry_tags_count_deleted
+        AFTER DELETE ON entry_tags
+        REFERENCING OLD TABLE AS deleted
+        FOR EACH STATEMENT EXECUTE FUNCTION entry_tags_count_deleted()
+        """
+    )
+
+    # Seed from existing assignments
+    op.execute(
+        """
+        UPDATE tags SET usage_count = counts.n
+        FROM (SELECT tag_id, count(*) AS n FROM entry_tags GROUP BY tag_id) counts
+        WHERE tags.id = counts.tag_id
+        """
+    )
+
+    op.create_index(
+        'idx_tags_user_usage',
+        'tags',
+        ['user_id', sa.text('usage_count DESC'), 'name'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tags_user_usage', table_name='tags')
+    op.execute('DROP TRIGGER entry_tags_count_deleted ON entry_tags')
+    op.execute('DROP TRIGGER entry_tags_count_inserted ON entry_tags')
+    op.execute('DROP FUNCTION entry_tags_count_deleted()')
+    op.execute('DROP FUNCTION entry_tags_count_inserted()')
+    op.drop_column('tags', 'usage_count')
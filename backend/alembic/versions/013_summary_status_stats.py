@@ -0,0 +1,30 @@
+"""Per-user summary status counters
+
+Revision ID: 013_summary_status_stats
+Revises: 012_tag_usage_counts
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '013_summary_status_stats'
+down_revision = '012_tag_usage_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Seed from existing entries; the API keeps them current from here on
+    op.execute(
+        """
+        INSERT INTO user_stats (user_id, stat, key, value)
+        SELECT user_id, 'summary_status', coalesce(summary_status, 'pending'), count(*)
+        FROM entries
+        GROUP BY user_id, coalesce(summary_status, 'pending')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM user_stats WHERE stat = 'summary_status'")
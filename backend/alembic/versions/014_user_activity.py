@@ -0,0 +1,68 @@
+"""Per-user daily activity buckets
+
+Revision ID: 014_user_activity
+Revises: 013_summary_status_stats
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '014_user_activity'
+down_revision = '013_summary_status_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_activity',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('metric', sa.String(50), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('key', sa.String(100), nullable=False, server_default=''),
+        sa.Column('value', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'metric', 'day', 'key'),
+    )
+
+    # Tag assignments are counted where they are already aggregated per
+    # statement; history is filled in by `python -m app.commands backfill-activity`
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION entry_tags_count_inserted() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tags SET usage_count = tags.usage_count + changed.n
+            FROM (SELECT tag_id, count(*) AS n FROM inserted GROUP BY tag_id) changed
+            WHERE tags.id = changed.tag_id;
+
+            INSERT INTO user_activity (user_id, metric, day, key, value)
+            SELECT tags.user_id, 'tags_applied', (now() AT TIME ZONE 'UTC')::date,
+                   tags.id::text, count(*)
+            FROM inserted JOIN tags ON tags.id = inserted.tag_id
+            GROUP BY tags.user_id, tags.id
+            ON CONFLICT (user_id, metric, day, key)
+            DO UPDATE SET value = user_activity.value + excluded.value;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION entry_tags_count_inserted() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tags SET usage_count = tags.usage_count + changed.n
+            FROM (SELECT tag_id, count(*) AS n FROM inserted GROUP BY tag_id) changed
+            WHERE tags.id = changed.tag_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.drop_table('user_activity')
@@ -0,0 +1,216 @@
+"""Per-user term vocabulary and indexes for typeahead
+
+Revision ID: 015_suggest_terms
+Revises: 014_user_activity
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '015_suggest_terms'
+down_revision = '014_user_activity'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    # Lowercased words of the title and URL, shared by the index and triggers.
+    # Kept to one expression so the planner inlines it; words may repeat
+    op.execute(
+        """
+        CREATE FUNCTION entry_suggest_terms(title text, url text) RETURNS text[] AS $$
+            SELECT regexp_split_to_array(
+                lower(coalesce(title, '') || ' ' || coalesce(url, '')),
+                '[^[:alnum:]]+'
+            )
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        """
+    )
+
+    op.create_table(
+        'suggest_terms',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('term', sa.Text(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'term'),
+    )
+    op.create_index(
+        'idx_suggest_terms_user_trgm',
+        'suggest_terms',
+        ['user_id', 'term'],
+        postgresql_using='gist',
+        postgresql_ops={'term': 'gist_trgm_ops'},
+    )
+
+    # Statement-level like the tag counts; digits-only terms are matched
+    # exactly rather than by similarity, so they stay out of the vocabulary
+    op.execute(
+        """
+        CREATE FUNCTION entries_terms_inserted() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO suggest_terms (user_id, term, entry_count)
+            SELECT user_id, term, count(DISTINCT id)
+            FROM inserted, unnest(entry_suggest_terms(title, url)) AS term
+            WHERE term ~ '[[:alpha:]]'
+            GROUP BY user_id, term
+            ON CONFLICT (user_id, term)
+            DO UPDATE SET entry_count = suggest_terms.entry_count + excluded.entry_count;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION entries_terms_deleted() RETURNS trigger AS $$
+        BEGIN
+            UPDATE suggest_terms SET entry_count = suggest_terms.entry_count - changed.n
+            FROM (
+                SELECT user_id, term, count(DISTINCT id) AS n
+                FROM deleted, unnest(entry_suggest_terms(title, url)) AS term
+                GROUP BY user_id, term
+            ) changed
+            WHERE suggest_terms.user_id = changed.user_id
+              AND suggest_terms.term = changed.term;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Most updates are status changes, so only rows whose words moved count
+    op.execute(
+        """
+        CREATE FUNCTION entries_terms_updated() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO suggest_terms (user_id, term, entry_count)
+            SELECT user_id, term, sum(n)
+            FROM (
+                SELECT DISTINCT moved.id, moved.user_id, term, moved.n
+                FROM (
+                    SELECT id, new_row.user_id, new_row.title, new_row.url, 1 AS n
+                    FROM inserted new_row JOIN deleted old_row USING (id)
+                    WHERE (old_row.title, old_row.url)
+                          IS DISTINCT FROM (new_row.title, new_row.url)
+                    UNION ALL
+                    SELECT id, old_row.user_id, old_row.title, old_row.url, -1
+                    FROM inserted new_row JOIN deleted old_row USING (id)
+                    WHERE (old_row.title, old_row.url)
+                          IS DISTINCT FROM (new_row.title, new_row.url)
+                ) moved, unnest(entry_suggest_terms(moved.title, moved.url)) AS term
+            ) words
+            WHERE term ~ '[[:alpha:]]'
+            GROUP BY user_id, term
+            HAVING sum(n) <> 0
+            ON CONFLICT (user_id, term)
+            DO UPDATE SET entry_count = suggest_terms.entry_count + excluded.entry_count;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER entries_terms_inserted
+        AFTER INSERT ON entries
+        REFERENCING NEW TABLE AS inserted
+        FOR EACH STATEMENT EXECUTE FUNCTION entries_terms_inserted()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER entries_terms_deleted
+        AFTER DELETE ON entries
+        REFERENCING OLD TABLE AS deleted
+        FOR EACH STATEMENT EXECUTE FUNCTION entries_terms_deleted()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER entries_terms_updated
+        AFTER UPDATE ON entries
+        REFERENCING OLD TABLE AS deleted NEW TABLE AS inserted
+        FOR EACH STATEMENT EXECUTE FUNCTION entries_terms_updated()
+        """
+    )
+
+    # Seed from existing entries
+    op.execute(
+        """
+        INSERT INTO suggest_terms (user_id, term, entry_count)
+        SELECT user_id, term, count(DISTINCT id)
+        FROM entries, unnest(entry_suggest_terms(title, url)) AS term
+        WHERE term ~ '[[:alpha:]]'
+        GROUP BY user_id, term
+        """
+    )
+
+    op.create_index(
+        'idx_entries_suggest_terms',
+        'entries',
+        [sa.text('entry_suggest_terms(title, url)')],
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'idx_entries_user_title_prefix',
+        'entries',
+        ['user_id', sa.text('lower(title) text_pattern_ops')],
+    )
+    op.create_index(
+        'idx_tags_user_name_trgm',
+        'tags',
+        ['user_id', 'name'],
+        postgresql_using='gist',
+        postgresql_ops={'name': 'gist_trgm_ops'},
+    )
+    op.create_index(
+        'idx_tags_user_name_prefix',
+        'tags',
+        ['user_id', sa.text('lower(name) text_pattern_ops')],
+    )
+
+    # Typeahead was their only reader, and they are global rather than per user
+    op.drop_index('idx_tags_name_trgm', table_name='tags')
+    op.drop_index('idx_entries_url_trgm', table_name='entries')
+    op.drop_index('idx_entries_title_trgm', table_name='entries')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'idx_entries_title_trgm',
+        'entries',
+        ['title'],
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'idx_entries_url_trgm',
+        'entries',
+        ['url'],
+        postgresql_using='gin',
+        postgresql_ops={'url': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'idx_tags_name_trgm',
+        'tags',
+        ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.drop_index('idx_tags_user_name_prefix', table_name='tags')
+    op.drop_index('idx_tags_user_name_trgm', table_name='tags')
+    op.drop_index('idx_entries_user_title_prefix', table_name='entries')
+    op.drop_index('idx_entries_suggest_terms', table_name='entries')
+    op.execute('DROP TRIGGER entries_terms_updated ON entries')
+    op.execute('DROP TRIGGER entries_terms_deleted ON entries')
+    op.execute('DROP TRIGGER entries_terms_inserted ON entries')
+    op.execute('DROP FUNCTION entries_terms_updated()')
+    op.execute('DROP FUNCTION entries_terms_deleted()')
+    op.execute('DROP FUNCTION entries_terms_inserted()')
+    op.drop_table('suggest_terms')
+    op.execute('DROP FUNCTION entry_suggest_terms(text, text)')
@@ -7,6 +7,7 @@ from app.models.user import User
 from app.models.entry import Entry
 from app.schemas.entry import SummaryResponse, SummaryStatus
 from app.services.ai_service import generate_summary
+from app.services.enrichment import enqueue_text_indexing
 
 router = APIRouter()
 
@@ -37,6 +38,7 @@ async def summarize_entry(
 
     # Add background task
     background_tasks.add_task(generate_summary, entry_id, db)
+    background_tasks.add_task(enqueue_text_indexing, [entry_id])
 
     return SummaryResponse(summary=None, status=SummaryStatus.PROCESSING)
 
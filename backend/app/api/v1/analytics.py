@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from app.core.cache import cached_json_response, user_cache_key
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
-from app.models.entry import Entry, Tag, EntryTag
-from typing import Dict, Any
+from app.schemas.analytics import (
+    ActivityMetric,
+    Granularity,
+    TimeseriesPoint,
+    TimeseriesResponse,
+)
+from app.services.stats_service import (
+    MAX_TIMESERIES_DAYS,
+    get_overview,
+    get_timeseries,
+    timeseries_start,
+)
 
 router = APIRouter()
 
@@ -15,52 +27,59 @@ async def get_analytics_overview(
     current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Get user analytics overview"""
-    # Total entries
-    total_entries = db.query(Entry).filter(Entry.user_id == current_user.id).count()
+    cache_key = user_cache_key(current_user.id, "analytics", "overview")
 
-    # Entries by type
-    entries_by_type = (
-        db.query(Entry.content_type, func.count(Entry.id))
-        .filter(Entry.user_id == current_user.id)
-        .group_by(Entry.content_type)
-        .all()
-    )
-    entries_by_type_dict = {entry_type: count for entry_type, count in entries_by_type}
+    def load():
+        return get_overview(db, current_user.id)
+
+    # Cached until the user's next write bumps the generation
+    return await cached_json_response("analytics", cache_key, load, 600)
 
-    # Top tags
-    top_tags = (
-        db.query(Tag.name, func.count(EntryTag.entry_id).label("count"))
-        .join(EntryTag, Tag.id == EntryTag.tag_id)
-        .join(Entry, EntryTag.entry_id == Entry.id)
-        .filter(Entry.user_id == current_user.id)
-        .group_by(Tag.id, Tag.name)
-        .order_by(desc("count"))
-        .limit(10)
-        .all()
-    )
-    top_tags_list = [{"name": name, "count": count} for name, count in top_tags]
 
-    # Recent entries
-    recent_entries = (
-        db.query(Entry)
-        .filter(Entry.user_id == current_user.id)
-        .order_by(desc(Entry.created_at))
-        .limit(5)
-        .all()
+@router.get("/analytics/timeseries", response_model=TimeseriesResponse)
+async def get_analytics_timeseries(
+    metric: ActivityMetric,
+    granularity: Granularity = Granularity.DAY,
+    span: str = Query("30d", alias="range", regex="^[1-9][0-9]{0,3}[dwmy]$"),
+    key: Optional[str] = Query(None, max_length=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Get user activity over time, from the daily activity buckets"""
+    end = datetime.now(timezone.utc).date()
+    try:
+        start = timeseries_start(end, span)
+    except ValueError:  # Reaches back before year 1
+        start = None
+    if start is None or (end - start).days >= MAX_TIMESERIES_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Range too long",
+        )
+
+    # The end date is part of the key so a cached series never outlives its day
+    cache_key = user_cache_key(
+        current_user.id,
+        "analytics",
+        "timeseries",
+        metric.value,
+        granularity.value,
+        start.isoformat(),
+        end.isoformat(),
+        key or "",
     )
-    recent_entries_list = [
-        {
-            "id": str(entry.id),
-            "title": entry.title,
-            "content_type": entry.content_type,
-            "created_at": entry.created_at.isoformat(),
-        }
-        for entry in recent_entries
-    ]
 
-    return {
-        "total_entries": total_entries,
-        "entries_by_type": entries_by_type_dict,
-        "top_tags": top_tags_list,
-        "recent_entries": recent_entries_list,
-    }
+    def load():
+        points = get_timeseries(
+            db, current_user.id, metric, granularity, start, end, key
+        )
+        return TimeseriesResponse(
+            metric=metric,
+            granularity=granularity,
+            key=key,
+            start=points[0][0],
+            end=end,
+            points=[TimeseriesPoint(date=day, value=value) for day, value in points],
+        )
+
+    return await cached_json_response("analytics", cache_key, load, 600)
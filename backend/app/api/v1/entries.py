@@ -1,13 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, desc
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Text,
+    and_,
+    cast,
+    distinct,
+    func,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from app.core.database import get_db
-from app.core.redis import redis_client
+from app.core.pagination import decode_cursor
+from app.core.cache import (
+    bump_generation,
+    cached_json_response,
+    get_version,
+    user_cache_key,
+)
 from app.core.security import get_current_user
 from app.models.user import User
-from app.models.entry import Entry, Tag, EntryTag
+from app.models.entry import Entry, Tag, EntryTag, SuggestTerm
+from app.models.related import RelatedEntry
 from app.schemas.entry import (
     EntryCreate,
     EntryUpdate,
@@ -16,71 +39,226 @@ from app.schemas.entry import (
     EntrySearchRequest,
     ContentType,
     SummaryStatus,
+    EnrichmentStatus,
+    EntryImportResponse,
+    EntryFacets,
+    TagFacet,
+    TagMode,
+    EntrySuggestion,
+    SuggestResponse,
+    TagSuggestion,
+)
+from app.services.ai_service import EMBEDDING_VERSION, embed_text
+from app.services.entry_pages import (
+    build_pagination,
+    capped_count,
+    fetch_page,
+    paginate_entries,
+)
+from app.services.enrichment import enqueue_enrichment, enqueue_text_indexing
+from app.services.stats_service import (
+    count_entries_created,
+    count_entries_deleted,
+    get_entry_total,
+)
+from app.services.export_service import MEDIA_TYPES, export_entries
+from app.services.related_service import RELATED_LIMIT
+from app.services.url_utils import canonicalize_url, url_hash
+from app.services.vector_index import semantic_search
+from app.services.import_service import (
+    import_entries,
+    iter_bookmark_rows,
+    iter_ndjson_rows,
 )
-import json
-import httpx
-from bs4 import BeautifulSoup
-from loguru import logger
 
 router = APIRouter()
 
 
-def fetch_url_metadata(url: str) -> dict:
-    """Fetch metadata from a URL"""
-    try:
-        response = httpx.get(url, timeout=10, follow_redirects=True)
-        response.raise_for_status()
+SEARCH_HALF_LIFE_DAYS = 180
+FACET_TAG_LIMIT = 20
+SUGGEST_MIN_TRIGRAM_LENGTH = 3
+SUGGEST_MIN_SIMILARITY = 0.5
+SUGGEST_ENDINGS = 5
+SUGGEST_SCAN_ROWS = 300
+SUGGEST_CACHE_TTL = 60
+SUGGEST_WORD = re.compile(r"[^\W_]+")
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10"
+)
 
-        soup = BeautifulSoup(response.text, "html.parser")
 
-        title = soup.find("title")
-        title_text = title.get_text(strip=True) if title else ""
+def _filter_entries(
+    query,
+    content_type: Optional[ContentType],
+    tags: Optional[List[UUID]],
+    tag_mode: TagMode,
+):
+    """Push content-type and tag filters down into SQL.
 
-        meta_description = soup.find("meta", attrs={"name": "description"})
-        description = meta_description.get("content", "") if meta_description else ""
+    Tag filters are semi-joins on entry_tags, served by its tag_id index:
+    "any" needs one matching row, "all" needs one row per requested tag.
+    """
+    if content_type:
+        query = query.filter(Entry.content_type == content_type.value)
+    if tags:
+        tag_ids = set(tags)
+        tagged = select(EntryTag.entry_id).where(EntryTag.tag_id.in_(tag_ids))
+        if tag_mode == TagMode.ALL and len(tag_ids) > 1:
+            tagged = tagged.group_by(EntryTag.entry_id).having(
+                func.count() == len(tag_ids)
+            )
+        query = query.filter(Entry.id.in_(tagged))
+    return query
+
+
+def _facet_counts(db: Session, query) -> Tuple[int, EntryFacets]:
+    """Total plus per-type and per-tag counts for a filtered query.
+
+    One GROUPING SETS query over the matched entries replaces a count per
+    facet value. Returns (total, facets).
+    """
+    matched = query.with_entities(Entry.id, Entry.content_type).subquery()
+    by_type = func.grouping(matched.c.content_type)
+    by_tag = func.grouping(Tag.id)
+    rows = (
+        db.query(
+            by_type,
+            by_tag,
+            matched.c.content_type,
+            Tag.id,
+            Tag.name,
+            func.count(distinct(matched.c.id)),
+        )
+        .select_from(matched)
+        .outerjoin(EntryTag, EntryTag.entry_id == matched.c.id)
+        .outerjoin(Tag, Tag.id == EntryTag.tag_id)
+        .group_by(
+            func.grouping_sets(
+                tuple_(matched.c.content_type), tuple_(Tag.id, Tag.name), tuple_()
+            )
+        )
+        .all()
+    )
 
-        og_image = soup.find("meta", attrs={"property": "og:image"})
-        image_url = og_image.get("content", "") if og_image else ""
+    total = 0
+    facets = EntryFacets()
+    for type_rolled_up, tag_rolled_up, content_type, tag_id, tag_name, count in rows:
+        if type_rolled_up and tag_rolled_up:
+            total = count
+        elif not type_rolled_up:
+            facets.content_types[content_type] = count
+        elif tag_id is not None:
+            facets.tags.append(TagFacet(id=tag_id, name=tag_name, count=count))
+
+    facets.tags.sort(key=lambda facet: (-facet.count, facet.name))
+    del facets.tags[FACET_TAG_LIMIT:]
+    return total, facets
+
+
+def _search_reference(cursor: Optional[str]) -> datetime:
+    """The "now" that recency decay is measured from, fixed for a result set"""
+    if not cursor:
+        return datetime.now(timezone.utc)
+    try:
+        return datetime.fromisoformat(decode_cursor(cursor)["t"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
-        return {
-            "title": title_text[:500],
-            "description": description[:1000],
-            "image": image_url,
-        }
-    except Exception as e:
-        logger.error(f"Error fetching metadata for {url}: {e}")
-        return {}
+
+def _search_rank(search_query, reference: datetime):
+    """Cover-density relevance, halved for every SEARCH_HALF_LIFE_DAYS of age"""
+    age_days = (
+        func.extract(
+            "epoch", literal(reference, DateTime(timezone=True)) - Entry.created_at
+        )
+        / 86400
+    )
+    decay = func.power(
+        0.5, cast(func.greatest(age_days, 0), Float) / SEARCH_HALF_LIFE_DAYS
+    )
+    return cast(func.ts_rank_cd(Entry.search_vector, search_query, 32), Float) * decay
 
 
-def fetch_github_repo_metadata(repo_url: str) -> dict:
-    """Fetch metadata from GitHub repository"""
-    try:
-        # Extract owner/repo from URL
-        parts = repo_url.replace("https://github.com/", "").strip("/").split("/")
-        if len(parts) < 2:
-            raise ValueError("Invalid GitHub URL")
-
-        owner, repo = parts[0], parts[1]
-
-        # Fetch from GitHub API
-        api_url = f"https://api.github.com/repos/{owner}/{repo}"
-        response = httpx.get(api_url, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-
-        return {
-            "name": data.get("name", ""),
-            "full_name": data.get("full_name", ""),
-            "description": data.get("description", ""),
-            "stars": data.get("stargazers_count", 0),
-            "language": data.get("language", ""),
-            "forks": data.get("forks_count", 0),
-            "url": data.get("html_url", ""),
-        }
-    except Exception as e:
-        logger.error(f"Error fetching GitHub metadata: {e}")
+def _search_headlines(db: Session, ids: List[UUID], search_query) -> Dict[UUID, str]:
+    """Highlighted snippets for one page of results only.
+
+    ts_headline re-parses the whole document, so it must never run over the
+    full match set.
+    """
+    if not ids:
         return {}
+    document = func.coalesce(
+        func.nullif(Entry.content, ""), Entry.ai_summary, Entry.title
+    )
+    rows = db.query(
+        Entry.id, func.ts_headline("english", document, search_query, HEADLINE_OPTIONS)
+    ).filter(Entry.id.in_(ids))
+    return dict(rows.all())
+
+
+def _suggest_terms(db: Session, user_id: UUID, word: str, limit: int) -> List[str]:
+    """Words from the user's vault closest to a typed word, best first.
+
+    Word similarity favours terms that start like ``word``, so a half-typed
+    word finds its endings as well as a misspelt one finds its fix.
+    """
+    # Numbers are matched as typed; the vocabulary leaves them out
+    if not any(char.isalpha() for char in word):
+        return [word]
+    score = func.word_similarity(word, SuggestTerm.term)
+    rows = (
+        db.query(SuggestTerm.term, score)
+        .filter(SuggestTerm.user_id == user_id, SuggestTerm.entry_count > 0)
+        # <<-> is 1 - word_similarity, served in order by the per-user GiST index
+        .order_by(literal(word).op("<<->")(SuggestTerm.term))
+        .limit(limit)
+        .all()
+    )
+    return [term for term, similarity in rows if similarity >= SUGGEST_MIN_SIMILARITY]
+
+
+def _suggest_entry_ids(
+    db: Session, user_id: UUID, words: List[str], endings: List[str], limit: int
+) -> List[UUID]:
+    """Entries holding every one of ``words`` and any of ``endings``.
+
+    Common words turn up among the newest few hundred entries, so those are
+    scanned first. Rarer ones come from the GIN index instead; the CTE fence
+    keeps the planner from betting on a scan that could read the whole vault
+    when the words never meet.
+    """
+
+    def match(terms):
+        if not words:
+            return terms.overlap(endings)
+        return and_(terms.contains(words), terms.overlap(endings))
+
+    terms = func.entry_suggest_terms(Entry.title, Entry.url, type_=ARRAY(Text))
+    # Split each title once here rather than once per condition
+    recent = (
+        select(Entry.id, terms.label("terms"))
+        .where(Entry.user_id == user_id)
+        .order_by(Entry.created_at.desc())
+        .limit(SUGGEST_SCAN_ROWS)
+        .subquery()
+    )
+    ids = db.scalars(
+        select(recent.c.id).where(match(recent.c.terms)).limit(limit)
+    ).all()
+    if len(ids) == limit:
+        return ids
+
+    matched = (
+        select(Entry.id)
+        .where(Entry.user_id == user_id, match(terms))
+        .cte("matched")
+        .prefix_with("MATERIALIZED")
+    )
+    older = db.scalars(select(matched.c.id).limit(limit)).all()
+    return (ids + [entry_id for entry_id in older if entry_id not in ids])[:limit]
 
 
 @router.post(
@@ -88,92 +266,390 @@ def fetch_github_repo_metadata(repo_url: str) -> dict:
 )
 async def create_entry(
     entry_data: EntryCreate,
+    response: Response,
+    on_duplicate: str = Query("return", regex="^(return|error)$"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Create a new entry"""
-    entry_metadata = entry_data.metadata or {}
-
-    # Fetch metadata based on content type
-    if entry_data.content_type == ContentType.LINK and entry_data.url:
-        fetched_metadata = fetch_url_metadata(str(entry_data.url))
-        entry_metadata.update(fetched_metadata)
-        if not entry_data.title and fetched_metadata.get("title"):
-            entry_data.title = fetched_metadata["title"]
-
-    elif entry_data.content_type == ContentType.REPO and entry_data.url:
-        fetched_metadata = fetch_github_repo_metadata(str(entry_data.url))
-        entry_metadata.update(fetched_metadata)
-        if not entry_data.title and fetched_metadata.get("full_name"):
-            entry_data.title = fetched_metadata["full_name"]
+    url = str(entry_data.url) if entry_data.url else None
+    canonical_url = canonicalize_url(url) if url else None
+    hashed_url = url_hash(url) if url else None
+
+    # Saving a link twice returns the first save, before any enrichment work
+    if hashed_url:
+        existing = (
+            db.query(Entry)
+            .filter(Entry.user_id == current_user.id, Entry.url_hash == hashed_url)
+            .order_by(Entry.created_at)
+            .first()
+        )
+        if existing:
+            if on_duplicate == "error":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Entry already exists for this URL: {existing.id}",
+                )
+            response.status_code = status.HTTP_200_OK
+            return existing
+
+    # Link/repo metadata is fetched by the enrichment workers after the insert
+    needs_enrichment = bool(entry_data.url) and entry_data.content_type in (
+        ContentType.LINK,
+        ContentType.REPO,
+    )
 
     entry = Entry(
         user_id=current_user.id,
         title=entry_data.title,
         content_type=entry_data.content_type.value,
-        url=str(entry_data.url) if entry_data.url else None,
+        url=url,
+        canonical_url=canonical_url,
+        url_hash=hashed_url,
         content=entry_data.content,
-        entry_metadata=entry_metadata,
+        entry_metadata=entry_data.metadata or {},
+        enrichment_status=(
+            EnrichmentStatus.PENDING.value
+            if needs_enrichment
+            else EnrichmentStatus.SKIPPED.value
+        ),
     )
 
     db.add(entry)
+    count_entries_created(db, current_user.id, [entry.content_type])
     db.commit()
     db.refresh(entry)
+    bump_generation(current_user.id)
+
+    if needs_enrichment:
+        await enqueue_enrichment(entry.id)
+    await enqueue_text_indexing([entry.id])
 
     return entry
 
 
+@router.post("/entries/import", response_model=EntryImportResponse)
+async def import_entries_endpoint(
+    request: Request,
+    format: Optional[str] = Query(None, regex="^(ndjson|bookmarks)$"),
+    summarize: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Bulk import entries from an NDJSON stream or a bookmarks HTML export"""
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "bookmarks" if "html" in content_type else "ndjson"
+
+    if format == "bookmarks":
+        rows = iter_bookmark_rows(request.stream())
+    else:
+        rows = iter_ndjson_rows(request.stream())
+
+    return await import_entries(db, current_user.id, rows, summarize=summarize)
+
+
 @router.get("/entries", response_model=EntryListResponse)
 async def list_entries(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     content_type: Optional[ContentType] = None,
+    tags: Optional[List[UUID]] = Query(None),
+    tag_mode: TagMode = TagMode.ALL,
+    facets: bool = False,
     sort: str = Query("newest", regex="^(newest|oldest)$"),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """List user's entries with pagination"""
     # Cache key
-    cache_key = f"entries:{current_user.id}:{page}:{limit}:{content_type}:{sort}"
+    cache_key = user_cache_key(
+        current_user.id,
+        "entries",
+        page,
+        limit,
+        content_type,
+        ",".join(sorted(map(str, tags or []))),
+        tag_mode,
+        facets,
+        sort,
+        cursor,
+    )
 
-    # Try to get from cache
-    cached = redis_client.get(cache_key)
-    if cached:
-        return json.loads(cached)
+    def load():
+        query = _filter_entries(
+            db.query(Entry).filter(Entry.user_id == current_user.id),
+            content_type,
+            tags,
+            tag_mode,
+        )
 
-    # Build query
-    query = db.query(Entry).filter(Entry.user_id == current_user.id)
+        facet_counts = None
+        capped = False
+        if facets:
+            total, facet_counts = _facet_counts(db, query)
+        elif tags:
+            total, capped = capped_count(db, query)
+        else:
+            # Total comes from the maintained counters rather than COUNT(*)
+            total = get_entry_total(
+                db, current_user.id, content_type.value if content_type else None
+            )
+
+        result = paginate_entries(
+            query, page, limit, cursor, sort == "newest", total, capped
+        )
+        result.facets = facet_counts
+        return result
 
-    if content_type:
-        query = query.filter(Entry.content_type == content_type.value)
+    # Cache for 5 minutes; concurrent misses share one load
+    return await cached_json_response("entries", cache_key, load, 300)
 
-    # Sort
-    if sort == "newest":
-        query = query.order_by(desc(Entry.created_at))
-    else:
-        query = query.order_by(Entry.created_at)
-
-    # Count total
-    total = query.count()
-
-    # Paginate
-    offset = (page - 1) * limit
-    entries = query.offset(offset).limit(limit).all()
-
-    result = EntryListResponse(
-        data=entries,
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "pages": (total + limit - 1) // limit,
-        },
+
+@router.get("/entries/search", response_model=EntryListResponse)
+async def search_entries(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    mode: str = Query("full", regex="^(full|snippet)$"),
+    content_type: Optional[ContentType] = None,
+    tags: Optional[List[UUID]] = Query(None),
+    tag_mode: TagMode = TagMode.ALL,
+    facets: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Search entries using full-text search, most relevant first"""
+    # Cache key
+    cache_key = user_cache_key(
+        current_user.id,
+        "search",
+        q,
+        page,
+        limit,
+        cursor,
+        mode,
+        content_type,
+        ",".join(sorted(map(str, tags or []))),
+        tag_mode,
+        facets,
+    )
+
+    def load():
+        # websearch syntax ("phrases", -exclusions, or) never errors on input
+        search_query = func.websearch_to_tsquery("english", q)
+        reference = _search_reference(cursor)
+        rank = _search_rank(search_query, reference)
+
+        matches = _filter_entries(
+            db.query(Entry).filter(
+                Entry.user_id == current_user.id,
+                Entry.search_vector.op("@@")(search_query),
+            ),
+            content_type,
+            tags,
+            tag_mode,
+        )
+
+        # Facets scan the full match set anyway, and give an exact total
+        facet_counts = None
+        capped = False
+        if facets:
+            total, facet_counts = _facet_counts(db, matches)
+        else:
+            total, capped = capped_count(db, matches)
+
+        rows, page_number, next_cursor, prev_cursor = fetch_page(
+            matches.add_columns(rank.label("rank")),
+            (rank, Entry.id),
+            True,
+            page,
+            limit,
+            cursor,
+            key_of=lambda row: [row.rank, str(row.Entry.id)],
+            decoders=(float, UUID),
+            extra={"t": reference.isoformat()},
+        )
+
+        headlines = _search_headlines(db, [row.Entry.id for row in rows], search_query)
+        data = []
+        for row in rows:
+            item = EntryResponse.model_validate(row.Entry)
+            item.snippet = headlines.get(row.Entry.id)
+            if mode == "snippet":
+                item.content = None
+            data.append(item)
+
+        return EntryListResponse(
+            data=data,
+            pagination=build_pagination(
+                page_number, limit, total, next_cursor, prev_cursor, capped
+            ),
+            facets=facet_counts,
+        )
+
+    # Cache for 10 minutes
+    return await cached_json_response("search", cache_key, load, 600)
+
+
+@router.get("/entries/suggest", response_model=SuggestResponse)
+async def suggest_entries(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Typeahead over entry titles, URLs and tag names"""
+    q = q.strip().lower()
+    cache_key = user_cache_key(current_user.id, "suggest", q, limit)
+
+    def load():
+        entry_score = func.greatest(
+            func.word_similarity(q, Entry.title),
+            func.word_similarity(q, func.coalesce(Entry.url, "")),
+        ).label("score")
+        tag_score = func.word_similarity(q, Tag.name).label("score")
+
+        # Too short to share trigrams with anything, so match as a prefix
+        found = []
+        if len(q) < SUGGEST_MIN_TRIGRAM_LENGTH:
+            found = db.scalars(
+                select(Entry.id)
+                .where(
+                    Entry.user_id == current_user.id,
+                    func.lower(Entry.title).startswith(q, autoescape=True),
+                )
+                .limit(limit)
+            ).all()
+            tag_match = func.lower(Tag.name).startswith(q, autoescape=True)
+            tag_order = tag_score.desc()
+        else:
+            # Scoring every title that shares a trigram with q is too slow at
+            # 1M entries, so each typed word is first resolved against the
+            # vault's vocabulary, then entries are looked up by exact words
+            words = SUGGEST_WORD.findall(q)
+            # Only the last word can be half-typed, so the others get one fix
+            fixed = [
+                _suggest_terms(db, current_user.id, word, 1) for word in words[:-1]
+            ]
+            endings = words and _suggest_terms(
+                db, current_user.id, words[-1], SUGGEST_ENDINGS
+            )
+            if endings and all(fixed):
+                found = _suggest_entry_ids(
+                    db,
+                    current_user.id,
+                    [terms[0] for terms in fixed],
+                    endings,
+                    limit,
+                )
+            tag_match = Tag.name.op("%>")(q)
+            # Nearest names first, straight off the per-user GiST index
+            tag_order = literal(q).op("<<->")(Tag.name)
+
+        # Only the few entries found are scored, never every match
+        entries = []
+        if found:
+            entries = (
+                db.query(
+                    Entry.id, Entry.title, Entry.url, Entry.content_type, entry_score
+                )
+                .filter(Entry.id.in_(found))
+                .order_by(entry_score.desc(), Entry.id)
+                .all()
+            )
+
+        tags = (
+            db.query(Tag.id, Tag.name, tag_score)
+            .filter(Tag.user_id == current_user.id, tag_match)
+            .order_by(tag_order, Tag.name)
+            .limit(limit)
+            .all()
+        )
+
+        return SuggestResponse(
+            entries=[EntrySuggestion(**row._asdict()) for row in entries],
+            tags=[TagSuggestion(**row._asdict()) for row in tags],
+        )
+
+    # Keystrokes repeat the same prefixes, so even a short TTL absorbs most
+    return await cached_json_response("suggest", cache_key, load, SUGGEST_CACHE_TTL)
+
+
+@router.get("/entries/semantic-search", response_model=EntryListResponse)
+async def semantic_search_entries(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    mode: str = Query("semantic", regex="^(semantic|hybrid)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Find entries by meaning, optionally blended with full-text rank"""
+    # Embeddings land without bumping the generation, so key on their version too
+    cache_key = user_cache_key(
+        current_user.id,
+        "semantic",
+        get_version(EMBEDDING_VERSION, current_user.id),
+        q,
+        limit,
+        mode,
     )
 
-    # Cache for 5 minutes
-    redis_client.setex(cache_key, 300, json.dumps(result.model_dump(), default=str))
+    def rank(query_vector) -> EntryListResponse:
+        scored = semantic_search(
+            db, current_user.id, q, query_vector, limit, hybrid=mode == "hybrid"
+        )
+        entries = {
+            entry.id: entry
+            for entry in db.query(Entry)
+            .options(selectinload(Entry.tags))
+            .filter(
+                Entry.user_id == current_user.id,
+                Entry.id.in_([entry_id for entry_id, _ in scored]),
+            )
+        }
+
+        data = []
+        for entry_id, score in scored:
+            # Deleted since the index last synced
+            if entry_id not in entries:
+                continue
+            item = EntryResponse.model_validate(entries[entry_id])
+            item.score = round(score, 6)
+            data.append(item)
+
+        return EntryListResponse(
+            data=data, pagination=build_pagination(None, limit, len(data), None, None)
+        )
+
+    async def load():
+        query_vector = await embed_text(q)
+        return await run_in_threadpool(rank, query_vector)
+
+    return await cached_json_response("semantic", cache_key, load, 600)
+
 
-    return result
+@router.get("/entries/export")
+async def export_entries_endpoint(
+    request: Request,
+    format: str = Query("ndjson", regex="^(ndjson|csv|json)$"),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream the user's whole vault as NDJSON, CSV or JSON"""
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {
+        "Content-Disposition": f'attachment; filename="insightvault-export.{format}"'
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        export_entries(current_user.id, format, compress),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
 
 
 @router.get("/entries/{entry_id}", response_model=EntryResponse)
@@ -185,6 +661,7 @@ async def get_entry(
     """Get a specific entry"""
     entry = (
         db.query(Entry)
+        .options(selectinload(Entry.tags))
         .filter(Entry.id == entry_id, Entry.user_id == current_user.id)
         .first()
     )
@@ -198,6 +675,47 @@ async def get_entry(
     return entry
 
 
+@router.get("/entries/{entry_id}/related", response_model=List[EntryResponse])
+async def get_related_entries(
+    entry_id: UUID,
+    limit: int = Query(5, ge=1, le=RELATED_LIMIT),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Entries with similar text, from the precomputed neighbour lists"""
+    rows = (
+        db.query(Entry, RelatedEntry.score)
+        .options(selectinload(Entry.tags))
+        .join(RelatedEntry, RelatedEntry.related_id == Entry.id)
+        .filter(
+            RelatedEntry.entry_id == entry_id,
+            Entry.user_id == current_user.id,
+        )
+        .order_by(RelatedEntry.score.desc())
+        .limit(limit)
+        .all()
+    )
+
+    if not rows:
+        exists = (
+            db.query(Entry.id)
+            .filter(Entry.id == entry_id, Entry.user_id == current_user.id)
+            .first()
+        )
+        if not exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Entry not found",
+            )
+
+    related = []
+    for entry, score in rows:
+        item = EntryResponse.model_validate(entry)
+        item.score = round(score, 4)
+        related.append(item)
+    return related
+
+
 @router.put("/entries/{entry_id}", response_model=EntryResponse)
 async def update_entry(
     entry_id: UUID,
@@ -230,7 +748,10 @@ async def update_entry(
     db.refresh(entry)
 
     # Invalidate cache
-    redis_client.delete(f"entries:{current_user.id}:*")
+    bump_generation(current_user.id)
+
+    if entry_data.title is not None or entry_data.content is not None:
+        await enqueue_text_indexing([entry.id])
 
     return entry
 
@@ -255,65 +776,10 @@ async def delete_entry(
         )
 
     db.delete(entry)
+    count_entries_deleted(db, current_user.id, [entry])
     db.commit()
 
     # Invalidate cache
-    redis_client.delete(f"entries:{current_user.id}:*")
+    bump_generation(current_user.id)
 
     return None
-
-
-@router.get("/entries/search", response_model=EntryListResponse)
-async def search_entries(
-    q: str = Query(..., min_length=1),
-    page: int = Query(1, ge=1),
-    limit: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    """Search entries using full-text search"""
-    # Cache key
-    cache_key = f"search:{current_user.id}:{q}:{page}:{limit}"
-
-    # Try cache
-    cached = redis_client.get(cache_key)
-    if cached:
-        return json.loads(cached)
-
-    # Full-text search
-    search_query = func.to_tsquery("english", q.replace(" ", " & "))
-
-    query = (
-        db.query(Entry)
-        .filter(
-            Entry.user_id == current_user.id,
-            func.to_tsvector(
-                "english",
-                func.coalesce(Entry.title, "")
-                + " "
-                + func.coalesce(Entry.content, "")
-                + " "
-                + func.coalesce(Entry.ai_summary, ""),
-            ).match(search_query),
-        )
-        .order_by(desc(Entry.created_at))
-    )
-
-    total = query.count()
-    offset = (page - 1) * limit
-    entries = query.offset(offset).limit(limit).all()
-
-    result = EntryListResponse(
-        data=entries,
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "pages": (total + limit - 1) // limit,
-        },
-    )
-
-    # Cache for 10 minutes
-    redis_client.setex(cache_key, 600, json.dumps(result.model_dump(), default=str))
-
-    return result
@@ -1,23 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
+from app.core.cache import bump_generation
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.entry import Tag, Entry, EntryTag
-from app.schemas.entry import TagCreate, TagResponse
+from app.schemas.entry import (
+    ContentType,
+    EntryListResponse,
+    EntryTagsBatchRequest,
+    EntryTagsBatchResponse,
+    TagBatchAction,
+    TagCreate,
+    TagResponse,
+)
+from app.services.entry_pages import capped_count, paginate_entries
+from app.services.tag_service import (
+    add_entry_tags,
+    get_or_create_tags,
+    remove_entry_tags,
+)
 
 router = APIRouter()
 
 
 @router.get("/tags", response_model=List[TagResponse])
 async def list_tags(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    with_counts: bool = False,
+    sort: Optional[str] = Query(None, regex="^(name|usage)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """List user's tags"""
-    tags = db.query(Tag).filter(Tag.user_id == current_user.id).all()
-    return tags
+    columns = [Tag.id, Tag.user_id, Tag.name, Tag.color, Tag.created_at]
+    if with_counts:
+        columns.append(Tag.usage_count)
+    query = db.query(*columns).filter(Tag.user_id == current_user.id)
+
+    if sort == "usage":
+        # Walks idx_tags_user_usage
+        query = query.order_by(Tag.usage_count.desc(), Tag.name)
+    elif sort == "name":
+        query = query.order_by(Tag.name)
+
+    return query.all()
 
 
 @router.post("/tags", response_model=TagResponse, status_code=status.HTTP_201_CREATED)
@@ -49,6 +77,7 @@ async def create_tag(
     db.add(tag)
     db.commit()
     db.refresh(tag)
+    bump_generation(current_user.id)
 
     return tag
 
@@ -99,6 +128,7 @@ async def assign_tag(
     entry_tag = EntryTag(entry_id=entry_id, tag_id=tag_id)
     db.add(entry_tag)
     db.commit()
+    bump_generation(current_user.id)
 
     return {"message": "Tag assigned successfully"}
 
@@ -140,13 +170,77 @@ async def remove_tag(
 
     db.delete(entry_tag)
     db.commit()
+    bump_generation(current_user.id)
 
     return None
 
 
-@router.get("/tags/{tag_id}/entries", response_model=List[TagResponse])
+@router.post("/entries/tags:batch", response_model=EntryTagsBatchResponse)
+async def batch_tag_entries(
+    batch: EntryTagsBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Add or remove many tags on many entries in one transaction"""
+    entry_ids = set(batch.entry_ids)
+    owned = {
+        entry_id
+        for (entry_id,) in db.query(Entry.id).filter(
+            Entry.id.in_(entry_ids), Entry.user_id == current_user.id
+        )
+    }
+    if owned != entry_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Entry not found",
+        )
+
+    tag_ids = set(batch.tag_ids)
+    if tag_ids:
+        owned = {
+            tag_id
+            for (tag_id,) in db.query(Tag.id).filter(
+                Tag.id.in_(tag_ids), Tag.user_id == current_user.id
+            )
+        }
+        if owned != tag_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tag not found",
+            )
+
+    names = sorted(set(batch.tag_names))
+    if batch.action == TagBatchAction.ADD:
+        tag_ids.update(get_or_create_tags(db, current_user.id, names).values())
+        changed = add_entry_tags(db, list(entry_ids), list(tag_ids))
+    else:
+        # Removing by an unknown name is a no-op rather than an error
+        if names:
+            tag_ids.update(
+                tag_id
+                for (tag_id,) in db.query(Tag.id).filter(
+                    Tag.user_id == current_user.id, Tag.name.in_(names)
+                )
+            )
+        changed = remove_entry_tags(db, list(entry_ids), list(tag_ids))
+
+    db.commit()
+    if changed:
+        bump_generation(current_user.id)
+
+    return EntryTagsBatchResponse(
+        entries=len(entry_ids), tags=len(tag_ids), changed=changed
+    )
+
+
+@router.get("/tags/{tag_id}/entries", response_model=EntryListResponse)
 async def get_entries_by_tag(
     tag_id: UUID,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    content_type: Optional[ContentType] = None,
+    sort: str = Query("newest", regex="^(newest|oldest)$"),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -159,4 +253,15 @@ async def get_entries_by_tag(
             detail="Tag not found",
         )
 
-    return tag.entries
+    # Entries are reached through idx_entry_tags_tag_entry and paged on
+    # (created_at, id), so only one page is ever loaded
+    query = (
+        db.query(Entry)
+        .join(EntryTag, EntryTag.entry_id == Entry.id)
+        .filter(EntryTag.tag_id == tag_id, Entry.user_id == current_user.id)
+    )
+    if content_type:
+        query = query.filter(Entry.content_type == content_type.value)
+
+    total, capped = capped_count(db, query)
+    return paginate_entries(query, page, limit, cursor, sort == "newest", total, capped)
@@ -0,0 +1,163 @@
+"""Maintenance commands.
+
+Usage:
+    python -m app.commands reconcile-stats [--user-id UUID] [--check]
+    python -m app.commands backfill-embeddings [--user-id UUID]
+    python -m app.commands backfill-related [--user-id UUID]
+    python -m app.commands dedupe-entries [--user-id UUID] [--dry-run]
+    python -m app.commands backfill-activity [--user-id UUID]
+"""
+import argparse
+import asyncio
+from typing import List
+from uuid import UUID
+from loguru import logger
+from app.core.database import SessionLocal
+from app.models.embedding import EntryEmbedding
+from app.models.entry import Entry
+from app.models.related import EntrySignature
+from app.services.ai_service import embedding_model
+from app.services.dedupe_service import merge_duplicate_entries
+from app.services.enrichment import enqueue_enrichment_many, enqueue_text_indexing
+from app.services.stats_service import (
+    find_stat_drift,
+    rebuild_activity,
+    reconcile_entry_counts,
+)
+from app.services.tag_service import reconcile_tag_counts
+
+
+def reconcile_stats(args):
+    db = SessionLocal()
+    try:
+        if args.check:
+            drift = find_stat_drift(db, args.user_id)
+            for user_id, stat, key, stored, actual in drift:
+                logger.warning(f"{user_id} {stat}:{key} is {stored}, expected {actual}")
+            logger.info(f"Found {len(drift)} drifted entry counters")
+            return
+        written = reconcile_entry_counts(db, args.user_id)
+        logger.info(f"Rebuilt {written} entry counters")
+        corrected = reconcile_tag_counts(db, args.user_id)
+        logger.info(f"Corrected {corrected} tag usage counts")
+    finally:
+        db.close()
+
+
+def backfill_embeddings(args):
+    """Queue embed jobs for entries without a vector from the current model"""
+    db = SessionLocal()
+    try:
+        query = (
+            db.query(Entry.id)
+            .outerjoin(
+                EntryEmbedding,
+                (EntryEmbedding.entry_id == Entry.id)
+                & (EntryEmbedding.model == embedding_model()),
+            )
+            .filter(EntryEmbedding.entry_id.is_(None))
+        )
+        if args.user_id:
+            query = query.filter(Entry.user_id == args.user_id)
+        entry_ids = [entry_id for (entry_id,) in query]
+    finally:
+        db.close()
+
+    asyncio.run(_queue_jobs(entry_ids, "embed"))
+    logger.info(f"Queued {len(entry_ids)} entries for embedding")
+
+
+def backfill_related(args):
+    """Queue related-entry jobs for entries that were never signed"""
+    db = SessionLocal()
+    try:
+        query = (
+            db.query(Entry.id)
+            .outerjoin(EntrySignature, EntrySignature.entry_id == Entry.id)
+            .filter(EntrySignature.entry_id.is_(None))
+        )
+        if args.user_id:
+            query = query.filter(Entry.user_id == args.user_id)
+        entry_ids = [entry_id for (entry_id,) in query]
+    finally:
+        db.close()
+
+    asyncio.run(_queue_jobs(entry_ids, "related"))
+    logger.info(f"Queued {len(entry_ids)} entries for related-entry indexing")
+
+
+def dedupe_entries(args):
+    """Merge links saved more than once into their oldest copy"""
+    db = SessionLocal()
+    try:
+        groups, removed, changed = merge_duplicate_entries(
+            db, args.user_id, dry_run=args.dry_run
+        )
+    finally:
+        db.close()
+
+    if changed:
+        asyncio.run(enqueue_text_indexing(changed))
+    verb = "Would remove" if args.dry_run else "Removed"
+    logger.info(f"{verb} {removed} duplicate entries across {groups} URLs")
+
+
+def backfill_activity(args):
+    """Rebuild daily activity buckets from existing entries and tags"""
+    db = SessionLocal()
+    try:
+        written = rebuild_activity(db, args.user_id)
+        logger.info(f"Rebuilt {written} activity buckets")
+    finally:
+        db.close()
+
+
+async def _queue_jobs(entry_ids: List[UUID], kind: str, batch_size: int = 1000):
+    for start in range(0, len(entry_ids), batch_size):
+        await enqueue_enrichment_many(entry_ids[start : start + batch_size], kind)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.commands")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = subcommands.add_parser(
+        "reconcile-stats", help="Rebuild entry and tag counters from source tables"
+    )
+    reconcile.add_argument("--user-id", type=UUID, default=None)
+    reconcile.add_argument(
+        "--check", action="store_true", help="Report drift without rewriting"
+    )
+    reconcile.set_defaults(func=reconcile_stats)
+
+    backfill = subcommands.add_parser(
+        "backfill-embeddings", help="Queue embeddings for entries that lack one"
+    )
+    backfill.add_argument("--user-id", type=UUID, default=None)
+    backfill.set_defaults(func=backfill_embeddings)
+
+    related = subcommands.add_parser(
+        "backfill-related", help="Queue related-entry indexing for unsigned entries"
+    )
+    related.add_argument("--user-id", type=UUID, default=None)
+    related.set_defaults(func=backfill_related)
+
+    dedupe = subcommands.add_parser(
+        "dedupe-entries", help="Merge entries saved more than once for one URL"
+    )
+    dedupe.add_argument("--user-id", type=UUID, default=None)
+    dedupe.add_argument("--dry-run", action="store_true")
+    dedupe.set_defaults(func=dedupe_entries)
+
+    activity = subcommands.add_parser(
+        "backfill-activity", help="Rebuild daily activity buckets from source tables"
+    )
+    activity.add_argument("--user-id", type=UUID, default=None)
+    activity.set_defaults(func=backfill_activity)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+import asyncio
+import inspect
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from uuid import UUID
+import orjson
+import redis
+from fastapi import Response
+from loguru import logger
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.redis import redis_bytes_client, redis_client
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Per-worker hit/miss counters, keyed by namespace and tier
+_hits: Counter = Counter()
+_misses: Counter = Counter()
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-item TTLs and a byte budget.
+
+    Items can carry a tag (the owning user) so everything belonging to a
+    user can be dropped at once when another worker announces a write.
+    Safe to call from the pub/sub listener thread.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[str, Tuple[float, Any, int, Optional[str]]]" = (
+            OrderedDict()
+        )
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so a reader can tell one raced it
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value, _, _ = item
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tag: Optional[str] = None,
+        since: Optional[int] = None,
+    ):
+        """Store a value; skipped if anything was invalidated after ``since``"""
+        size = len(value) if isinstance(value, (str, bytes)) else 64
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if since is not None and self.invalidations != since:
+                return
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (time.monotonic() + ttl, value, size, tag)
+            self.size += size
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._items)))
+
+    def invalidate_tag(self, tag: str):
+        with self._lock:
+            self.invalidations += 1
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += 1
+            self._items.clear()
+            self._tags.clear()
+            self.size = 0
+
+    def _remove(self, key: str):
+        _, _, size, tag = self._items.pop(key)
+        self.size -= size
+        if tag is not None:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+local_cache = LocalCache(settings.L1_CACHE_MAX_BYTES)
+_inflight: Dict[str, asyncio.Future] = {}
+_listener = None
+
+
+def _generation_key(user_id: UUID) -> str:
+    return f"cache:gen:{user_id}"
+
+
+def get_generation(user_id: UUID) -> int:
+    """Current cache generation for a user's views"""
+    key = _generation_key(user_id)
+    generation = local_cache.get(key)
+    if generation is not None:
+        return generation
+
+    # A bump landing while Redis is read must not leave the old value in L1
+    since = local_cache.invalidations
+    try:
+        generation = int(redis_client.get(key) or 0)
+    except redis.RedisError as e:
+        logger.warning(f"Cache generation read failed: {e}")
+        return 0
+
+    local_cache.set(
+        key, generation, settings.L1_CACHE_TTL_SECONDS, tag=str(user_id), since=since
+    )
+    return generation
+
+
+def bump_generation(user_id: UUID):
+    """Invalidate every cached list/search/analytics view for a user.
+
+    Cache keys embed the generation, so one INCR makes all existing keys
+    unreachable; they simply age out via their TTLs. No SCAN or KEYS needed.
+    Other workers are told over pub/sub to drop their in-process copies.
+    """
+    local_cache.invalidate_tag(str(user_id))
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.incr(_generation_key(user_id))
+        pipe.publish(INVALIDATION_CHANNEL, str(user_id))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Cache generation bump failed for {user_id}: {e}")
+
+
+def _version_key(name: str, user_id: UUID) -> str:
+    return f"version:{name}:{user_id}"
+
+
+def get_version(name: str, user_id: UUID) -> int:
+    """Current value of a named per-user counter kept apart from the generation.
+
+    For derived data (e.g. embeddings) that changes often without changing
+    what list/search/analytics views show.
+    """
+    try:
+        return int(redis_client.get(_version_key(name, user_id)) or 0)
+    except redis.RedisError as e:
+        logger.warning(f"Version read failed for {name}: {e}")
+        return 0
+
+
+def bump_version(name: str, user_id: UUID):
+    """Advance a named per-user counter without touching cached views"""
+    try:
+        redis_client.incr(_version_key(name, user_id))
+    except redis.RedisError as e:
+        logger.warning(f"Version bump failed for {name}/{user_id}: {e}")
+
+
+def user_cache_key(user_id: UUID, namespace: str, *parts: Any) -> str:
+    """Build a cache key scoped to the user's current generation"""
+    generation = get_generation(user_id)
+    suffix = ":".join(str(part) for part in parts)
+    return f"{namespace}:{user_id}:g{generation}:{suffix}"
+
+
+def _key_owner(key: str) -> Optional[str]:
+    parts = key.split(":", 2)
+    return parts[1] if len(parts) == 3 else None
+
+
+def _pack(value: bytes) -> bytes:
+    if len(value) < settings.CACHE_COMPRESS_MIN_BYTES:
+        return value
+    return zlib.compress(value, 1)
+
+
+def _unpack(raw: bytes) -> bytes:
+    # JSON starts with "{" or "[", a zlib stream with 0x78 ("x")
+    return zlib.decompress(raw) if raw[:1] == b"x" else raw
+
+
+def cache_get(namespace: str, key: str) -> Optional[bytes]:
+    """Read through the in-process tier, then Redis"""
+    value = local_cache.get(key)
+    if value is not None:
+        _hits[(namespace, "l1")] += 1
+        return value
+    _misses[(namespace, "l1")] += 1
+
+    try:
+        raw = redis_bytes_client.get(key)
+        value = _unpack(raw) if raw is not None else None
+    except (redis.RedisError, zlib.error) as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        value = None
+
+    if value is None:
+        _misses[(namespace, "redis")] += 1
+    else:
+        _hits[(namespace, "redis")] += 1
+        local_cache.set(key, value, settings.L1_CACHE_TTL_SECONDS, tag=_key_owner(key))
+    return value
+
+
+def cache_set(key: str, value: bytes, ttl: int):
+    local_cache.set(
+        key, value, min(ttl, settings.L1_CACHE_TTL_SECONDS), tag=_key_owner(key)
+    )
+    try:
+        redis_bytes_client.setex(key, ttl, _pack(value))
+    except redis.RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+
+def encode_json(value: Any) -> bytes:
+    """Serialize a response model or plain dict to JSON bytes"""
+    if isinstance(value, BaseModel):
+        # pydantic-core's serializer writes bytes directly, like orjson
+        return value.__pydantic_serializer__.to_json(value)
+    return orjson.dumps(value)
+
+
+async def cache_get_or_load(
+    namespace: str, key: str, loader: Callable[[], Any], ttl: int
+) -> Any:
+    """Return a cached value, running ``loader`` at most once per key.
+
+    Blocking loaders run in the threadpool; coroutine functions are awaited.
+    Concurrent misses for the same key in this worker wait on the first
+    caller's load instead of each hitting the database.
+    """
+    value = cache_get(namespace, key)
+    if value is not None:
+        return value
+
+    future = _inflight.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        if inspect.iscoroutinefunction(loader):
+            value = await loader()
+        else:
+            value = await run_in_threadpool(loader)
+        cache_set(key, value, ttl)
+        future.set_result(value)
+        return value
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()
+        raise
+    finally:
+        del _inflight[key]
+
+
+def _on_invalidate(message):
+    local_cache.invalidate_tag(message["data"])
+
+
+def start_invalidation_listener():
+    """Subscribe this worker to cross-worker invalidation messages"""
+    global _listener
+    try:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: _on_invalidate})
+        _listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+    except redis.RedisError as e:
+        # L1 TTLs still bound staleness without the listener
+        logger.warning(f"Cache invalidation listener not started: {e}")
+
+
+async def cached_json_response(
+    namespace: str, key: str, loader: Callable[[], Any], ttl: int
+) -> Response:
+    """Serve a cached JSON body as-is, building it with ``loader`` on a miss.
+
+    Hits skip response-model validation and serialization entirely: the
+    stored bytes go straight onto the wire.
+    """
+    if inspect.iscoroutinefunction(loader):
+
+        async def load():
+            return encode_json(await loader())
+
+    else:
+
+        def load():
+            return encode_json(loader())
+
+    body = await cache_get_or_load(namespace, key, load, ttl)
+    return Response(content=body, media_type="application/json")
+
+
+def stop_invalidation_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def cache_stats() -> Dict[str, Dict[str, float]]:
+    """Hit/miss counts and hit rate per namespace and tier for this worker"""
+    stats = {}
+    for namespace, tier in sorted(set(_hits) | set(_misses)):
+        hits, misses = _hits[(namespace, tier)], _misses[(namespace, tier)]
+        stats[f"{namespace}.{tier}"] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        }
+    stats["l1"] = {"bytes": local_cache.size, "max_bytes": local_cache.max_bytes}
+    return stats
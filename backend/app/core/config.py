@@ -29,6 +29,45 @@ class Settings(BaseSettings):
     GITHUB_CLIENT_ID: str = ""
     GITHUB_CLIENT_SECRET: str = ""
 
+    # Outbound HTTP (link/repo metadata fetches)
+    OUTBOUND_MAX_CONNECTIONS: int = 100
+    OUTBOUND_MAX_PER_HOST: int = 4
+    OUTBOUND_MAX_BYTES: int = 2 * 1024 * 1024
+    OUTBOUND_DEADLINE_SECONDS: float = 10.0
+    OUTBOUND_USER_AGENT: str = "InsightVault/1.0 (+metadata fetcher)"
+    HTML_HEAD_MAX_BYTES: int = 512 * 1024
+
+    # Shared URL metadata cache
+    METADATA_CACHE_TTL_SECONDS: int = 24 * 3600
+    METADATA_CACHE_STALE_SECONDS: int = 7 * 24 * 3600
+    METADATA_CACHE_NEGATIVE_TTL_SECONDS: int = 10 * 60
+
+    # Background enrichment
+    ENRICHMENT_QUEUE_BACKEND: str = "redis"  # redis or local
+    ENRICHMENT_WORKERS: int = 4
+    ENRICHMENT_MAX_ATTEMPTS: int = 5
+    ENRICHMENT_RETRY_BASE_SECONDS: int = 30
+    ENRICHMENT_VISIBILITY_TIMEOUT_SECONDS: int = 300
+
+    # In-process cache tier in front of Redis
+    L1_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    L1_CACHE_TTL_SECONDS: int = 30
+    CACHE_COMPRESS_MIN_BYTES: int = 4096
+
+    # Bulk import
+    IMPORT_BATCH_SIZE: int = 1000
+
+    # Semantic search
+    EMBEDDING_PROVIDER: str = "local"  # local or gemini
+    EMBEDDING_DIM: int = 256  # local hashing embedder only
+    SEMANTIC_INDEX_MAX_USERS: int = 256
+    SEMANTIC_ANN_THRESHOLD: int = 20000  # HNSW above this, if hnswlib is installed
+    SEMANTIC_HYBRID_WEIGHT: float = 0.5
+
+    # GitHub API (token is optional, raises the quota from 60 to 5000 req/h)
+    GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_TOKEN: str = ""
+
     # Application
     API_V1_PREFIX: str = "/api/v1"
     DEBUG: bool = False
@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+from contextvars import ContextVar
+from typing import List, Optional
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -10,6 +12,28 @@ engine = create_engine(
     max_overflow=10,
 )
 
+# Statements issued in the current request, when counting is switched on
+_query_count: ContextVar[Optional[List[int]]] = ContextVar("query_count", default=None)
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def start_query_count() -> List[int]:
+    """Start counting SQL statements for the current request.
+
+    The returned single-item list is shared with threadpool copies of the
+    context, so it sees queries from sync code paths too.
+    """
+    counter = [0]
+    _query_count.set(counter)
+    return counter
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
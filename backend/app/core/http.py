@@ -0,0 +1,174 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from loguru import logger
+from app.core.config import settings
+
+
+class FetchError(Exception):
+    """Raised when an outbound fetch fails or exceeds its budget"""
+
+
+class HostUnavailable(FetchError):
+    """Raised when a host times out or cannot be reached at all"""
+
+
+class RetryAfter(FetchError):
+    """Raised when a host asks us to back off until a given time"""
+
+    def __init__(self, message: str, retry_at: float):
+        super().__init__(message)
+        self.retry_at = retry_at
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+    truncated: bool = False
+
+    @property
+    def text(self) -> str:
+        encoding = "utf-8"
+        content_type = self.headers.get("content-type", "")
+        if "charset=" in content_type:
+            encoding = content_type.split("charset=")[-1].split(";")[0].strip()
+        try:
+            return self.content.decode(encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise FetchError(f"HTTP {self.status_code} from {self.url}")
+
+
+class OutboundClient:
+    """Shared async HTTP client for third-party fetches.
+
+    Holds one pooled ``httpx.AsyncClient`` for the lifetime of the app and
+    bounds concurrency globally and per host, so a slow site can only tie up
+    its own slots and never the event loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = settings.OUTBOUND_MAX_CONNECTIONS,
+        max_per_host: int = settings.OUTBOUND_MAX_PER_HOST,
+        max_bytes: int = settings.OUTBOUND_MAX_BYTES,
+        deadline: float = settings.OUTBOUND_DEADLINE_SECONDS,
+    ):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_slots = asyncio.Semaphore(max_connections)
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def start(self):
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=httpx.Timeout(self.deadline, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections // 2,
+                keepalive_expiry=30.0,
+            ),
+            headers={"User-Agent": settings.OUTBOUND_USER_AGENT},
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = (urlsplit(url).hostname or "").lower()
+        semaphore = self._host_slots.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_host)
+            self._host_slots[host] = semaphore
+        return semaphore
+
+    async def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+        deadline: Optional[float] = None,
+        consumer: Optional[Callable[[httpx.Headers, bytes], bool]] = None,
+    ) -> FetchResult:
+        """GET a URL within the byte cap and total deadline.
+
+        The deadline covers waiting for a slot, connecting, redirects and
+        reading the body. Bodies larger than the cap are cut off and flagged
+        as truncated rather than treated as errors. If a ``consumer`` is given
+        it is called with each chunk as it arrives and can return True to stop
+        the download early.
+        """
+        if self._client is None:
+            await self.start()
+
+        max_bytes = max_bytes or self.max_bytes
+        deadline = deadline or self.deadline
+
+        try:
+            async with asyncio.timeout(deadline):
+                async with self._global_slots, self._host_semaphore(url):
+                    return await self._read(url, headers, max_bytes, consumer)
+        except TimeoutError as e:
+            raise HostUnavailable(f"Deadline of {deadline}s exceeded for {url}") from e
+        except httpx.TransportError as e:
+            raise HostUnavailable(f"Error connecting to {url}: {e}") from e
+        except httpx.HTTPError as e:
+            raise FetchError(f"Error fetching {url}: {e}") from e
+
+    async def _read(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        max_bytes: int,
+        consumer: Optional[Callable[[httpx.Headers, bytes], bool]],
+    ) -> FetchResult:
+        async with self._client.stream("GET", url, headers=headers) as response:
+            chunks = []
+            size = 0
+            truncated = False
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if consumer is not None and consumer(response.headers, chunk):
+                    break
+                if size >= max_bytes:
+                    truncated = True
+                    break
+
+            if truncated:
+                logger.debug(f"Truncated response from {url} at {max_bytes} bytes")
+
+            return FetchResult(
+                url=str(response.url),
+                status_code=response.status_code,
+                headers=response.headers,
+                content=b"".join(chunks)[:max_bytes],
+                truncated=truncated,
+            )
+
+
+outbound_client = OutboundClient()
+
+
+def get_outbound_client() -> OutboundClient:
+    """Dependency for getting the shared outbound HTTP client"""
+    return outbound_client
@@ -0,0 +1,89 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(payload: dict) -> str:
+    """Encode a cursor payload as an opaque URL-safe token"""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a token produced by ``encode_cursor``"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, dict):
+            raise ValueError("cursor payload must be an object")
+        return payload
+    except (ValueError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def keyset_paginate(
+    query: Query,
+    columns: Sequence[Any],
+    descending: bool,
+    cursor: Optional[str],
+    limit: int,
+    key_of: Callable[[Any], List[Any]],
+    decoders: Sequence[Callable[[Any], Any]],
+    extra: Optional[dict] = None,
+) -> Tuple[list, Optional[str], Optional[str]]:
+    """Fetch one page ordered by ``columns`` using a row-value comparison.
+
+    Unlike OFFSET, the cost of a page doesn't depend on how deep it is: the
+    cursor carries the sort key of the row at the page boundary and the
+    database seeks straight to it through the index. Cursors also record
+    their direction, so ``prev_cursor`` walks back the way it came. Anything
+    in ``extra`` is carried along in the cursors this returns.
+
+    Returns ``(rows, next_cursor, prev_cursor)``.
+    """
+    backwards = False
+    if cursor:
+        payload = decode_cursor(cursor)
+        try:
+            values = [decode(v) for decode, v in zip(decoders, payload["k"])]
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        backwards = payload.get("d") == "p"
+
+        # Walking backwards flips the scan direction; the page is reversed below
+        seek_descending = descending != backwards
+        if seek_descending:
+            query = query.filter(tuple_(*columns) < tuple_(*values))
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*values))
+    else:
+        seek_descending = descending
+
+    query = query.order_by(*[c.desc() if seek_descending else c.asc() for c in columns])
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    def make(row, direction: str) -> str:
+        return encode_cursor({**(extra or {}), "k": key_of(row), "d": direction})
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if has_more or backwards:
+            next_cursor = make(rows[-1], "n")
+        if (backwards and has_more) or (cursor and not backwards):
+            prev_cursor = make(rows[0], "p")
+
+    return rows, next_cursor, prev_cursor
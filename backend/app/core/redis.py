@@ -1,7 +1,11 @@
 import redis
+import redis.asyncio
 from app.core.config import settings
 
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+# Raw bytes, for pre-encoded cached responses
+redis_bytes_client = redis.from_url(settings.REDIS_URL, decode_responses=False)
+async_redis_client = redis.asyncio.from_url(settings.REDIS_URL, decode_responses=True)
 
 
 def get_redis():
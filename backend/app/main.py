@@ -1,10 +1,19 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from loguru import logger
 import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
+from app.core.cache import (
+    cache_stats,
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
 from app.core.config import settings
+from app.core.database import start_query_count
+from app.core.http import outbound_client
+from app.services.enrichment import enrichment_pool
 from app.api.v1 import auth, entries, tags, analytics, ai
 
 if settings.SENTRY_DSN:
@@ -15,12 +24,25 @@ if settings.SENTRY_DSN:
         environment=settings.ENVIRONMENT,
     )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await outbound_client.start()
+    await enrichment_pool.start()
+    start_invalidation_listener()
+    yield
+    stop_invalidation_listener()
+    await enrichment_pool.stop()
+    await outbound_client.close()
+
+
 app = FastAPI(
     title="InsightVault API",
     description="AI-powered knowledge management platform API",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -43,6 +65,22 @@ async def health_check():
     return {"status": "healthy"}
 
 
+if settings.DEBUG:
+
+    @app.middleware("http")
+    async def count_queries(request: Request, call_next):
+        """Expose per-request SQL statement counts, to catch N+1 regressions"""
+        counter = start_query_count()
+        response = await call_next(request)
+        response.headers["X-Query-Count"] = str(counter[0])
+        return response
+
+    # Cache internals are for local tuning only, never the public app
+    @app.get("/metrics/cache")
+    async def cache_metrics():
+        return cache_stats()
+
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX, tags=["Authentication"])
 app.include_router(entries.router, prefix=settings.API_V1_PREFIX, tags=["Entries"])
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, LargeBinary, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class EntryEmbedding(Base):
+    """An entry's embedding vector, stored as packed float32"""
+
+    __tablename__ = "entry_embeddings"
+
+    entry_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("entries.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    model = Column(String(100), nullable=False)  # e.g. 'local:hash-256'
+    vector = Column(LargeBinary, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        Index("idx_entry_embeddings_user_updated", "user_id", "updated_at"),
+    )
+
+    def __repr__(self):
+        return f"<EntryEmbedding(entry_id={self.entry_id}, model={self.model})>"
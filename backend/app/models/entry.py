@@ -1,6 +1,17 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, func, Index
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    Computed,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    ForeignKey,
+    func,
+    Index,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 import uuid
 from app.core.database import Base
 
@@ -18,6 +29,8 @@ class Entry(Base):
     title = Column(String(500), nullable=False)
     content_type = Column(String(50), nullable=False)  # 'link', 'repo', 'note'
     url = Column(Text)
+    canonical_url = Column(Text)
+    url_hash = Column(String(64))  # sha256 of canonical_url, for duplicate checks
     content = Column(Text)  # For notes
     entry_metadata = Column(
         JSONB, name="metadata"
@@ -26,16 +39,46 @@ class Entry(Base):
     summary_status = Column(
         String(20), default="pending", index=True
     )  # 'pending', 'processing', 'completed', 'failed'
+    enrichment_status = Column(
+        String(20), default="pending"
+    )  # 'pending', 'processing', 'completed', 'failed', 'skipped'
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+    # Maintained by Postgres; deferred so it never rides along on entry loads
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(ai_summary, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(content, '')), 'C')",
+                persisted=True,
+            ),
+        )
+    )
 
     # Relationships
     user = relationship("User", backref="entries")
     tags = relationship("Tag", secondary="entry_tags", back_populates="entries")
 
-    __table_args__ = (Index("idx_entries_user_created", "user_id", "created_at"),)
+    __table_args__ = (
+        Index("idx_entries_user_created_id", "user_id", "created_at", "id"),
+        Index("idx_entries_user_url_hash", "user_id", "url_hash"),
+        Index("idx_entries_search_vector", "search_vector", postgresql_using="gin"),
+        # Typeahead; entry_suggest_terms() is defined by migration 015
+        Index(
+            "idx_entries_suggest_terms",
+            text("entry_suggest_terms(title, url)"),
+            postgresql_using="gin",
+        ),
+        Index(
+            "idx_entries_user_title_prefix",
+            "user_id",
+            text("lower(title) text_pattern_ops"),
+        ),
+    )
 
     def __repr__(self):
         return (
@@ -55,13 +98,28 @@ class Tag(Base):
     )
     name = Column(String(100), nullable=False)
     color = Column(String(7))  # Hex color code
+    # Maintained by triggers on entry_tags; see reconcile_tag_counts
+    usage_count = Column(Integer, nullable=False, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     user = relationship("User", backref="tags")
     entries = relationship("Entry", secondary="entry_tags", back_populates="tags")
 
-    __table_args__ = (Index("idx_tags_user_name", "user_id", "name", unique=True),)
+    __table_args__ = (
+        Index("idx_tags_user_name", "user_id", "name", unique=True),
+        Index("idx_tags_user_usage", "user_id", text("usage_count DESC"), "name"),
+        Index(
+            "idx_tags_user_name_trgm",
+            "user_id",
+            "name",
+            postgresql_using="gist",
+            postgresql_ops={"name": "gist_trgm_ops"},
+        ),
+        Index(
+            "idx_tags_user_name_prefix", "user_id", text("lower(name) text_pattern_ops")
+        ),
+    )
 
     def __repr__(self):
         return f"<Tag(id={self.id}, name={self.name})>"
@@ -79,5 +137,35 @@ class EntryTag(Base):
         UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True
     )
 
+    __table_args__ = (Index("idx_entry_tags_tag_entry", "tag_id", "entry_id"),)
+
     def __repr__(self):
         return f"<EntryTag(entry_id={self.entry_id}, tag_id={self.tag_id})>"
+
+
+class SuggestTerm(Base):
+    """A word from a user's entry titles and URLs, for typeahead"""
+
+    __tablename__ = "suggest_terms"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    term = Column(Text, primary_key=True)
+    # Maintained by triggers on entries; 0 once no entry uses the term
+    entry_count = Column(Integer, nullable=False, server_default="0")
+
+    __table_args__ = (
+        Index(
+            "idx_suggest_terms_user_trgm",
+            "user_id",
+            "term",
+            postgresql_using="gist",
+            postgresql_ops={"term": "gist_trgm_ops"},
+        ),
+    )
+
+    def __repr__(self):
+        return f"<SuggestTerm(term={self.term}, entries={self.entry_count})>"
@@ -0,0 +1,80 @@
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    SmallInteger,
+    func,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class EntrySignature(Base):
+    """MinHash signature of an entry's text, packed uint32"""
+
+    __tablename__ = "entry_signatures"
+
+    entry_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("entries.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    signature = Column(LargeBinary, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return f"<EntrySignature(entry_id={self.entry_id})>"
+
+
+class EntryLshBucket(Base):
+    """One LSH band of an entry's signature; entries sharing a bucket are candidates"""
+
+    __tablename__ = "entry_lsh_buckets"
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    entry_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("entries.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    __table_args__ = (Index("idx_entry_lsh_buckets_entry", "entry_id"),)
+
+    def __repr__(self):
+        return f"<EntryLshBucket(band={self.band}, entry_id={self.entry_id})>"
+
+
+class RelatedEntry(Base):
+    """Precomputed nearest neighbours of an entry, by estimated Jaccard"""
+
+    __tablename__ = "related_entries"
+
+    entry_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("entries.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    related_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("entries.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    score = Column(Float, nullable=False)
+
+    __table_args__ = (Index("idx_related_entries_related", "related_id"),)
+
+    def __repr__(self):
+        return f"<RelatedEntry({self.entry_id} -> {self.related_id}, {self.score})>"
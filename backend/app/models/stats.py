@@ -0,0 +1,45 @@
+from sqlalchemy import Column, String, BigInteger, Date, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class UserStat(Base):
+    """Per-user counters kept in step with writes, e.g. entries per type"""
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    stat = Column(String(50), primary_key=True)  # 'content_type', 'summary_status'
+    key = Column(String(100), primary_key=True)  # e.g. 'link'
+    value = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<UserStat(user_id={self.user_id}, {self.stat}:{self.key}={self.value})>"
+        )
+
+
+class UserActivity(Base):
+    """Per-user daily activity buckets, e.g. entries saved on one day"""
+
+    __tablename__ = "user_activity"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    metric = Column(String(50), primary_key=True)  # e.g. 'entries_saved'
+    day = Column(Date, primary_key=True)  # UTC
+    key = Column(String(100), primary_key=True, default="")  # e.g. 'link' or tag id
+    value = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<UserActivity(user_id={self.user_id}, {self.metric}:{self.key}"
+            f"@{self.day}={self.value})>"
+        )
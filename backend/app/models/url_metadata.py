@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Text, DateTime, Boolean, func
+from sqlalchemy.dialects.postgresql import JSONB
+from app.core.database import Base
+
+
+class UrlMetadata(Base):
+    """Shared cache of fetched link/repo metadata, keyed by canonical URL"""
+
+    __tablename__ = "url_metadata"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256 of kind + URL
+    kind = Column(String(20), nullable=False)  # 'link', 'repo'
+    canonical_url = Column(Text, nullable=False)
+    url_metadata = Column(JSONB, name="metadata")
+    ok = Column(Boolean, nullable=False, default=True)  # False = negative entry
+    etag = Column(String(255))
+    last_modified = Column(String(64))
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<UrlMetadata(kind={self.kind}, url={self.canonical_url[:80]})>"
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+from enum import Enum
+
+
+class ActivityMetric(str, Enum):
+    ENTRIES_SAVED = "entries_saved"
+    SUMMARIES_COMPLETED = "summaries_completed"
+    TAGS_APPLIED = "tags_applied"
+
+
+class Granularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class TimeseriesPoint(BaseModel):
+    date: date  # First day of the bucket
+    value: int
+
+
+class TimeseriesResponse(BaseModel):
+    metric: ActivityMetric
+    granularity: Granularity
+    key: Optional[str] = None  # Content type or tag id the series is limited to
+    start: date
+    end: date
+    points: List[TimeseriesPoint]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import AliasChoices, BaseModel, HttpUrl, Field, constr
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -20,6 +20,14 @@ class SummaryStatus(str, Enum):
     FAILED = "failed"
 
 
+class EnrichmentStatus(str, Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
 class EntryBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=500)
     content_type: ContentType
@@ -32,6 +40,23 @@ class EntryCreate(EntryBase):
     pass
 
 
+class EntryImportRow(EntryCreate):
+    tags: List[constr(strip_whitespace=True, min_length=1, max_length=100)] = []
+    created_at: Optional[datetime] = None
+
+
+class EntryImportError(BaseModel):
+    line: int
+    error: str
+
+
+class EntryImportResponse(BaseModel):
+    imported: int
+    failed: int
+    duplicates: int = 0  # Links already saved, skipped
+    errors: List[EntryImportError] = []
+
+
 class EntryUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=500)
     content: Optional[str] = None
@@ -51,6 +76,7 @@ class TagResponse(TagBase):
     id: UUID
     user_id: UUID
     created_at: datetime
+    usage_count: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -59,19 +85,73 @@ class TagResponse(TagBase):
 class EntryResponse(EntryBase):
     id: UUID
     user_id: UUID
+    # The ORM attribute is entry_metadata; Entry.metadata is SQLAlchemy's MetaData
+    metadata: Optional[Dict[str, Any]] = Field(
+        None, validation_alias=AliasChoices("entry_metadata", "metadata")
+    )
     ai_summary: Optional[str] = None
     summary_status: SummaryStatus
+    enrichment_status: EnrichmentStatus = EnrichmentStatus.COMPLETED
     created_at: datetime
     updated_at: datetime
     tags: List[TagResponse] = []
+    snippet: Optional[str] = None  # Highlighted match, search results only
+    score: Optional[float] = None  # Similarity, semantic search and related only
 
     class Config:
         from_attributes = True
 
 
+class Pagination(BaseModel):
+    page: Optional[int] = None
+    limit: int
+    total: int
+    pages: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    has_more: bool = False
+    total_capped: bool = False  # total is a lower bound, not an exact count
+
+
+class TagMode(str, Enum):
+    ALL = "all"
+    ANY = "any"
+
+
+class TagFacet(BaseModel):
+    id: UUID
+    name: str
+    count: int
+
+
+class EntryFacets(BaseModel):
+    content_types: Dict[str, int] = {}
+    tags: List[TagFacet] = []
+
+
 class EntryListResponse(BaseModel):
     data: List[EntryResponse]
-    pagination: Dict[str, int]
+    pagination: Pagination
+    facets: Optional[EntryFacets] = None
+
+
+class EntrySuggestion(BaseModel):
+    id: UUID
+    title: str
+    url: Optional[str] = None
+    content_type: ContentType
+    score: float
+
+
+class TagSuggestion(BaseModel):
+    id: UUID
+    name: str
+    score: float
+
+
+class SuggestResponse(BaseModel):
+    entries: List[EntrySuggestion] = []
+    tags: List[TagSuggestion] = []
 
 
 class EntrySearchRequest(BaseModel):
@@ -80,6 +160,28 @@ class EntrySearchRequest(BaseModel):
     limit: int = Field(20, ge=1, le=100)
     content_type: Optional[ContentType] = None
     tags: Optional[List[UUID]] = None
+    tag_mode: TagMode = TagMode.ALL
+
+
+class TagBatchAction(str, Enum):
+    ADD = "add"
+    REMOVE = "remove"
+
+
+class EntryTagsBatchRequest(BaseModel):
+    entry_ids: List[UUID] = Field(..., min_length=1, max_length=1000)
+    tag_ids: List[UUID] = Field([], max_length=100)
+    # Tags by name; missing ones are created when adding
+    tag_names: List[
+        constr(strip_whitespace=True, min_length=1, max_length=100)
+    ] = Field([], max_length=100)
+    action: TagBatchAction = TagBatchAction.ADD
+
+
+class EntryTagsBatchResponse(BaseModel):
+    entries: int
+    tags: int
+    changed: int  # Links added or removed
 
 
 class SummarizeRequest(BaseModel):
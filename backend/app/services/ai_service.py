@@ -1,12 +1,35 @@
 from fastapi import BackgroundTasks
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from uuid import UUID
+from collections import Counter
+from app.core.cache import bump_generation, bump_version
 from app.core.config import settings
+from app.models.embedding import EntryEmbedding
 from app.models.entry import Entry
 from app.schemas.entry import SummaryStatus
+from app.services.stats_service import count_summary_change
+import hashlib
+import math
+import re
 import httpx
+import numpy as np
 from loguru import logger
 
+EMBEDDING_MAX_CHARS = 8000
+GEMINI_EMBEDDING_MODEL = "text-embedding-004"
+GEMINI_EMBEDDING_DIM = 768
+# Per-user counter bumped whenever a stored embedding changes
+EMBEDDING_VERSION = "embeddings"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _set_summary_status(db: Session, entry: Entry, status: SummaryStatus):
+    count_summary_change(db, entry.user_id, entry.summary_status, status.value)
+    entry.summary_status = status.value
+
 
 async def generate_summary(entry_id: UUID, db: Session):
     """Generate AI summary for an entry"""
@@ -15,7 +38,7 @@ async def generate_summary(entry_id: UUID, db: Session):
         return
 
     # Update status to processing
-    entry.summary_status = SummaryStatus.PROCESSING.value
+    _set_summary_status(db, entry, SummaryStatus.PROCESSING)
     db.commit()
 
     try:
@@ -48,13 +71,15 @@ async def generate_summary(entry_id: UUID, db: Session):
 
         # Update entry
         entry.ai_summary = summary
-        entry.summary_status = SummaryStatus.COMPLETED.value
+        _set_summary_status(db, entry, SummaryStatus.COMPLETED)
         db.commit()
+        bump_generation(entry.user_id)
 
     except Exception as e:
         logger.error(f"Error generating summary for entry {entry_id}: {e}")
-        entry.summary_status = SummaryStatus.FAILED.value
+        _set_summary_status(db, entry, SummaryStatus.FAILED)
         db.commit()
+        bump_generation(entry.user_id)
 
 
 async def call_openrouter(prompt: str) -> str:
@@ -87,3 +112,97 @@ async def call_gemini(prompt: str) -> str:
         response.raise_for_status()
         result = response.json()
         return result["candidates"][0]["content"]["parts"][0]["text"]
+
+
+def _embedding_provider() -> str:
+    if settings.EMBEDDING_PROVIDER == "gemini" and settings.GEMINI_API_KEY:
+        return "gemini"
+    return "local"
+
+
+def embedding_model() -> str:
+    """Identifier stored with each vector; vectors from other models are ignored"""
+    if _embedding_provider() == "gemini":
+        return f"gemini:{GEMINI_EMBEDDING_MODEL}"
+    return f"local:hash-{settings.EMBEDDING_DIM}"
+
+
+def embedding_dim() -> int:
+    if _embedding_provider() == "gemini":
+        return GEMINI_EMBEDDING_DIM
+    return settings.EMBEDDING_DIM
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def embed_text_local(text: str) -> np.ndarray:
+    """Deterministic feature-hashing embedding, no model or network needed"""
+    vector = np.zeros(settings.EMBEDDING_DIM, dtype=np.float32)
+    tokens = _TOKEN_RE.findall(text.lower())
+    # Bigrams keep a little word order
+    features = Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+    for feature, count in features.items():
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        bucket = int.from_bytes(digest, "little")
+        sign = 1.0 if bucket >> 63 else -1.0
+        vector[bucket % settings.EMBEDDING_DIM] += sign * (1.0 + math.log(count))
+    return _normalize(vector)
+
+
+async def call_gemini_embedding(text: str) -> np.ndarray:
+    """Call Google Gemini embedding API"""
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_EMBEDDING_MODEL}:embedContent?key={settings.GEMINI_API_KEY}"
+    data = {
+        "model": f"models/{GEMINI_EMBEDDING_MODEL}",
+        "content": {"parts": [{"text": text}]},
+    }
+
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json=data, timeout=30)
+        response.raise_for_status()
+        result = response.json()
+        return _normalize(np.array(result["embedding"]["values"], dtype=np.float32))
+
+
+async def embed_text(text: str) -> np.ndarray:
+    """Embed text with the configured provider as a unit-length float32 vector"""
+    if _embedding_provider() == "gemini":
+        return await call_gemini_embedding(text[:EMBEDDING_MAX_CHARS])
+    return embed_text_local(text[:EMBEDDING_MAX_CHARS])
+
+
+def entry_embedding_text(entry: Entry) -> str:
+    metadata = entry.entry_metadata or {}
+    parts = [
+        entry.title,
+        entry.ai_summary,
+        entry.content or metadata.get("description"),
+    ]
+    return "\n".join(part for part in parts if part)
+
+
+async def generate_embedding(entry_id: UUID, db: Session):
+    """Compute and store the embedding for an entry"""
+    entry = db.query(Entry).filter(Entry.id == entry_id).first()
+    if not entry:
+        return
+
+    vector = await embed_text(entry_embedding_text(entry))
+    values = {
+        "model": embedding_model(),
+        "vector": vector.astype(np.float32).tobytes(),
+    }
+    db.execute(
+        pg_insert(EntryEmbedding)
+        .values(entry_id=entry.id, user_id=entry.user_id, **values)
+        .on_conflict_do_update(
+            index_elements=["entry_id"], set_={**values, "updated_at": func.now()}
+        )
+    )
+    db.commit()
+    # Only vector indexes and semantic results depend on embeddings, so the
+    # shared generation (and every cached view with it) is left alone
+    bump_version(EMBEDDING_VERSION, entry.user_id)
@@ -0,0 +1,129 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+from loguru import logger
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.core.cache import bump_generation
+from app.models.entry import Entry, EntryTag
+from app.schemas.entry import SummaryStatus
+from app.services.stats_service import count_entries_deleted, count_summary_change
+from app.services.url_utils import canonicalize_url, url_hash
+
+
+def backfill_url_hashes(db: Session, user_id: Optional[UUID] = None) -> int:
+    """Fill canonical_url/url_hash on link entries saved without them"""
+    filled = 0
+    while True:
+        query = (
+            select(Entry.id, Entry.url)
+            .where(Entry.url.isnot(None), Entry.url_hash.is_(None))
+            .limit(1000)
+        )
+        if user_id:
+            query = query.where(Entry.user_id == user_id)
+        rows = db.execute(query).all()
+        if not rows:
+            return filled
+        db.execute(
+            update(Entry),
+            [
+                {
+                    "id": entry_id,
+                    "canonical_url": canonicalize_url(url),
+                    "url_hash": url_hash(url),
+                }
+                for entry_id, url in rows
+            ],
+        )
+        db.commit()
+        filled += len(rows)
+
+
+def _merge_group(db: Session, user_id: UUID, entry_ids: List[UUID]) -> bool:
+    """Fold later copies into the oldest; True if the survivor's text changed"""
+    survivor_id, duplicate_ids = entry_ids[0], entry_ids[1:]
+    survivor = db.get(Entry, survivor_id)
+    duplicates = (
+        db.query(Entry)
+        .filter(Entry.id.in_(duplicate_ids))
+        .order_by(Entry.created_at, Entry.id)
+        .all()
+    )
+
+    # Union of all tags onto the survivor
+    db.execute(
+        pg_insert(EntryTag)
+        .from_select(
+            ["entry_id", "tag_id"],
+            select(literal(survivor_id, PG_UUID(as_uuid=True)), EntryTag.tag_id)
+            .where(EntryTag.entry_id.in_(duplicate_ids))
+            .distinct(),
+        )
+        .on_conflict_do_nothing()
+    )
+
+    # The survivor's own values win; copies only fill in what it lacks
+    metadata = {}
+    for duplicate in reversed(duplicates):
+        metadata.update(duplicate.entry_metadata or {})
+    metadata.update(survivor.entry_metadata or {})
+    survivor.entry_metadata = metadata
+
+    text_changed = False
+    if not survivor.ai_summary:
+        summarized = next((d for d in duplicates if d.ai_summary), None)
+        if summarized:
+            survivor.ai_summary = summarized.ai_summary
+            count_summary_change(
+                db, user_id, survivor.summary_status, SummaryStatus.COMPLETED.value
+            )
+            survivor.summary_status = SummaryStatus.COMPLETED.value
+            text_changed = True
+
+    for duplicate in duplicates:
+        db.delete(duplicate)
+    count_entries_deleted(db, user_id, duplicates)
+    db.commit()
+    return text_changed
+
+
+def merge_duplicate_entries(
+    db: Session, user_id: Optional[UUID] = None, dry_run: bool = False
+) -> Tuple[int, int, List[UUID]]:
+    """Merge entries saved more than once for the same URL into the oldest copy.
+
+    Returns (duplicate groups, entries removed, survivors whose text changed).
+    """
+    backfill_url_hashes(db, user_id)
+
+    query = (
+        select(
+            Entry.user_id,
+            func.array_agg(aggregate_order_by(Entry.id, Entry.created_at, Entry.id)),
+        )
+        .where(Entry.url_hash.isnot(None))
+        .group_by(Entry.user_id, Entry.url_hash)
+        .having(func.count() > 1)
+    )
+    if user_id:
+        query = query.where(Entry.user_id == user_id)
+    groups = db.execute(query).all()
+
+    removed = 0
+    changed: List[UUID] = []
+    touched_users = set()
+    for owner_id, entry_ids in groups:
+        removed += len(entry_ids) - 1
+        if dry_run:
+            logger.info(f"Would merge {entry_ids[1:]} into {entry_ids[0]}")
+            continue
+        if _merge_group(db, owner_id, entry_ids):
+            changed.append(entry_ids[0])
+        touched_users.add(owner_id)
+
+    for owner_id in touched_users:
+        bump_generation(owner_id)
+
+    return len(groups), removed, changed
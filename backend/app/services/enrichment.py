@@ -0,0 +1,348 @@
+import asyncio
+import json
+import os
+import socket
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+import redis
+from loguru import logger
+from starlette.concurrency import run_in_threadpool
+from app.core.cache import bump_generation
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.http import RetryAfter
+from app.core.redis import async_redis_client
+from app.models.entry import Entry
+from app.schemas.entry import ContentType, EnrichmentStatus
+from app.services.ai_service import generate_embedding, generate_summary
+from app.services.related_service import update_related_entries
+from app.services.metadata_service import (
+    fetch_url_metadata,
+    fetch_github_repo_metadata,
+)
+
+
+class EnrichmentError(Exception):
+    """Raised by a job handler when the job should be retried"""
+
+
+class LocalQueue:
+    """In-process stand-in for the Redis stream, for tests and local dev"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._next_id = 0
+
+    def _jobs(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    async def enqueue(self, job: Dict, delay: float = 0.0):
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._jobs().put_nowait, job)
+            return
+        await self._jobs().put(job)
+
+    async def enqueue_many(self, jobs: List[Dict]):
+        for job in jobs:
+            await self._jobs().put(job)
+
+    async def claim(self, consumer: str, timeout: float) -> Optional[Tuple[str, Dict]]:
+        try:
+            job = await asyncio.wait_for(self._jobs().get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._next_id += 1
+        return str(self._next_id), job
+
+    async def ack(self, message_id: str):
+        self._jobs().task_done()
+
+    async def join(self):
+        """Wait until every enqueued job has been processed"""
+        await self._jobs().join()
+
+
+class RedisStreamQueue:
+    """Durable job queue on a Redis stream with a consumer group.
+
+    Jobs stay in the group's pending list until acknowledged, so a worker
+    that dies mid-job has its messages reclaimed by another consumer once
+    they have been idle for the visibility timeout. Delayed retries wait in
+    a sorted set scored by due time and are moved onto the stream by
+    whichever worker polls next.
+    """
+
+    stream = "enrichment:jobs"
+    group = "enrichment"
+    delayed = "enrichment:delayed"
+
+    def __init__(self, client=async_redis_client):
+        self.client = client
+        self._group_ready = False
+
+    async def _ensure_group(self):
+        if self._group_ready:
+            return
+        try:
+            await self.client.xgroup_create(
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def enqueue(self, job: Dict, delay: float = 0.0):
+        payload = json.dumps(job)
+        if delay > 0:
+            await self.client.zadd(self.delayed, {payload: time.time() + delay})
+            return
+        await self.client.xadd(self.stream, {"job": payload})
+
+    async def enqueue_many(self, jobs: List[Dict]):
+        async with self.client.pipeline(transaction=False) as pipe:
+            for job in jobs:
+                pipe.xadd(self.stream, {"job": json.dumps(job)})
+            await pipe.execute()
+
+    async def _promote_due(self):
+        due: List[str] = await self.client.zrangebyscore(
+            self.delayed, 0, time.time(), start=0, num=100
+        )
+        for payload in due:
+            # Only the worker that wins the ZREM moves the job
+            if await self.client.zrem(self.delayed, payload):
+                await self.client.xadd(self.stream, {"job": payload})
+
+    async def claim(self, consumer: str, timeout: float) -> Optional[Tuple[str, Dict]]:
+        await self._ensure_group()
+        await self._promote_due()
+
+        reclaimed = await self.client.xautoclaim(
+            self.stream,
+            self.group,
+            consumer,
+            min_idle_time=settings.ENRICHMENT_VISIBILITY_TIMEOUT_SECONDS * 1000,
+            start_id="0-0",
+            count=1,
+        )
+        if reclaimed[1]:
+            message_id, fields = reclaimed[1][0]
+            return message_id, json.loads(fields["job"])
+
+        response = await self.client.xreadgroup(
+            self.group,
+            consumer,
+            {self.stream: ">"},
+            count=1,
+            block=int(timeout * 1000),
+        )
+        if not response:
+            return None
+        _, messages = response[0]
+        message_id, fields = messages[0]
+        return message_id, json.loads(fields["job"])
+
+    async def ack(self, message_id: str):
+        await self.client.xack(self.stream, self.group, message_id)
+        await self.client.xdel(self.stream, message_id)
+
+
+def _set_enrichment_status(entry_id: UUID, status: EnrichmentStatus):
+    db = SessionLocal()
+    try:
+        entry = db.query(Entry).filter(Entry.id == entry_id).first()
+        if entry:
+            entry.enrichment_status = status.value
+            db.commit()
+            bump_generation(entry.user_id)
+    finally:
+        db.close()
+
+
+async def enrich_entry_metadata(entry_id: UUID):
+    """Fill in link/repo metadata for an entry created without it"""
+    db = SessionLocal()
+    try:
+        entry = db.query(Entry).filter(Entry.id == entry_id).first()
+        if not entry or not entry.url:
+            return
+
+        entry.enrichment_status = EnrichmentStatus.PROCESSING.value
+        db.commit()
+
+        if entry.content_type == ContentType.REPO.value:
+            fetched_metadata = await fetch_github_repo_metadata(entry.url)
+            title_key = "full_name"
+        else:
+            fetched_metadata = await fetch_url_metadata(entry.url)
+            title_key = "title"
+
+        if fetched_metadata is None:
+            raise EnrichmentError(f"No metadata available for {entry.url}")
+
+        db.refresh(entry)
+        if not fetched_metadata:
+            # Fetched fine but nothing to extract (PDFs, images); retrying
+            # would only get the same answer
+            entry.enrichment_status = EnrichmentStatus.COMPLETED.value
+            db.commit()
+            bump_generation(entry.user_id)
+            return
+
+        entry_metadata = dict(entry.entry_metadata or {})
+        entry_metadata.update(fetched_metadata)
+        entry.entry_metadata = entry_metadata
+        if not entry.title and fetched_metadata.get(title_key):
+            entry.title = fetched_metadata[title_key][:500]
+        entry.enrichment_status = EnrichmentStatus.COMPLETED.value
+        db.commit()
+        bump_generation(entry.user_id)
+    finally:
+        db.close()
+
+    # The fetched description is part of the indexed text
+    await enqueue_text_indexing([entry_id])
+
+
+async def summarize_entry(entry_id: UUID):
+    """Generate the AI summary for an entry outside of a request"""
+    db = SessionLocal()
+    try:
+        await generate_summary(entry_id, db)
+    finally:
+        db.close()
+
+    await enqueue_text_indexing([entry_id])
+
+
+async def embed_entry(entry_id: UUID):
+    """Compute the embedding used by semantic search"""
+    db = SessionLocal()
+    try:
+        await generate_embedding(entry_id, db)
+    finally:
+        db.close()
+
+
+def _relate_entry_sync(entry_id: UUID):
+    db = SessionLocal()
+    try:
+        update_related_entries(db, entry_id)
+    finally:
+        db.close()
+
+
+async def relate_entry(entry_id: UUID):
+    """Refresh the MinHash signature and related entries of an entry"""
+    # Blocking queries and NumPy scoring stay off the event loop
+    await run_in_threadpool(_relate_entry_sync, entry_id)
+
+
+JOB_HANDLERS: Dict[str, Callable[[UUID], Awaitable[None]]] = {
+    "metadata": enrich_entry_metadata,
+    "summary": summarize_entry,
+    "embed": embed_entry,
+    "related": relate_entry,
+}
+
+# Jobs to rerun whenever an entry's text changes
+TEXT_JOB_KINDS = ("embed", "related")
+
+
+class EnrichmentWorkerPool:
+    """Fixed set of asyncio workers draining the enrichment queue"""
+
+    def __init__(self, queue, concurrency: int):
+        self.queue = queue
+        self.concurrency = concurrency
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        for i in range(self.concurrency):
+            # Consumer names must be unique across every process in the group
+            consumer = f"{socket.gethostname()}-{os.getpid()}-{i}"
+            self._tasks.append(asyncio.create_task(self._run(consumer)))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, consumer: str):
+        while True:
+            try:
+                claimed = await self.queue.claim(consumer, timeout=5.0)
+                if claimed is None:
+                    continue
+                message_id, job = claimed
+                await self._process(job)
+                await self.queue.ack(message_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Enrichment worker {consumer} error: {e}")
+                await asyncio.sleep(1)
+
+    async def _process(self, job: Dict):
+        entry_id = UUID(job["entry_id"])
+        kind = job.get("kind", "metadata")
+        handler = JOB_HANDLERS[kind]
+        attempt = job.get("attempt", 0)
+        # enrichment_status describes the metadata fetch only; other kinds
+        # (summary, embed, related) must not overwrite it
+        tracks_status = kind == "metadata"
+
+        try:
+            await handler(entry_id)
+        except RetryAfter as e:
+            # Quota back-pressure doesn't count as a failed attempt
+            delay = max(1.0, e.retry_at - time.time())
+            logger.info(f"Deferring {job} for {delay:.0f}s: {e}")
+            if tracks_status:
+                _set_enrichment_status(entry_id, EnrichmentStatus.PENDING)
+            await self.queue.enqueue(job, delay=delay)
+        except Exception as e:
+            attempt += 1
+            if attempt >= settings.ENRICHMENT_MAX_ATTEMPTS:
+                logger.error(f"Giving up on {job} after {attempt} attempts: {e}")
+                if tracks_status:
+                    _set_enrichment_status(entry_id, EnrichmentStatus.FAILED)
+                return
+
+            delay = settings.ENRICHMENT_RETRY_BASE_SECONDS * 4 ** (attempt - 1)
+            logger.warning(f"Retrying {job} in {delay}s: {e}")
+            if tracks_status:
+                _set_enrichment_status(entry_id, EnrichmentStatus.PENDING)
+            await self.queue.enqueue({**job, "attempt": attempt}, delay=delay)
+
+
+if settings.ENRICHMENT_QUEUE_BACKEND == "redis":
+    enrichment_queue = RedisStreamQueue()
+else:
+    enrichment_queue = LocalQueue()
+
+enrichment_pool = EnrichmentWorkerPool(enrichment_queue, settings.ENRICHMENT_WORKERS)
+
+
+async def enqueue_enrichment(entry_id: UUID, kind: str = "metadata"):
+    """Queue a background enrichment job for an entry"""
+    await enrichment_queue.enqueue({"entry_id": str(entry_id), "kind": kind})
+
+
+async def enqueue_enrichment_many(entry_ids: List[UUID], kind: str = "metadata"):
+    """Queue the same kind of job for many entries in one round-trip"""
+    if entry_ids:
+        await enrichment_queue.enqueue_many(
+            [{"entry_id": str(entry_id), "kind": kind} for entry_id in entry_ids]
+        )
+
+
+async def enqueue_text_indexing(entry_ids: List[UUID]):
+    """Queue the jobs that index entries' text, after it changed"""
+    for kind in TEXT_JOB_KINDS:
+        await enqueue_enrichment_many(entry_ids, kind=kind)
@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from app.core.pagination import encode_cursor, keyset_paginate
+from app.models.entry import Entry
+from app.schemas.entry import EntryListResponse, Pagination
+
+COUNT_CAP = 1000
+
+
+def entry_key(entry: Entry) -> list:
+    return [entry.created_at.isoformat(), str(entry.id)]
+
+
+def fetch_page(
+    query,
+    keyset: tuple,
+    descending: bool,
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    key_of,
+    decoders: tuple,
+    extra: Optional[dict] = None,
+) -> Tuple[list, Optional[int], Optional[str], Optional[str]]:
+    """Fetch one page by cursor, or by page number for older clients.
+
+    Page numbers go through OFFSET, but still hand back cursors so clients
+    can switch over from any page. Tags for the whole page are loaded in one
+    extra query. Returns (rows, page, next, prev).
+    """
+    query = query.options(selectinload(Entry.tags))
+    if cursor or page == 1:
+        rows, next_cursor, prev_cursor = keyset_paginate(
+            query, keyset, descending, cursor, limit, key_of, decoders, extra
+        )
+        return rows, None if cursor else 1, next_cursor, prev_cursor
+
+    order = [c.desc() if descending else c.asc() for c in keyset]
+    rows = query.order_by(*order).offset((page - 1) * limit).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = prev_cursor = None
+    if rows:
+        if has_more:
+            next_cursor = encode_cursor(
+                {**(extra or {}), "k": key_of(rows[-1]), "d": "n"}
+            )
+        prev_cursor = encode_cursor({**(extra or {}), "k": key_of(rows[0]), "d": "p"})
+    return rows, page, next_cursor, prev_cursor
+
+
+def build_pagination(
+    page: Optional[int],
+    limit: int,
+    total: int,
+    next_cursor: Optional[str],
+    prev_cursor: Optional[str],
+    total_capped: bool = False,
+) -> Pagination:
+    return Pagination(
+        page=page,
+        limit=limit,
+        total=total,
+        pages=(total + limit - 1) // limit,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        has_more=next_cursor is not None,
+        total_capped=total_capped,
+    )
+
+
+def paginate_entries(
+    query,
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    newest_first: bool,
+    total: int,
+    total_capped: bool = False,
+) -> EntryListResponse:
+    """Page through entries by (created_at, id), newest or oldest first.
+
+    Cursors seek through idx_entries_user_created_id in constant time.
+    """
+    entries, page_number, next_cursor, prev_cursor = fetch_page(
+        query,
+        (Entry.created_at, Entry.id),
+        newest_first,
+        page,
+        limit,
+        cursor,
+        key_of=entry_key,
+        decoders=(datetime.fromisoformat, UUID),
+    )
+    return EntryListResponse(
+        data=entries,
+        pagination=build_pagination(
+            page_number, limit, total, next_cursor, prev_cursor, total_capped
+        ),
+    )
+
+
+def capped_count(db: Session, query) -> Tuple[int, bool]:
+    """Count matches up to COUNT_CAP. Returns (total, capped).
+
+    Counting every match is as expensive as the query itself, so past the
+    cap the total is a lower bound and clients rely on has_more instead.
+    """
+    total = (
+        db.query(func.count())
+        .select_from(query.limit(COUNT_CAP + 1).subquery())
+        .scalar()
+    )
+    return min(total, COUNT_CAP), total > COUNT_CAP
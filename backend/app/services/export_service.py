@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterator, List
+from uuid import UUID
+from sqlalchemy import select
+from app.core.database import SessionLocal
+from app.models.entry import Entry, Tag, EntryTag
+
+EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "content_type",
+    "url",
+    "content",
+    "metadata",
+    "ai_summary",
+    "summary_status",
+    "created_at",
+    "updated_at",
+    "tags",
+]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "json": "application/json",
+}
+
+
+def iter_export_batches(user_id: UUID, batch_size: int) -> Iterator[List[dict]]:
+    """Yield a user's entries in batches from a server-side cursor.
+
+    Plain columns are selected rather than ORM objects so nothing piles up in
+    the session, and tags are fetched with one query per batch.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(
+                Entry.id,
+                Entry.title,
+                Entry.content_type,
+                Entry.url,
+                Entry.content,
+                Entry.entry_metadata,
+                Entry.ai_summary,
+                Entry.summary_status,
+                Entry.created_at,
+                Entry.updated_at,
+            )
+            .where(Entry.user_id == user_id)
+            .order_by(Entry.created_at, Entry.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        for partition in result.partitions():
+            ids = [row.id for row in partition]
+            tags: Dict[UUID, List[str]] = defaultdict(list)
+            for entry_id, name in db.execute(
+                select(EntryTag.entry_id, Tag.name)
+                .join(Tag, Tag.id == EntryTag.tag_id)
+                .where(EntryTag.entry_id.in_(ids))
+            ):
+                tags[entry_id].append(name)
+
+            yield [
+                {
+                    "id": str(row.id),
+                    "title": row.title,
+                    "content_type": row.content_type,
+                    "url": row.url,
+                    "content": row.content,
+                    "metadata": row.entry_metadata,
+                    "ai_summary": row.ai_summary,
+                    "summary_status": row.summary_status,
+                    "created_at": row.created_at.isoformat(),
+                    "updated_at": row.updated_at.isoformat()
+                    if row.updated_at
+                    else None,
+                    "tags": sorted(tags[row.id]),
+                }
+                for row in partition
+            ]
+    finally:
+        db.close()
+
+
+def _ndjson(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(json.dumps(row) + "\n" for row in batch).encode("utf-8")
+
+
+def _json(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    yield b"["
+    first = True
+    for batch in batches:
+        chunk = ",".join(json.dumps(row) for row in batch)
+        if not first:
+            chunk = "," + chunk
+        first = False
+        yield chunk.encode("utf-8")
+    yield b"]"
+
+
+def _csv_value(row: dict, column: str):
+    if column == "metadata":
+        return json.dumps(row["metadata"])
+    if column == "tags":
+        return ",".join(row["tags"])
+    return row[column]
+
+
+def _csv(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        for row in batch:
+            writer.writerow([_csv_value(row, column) for column in EXPORT_COLUMNS])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only, for an empty vault
+        yield buffer.getvalue().encode("utf-8")
+
+
+FORMATTERS = {"ndjson": _ndjson, "json": _json, "csv": _csv}
+
+
+def gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Gzip a byte stream on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_entries(
+    user_id: UUID, format: str, compress: bool, batch_size: int = 1000
+) -> Iterator[bytes]:
+    """Stream a user's whole vault in the requested format"""
+    chunks = FORMATTERS[format](iter_export_batches(user_id, batch_size))
+    return gzip_stream(chunks) if compress else chunks
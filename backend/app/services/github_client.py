@@ -0,0 +1,172 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import redis
+from loguru import logger
+from app.core.config import settings
+from app.core.http import OutboundClient, FetchResult, RetryAfter, outbound_client
+from app.core.redis import redis_client
+from app.services.metadata_cache import LoadResult
+
+RATE_LIMIT_KEY = "github:rate-limited-until"
+
+
+class GitHubRateLimited(RetryAfter):
+    """Raised when the GitHub API quota is exhausted until ``retry_at``"""
+
+
+def parse_repo_url(repo_url: str) -> Tuple[str, str]:
+    """Extract (owner, repo) from a github.com URL"""
+    parts = [p for p in urlsplit(repo_url).path.split("/") if p]
+    if (urlsplit(repo_url).hostname or "").lower() not in (
+        "github.com",
+        "www.github.com",
+    ) or len(parts) < 2:
+        raise ValueError("Invalid GitHub URL")
+
+    owner, repo = parts[0], parts[1]
+    if repo.endswith(".git"):
+        repo = repo[:-4]
+    return owner, repo
+
+
+class GitHubClient:
+    """Quota-aware client for the GitHub repos API.
+
+    Sends conditional requests with the cached ETag (304s are free against
+    the rate limit), coalesces concurrent lookups of the same repo into one
+    request, and tracks ``X-RateLimit-*`` headers. Once the quota is gone
+    every worker in the deployment stops calling GitHub and callers get a
+    ``GitHubRateLimited`` carrying the reset time so they can retry later.
+    """
+
+    def __init__(
+        self,
+        http: OutboundClient = outbound_client,
+        api_url: str = settings.GITHUB_API_URL,
+        token: str = settings.GITHUB_TOKEN,
+    ):
+        self.http = http
+        self.api_url = api_url.rstrip("/")
+        self.token = token
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _headers(self, etag: Optional[str]) -> Dict[str, str]:
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if etag:
+            headers["If-None-Match"] = etag
+        return headers
+
+    def _limited_until(self) -> float:
+        if self.remaining == 0 and time.time() < self.reset_at:
+            return self.reset_at
+        try:
+            shared = redis_client.get(RATE_LIMIT_KEY)
+        except redis.RedisError:
+            shared = None
+        return float(shared) if shared else 0.0
+
+    def _record_rate_limit(self, response: FetchResult):
+        remaining = response.headers.get("x-ratelimit-remaining")
+        reset = response.headers.get("x-ratelimit-reset")
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = float(reset)
+
+        limited_until = 0.0
+        if response.status_code in (403, 429):
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                # Secondary rate limits come with Retry-After instead
+                limited_until = time.time() + float(retry_after)
+            elif self.remaining == 0:
+                limited_until = self.reset_at
+        elif self.remaining == 0:
+            limited_until = self.reset_at
+
+        if limited_until > time.time():
+            logger.warning(f"GitHub rate limit exhausted until {limited_until}")
+            try:
+                redis_client.set(
+                    RATE_LIMIT_KEY,
+                    str(limited_until),
+                    ex=max(1, int(limited_until - time.time()) + 1),
+                )
+            except redis.RedisError:
+                pass
+            if response.status_code in (403, 429):
+                raise GitHubRateLimited(
+                    "GitHub rate limit exhausted", retry_at=limited_until
+                )
+
+    async def get_repo(
+        self, owner: str, repo: str, etag: Optional[str] = None
+    ) -> LoadResult:
+        """Look up a repository, sharing the request with concurrent callers"""
+        key = f"{owner.lower()}/{repo.lower()}:{etag or ''}"
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch_repo(owner, repo, etag)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a lookup with no other waiters doesn't warn
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _fetch_repo(
+        self, owner: str, repo: str, etag: Optional[str]
+    ) -> LoadResult:
+        limited_until = self._limited_until()
+        if limited_until > time.time():
+            raise GitHubRateLimited(
+                "GitHub rate limit exhausted", retry_at=limited_until
+            )
+
+        response = await self.http.fetch(
+            f"{self.api_url}/repos/{owner}/{repo}", headers=self._headers(etag)
+        )
+        self._record_rate_limit(response)
+
+        if response.status_code == 304:
+            return LoadResult(not_modified=True, etag=etag)
+        response.raise_for_status()
+
+        data = response.json()
+
+        return LoadResult(
+            metadata={
+                "name": data.get("name", ""),
+                "full_name": data.get("full_name", ""),
+                "description": data.get("description", ""),
+                "stars": data.get("stargazers_count", 0),
+                "language": data.get("language", ""),
+                "forks": data.get("forks_count", 0),
+                "url": data.get("html_url", ""),
+            },
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+
+
+github_client = GitHubClient()
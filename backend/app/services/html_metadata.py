@@ -0,0 +1,178 @@
+import codecs
+import re
+from typing import Dict, Optional
+from lxml import etree
+
+# Per the HTML spec, a <meta charset> must appear within the first 1024 bytes
+SNIFF_BYTES = 1024
+
+_META_CHARSET = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_\-:.]+)""", re.IGNORECASE
+)
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# meta name/property -> metadata key; earlier names win for the same key
+_META_FIELDS = {
+    "description": "description",
+    "og:description": "description",
+    "twitter:description": "description",
+    "og:title": "og_title",
+    "twitter:title": "og_title",
+    "og:image": "image",
+    "og:image:url": "image",
+    "og:image:secure_url": "image",
+    "twitter:image": "image",
+    "twitter:image:src": "image",
+    "og:site_name": "site_name",
+    "og:type": "type",
+    "twitter:card": "twitter_card",
+    "twitter:site": "twitter_site",
+    "author": "author",
+    "article:author": "author",
+}
+_META_PRIORITY = {name: i for i, name in enumerate(_META_FIELDS)}
+
+
+def _valid_encoding(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().strip("\"'")).name
+    except LookupError:
+        return None
+
+
+def detect_charset(content_type: str, head: bytes) -> Optional[str]:
+    """Pick a document encoding from the BOM, HTTP header or <meta> tag"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+
+    if "charset=" in content_type:
+        encoding = _valid_encoding(content_type.split("charset=")[-1].split(";")[0])
+        if encoding:
+            return encoding
+
+    match = _META_CHARSET.search(head[:SNIFF_BYTES])
+    if match:
+        return _valid_encoding(match.group(1).decode("ascii", errors="ignore"))
+
+    return None
+
+
+class HeadMetadataExtractor:
+    """Incremental metadata extractor that stops at the end of <head>.
+
+    Feed it response chunks as they arrive; ``feed`` returns True once the
+    head has been fully seen (``</head>`` or the first body tag) so the
+    caller can stop downloading. Only the head elements are ever built.
+    """
+
+    def __init__(self, content_type: str = ""):
+        self.content_type = content_type
+        self.done = False
+        self._buffer = b""
+        self._parser: Optional[etree.HTMLPullParser] = None
+        self._fields: Dict[str, str] = {}
+        self._priority: Dict[str, int] = {}
+        self._title = ""
+
+    def feed(self, chunk: bytes) -> bool:
+        if self.done:
+            return True
+
+        if self._parser is None:
+            # Hold back data until there is enough to sniff the charset
+            self._buffer += chunk
+            if len(self._buffer) < SNIFF_BYTES:
+                return False
+            chunk, self._buffer = self._buffer, b""
+            self._start_parser(chunk)
+
+        try:
+            self._parser.feed(chunk)
+        except etree.LxmlError:
+            self.done = True
+            return True
+
+        self._consume_events()
+        return self.done
+
+    def _start_parser(self, head: bytes):
+        self._parser = etree.HTMLPullParser(
+            events=("start", "end"),
+            encoding=detect_charset(self.content_type, head),
+            no_network=True,
+        )
+
+    def _consume_events(self):
+        for event, element in self._parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ""
+            tag = tag.lower()
+
+            if event == "start" and tag == "body":
+                self.done = True
+            elif event == "end" and tag == "head":
+                self.done = True
+            elif event == "end" and tag == "title" and not self._title:
+                self._title = " ".join((element.text or "").split())
+            elif event == "start" and tag == "meta":
+                self._read_meta(element)
+            elif event == "start" and tag == "link":
+                rel = (element.get("rel") or "").lower().split()
+                if "canonical" in rel and element.get("href"):
+                    self._fields.setdefault("canonical_url", element.get("href"))
+
+            if self.done:
+                break
+
+    def _read_meta(self, element):
+        name = (element.get("property") or element.get("name") or "").lower()
+        key = _META_FIELDS.get(name)
+        content = (element.get("content") or "").strip()
+        if not key or not content:
+            return
+        priority = _META_PRIORITY[name]
+        if priority < self._priority.get(key, len(_META_PRIORITY)):
+            self._fields[key] = content
+            self._priority[key] = priority
+
+    def close(self) -> dict:
+        """Finish parsing and return the extracted metadata"""
+        if self._parser is None and self._buffer:
+            self._start_parser(self._buffer)
+            try:
+                self._parser.feed(self._buffer)
+            except etree.LxmlError:
+                pass
+            self._buffer = b""
+        if self._parser is not None and not self.done:
+            try:
+                self._parser.close()
+            except etree.LxmlError:
+                pass
+            self._consume_events()
+
+        fields = dict(self._fields)
+        title = self._title or fields.pop("og_title", "")
+        fields.pop("og_title", None)
+
+        metadata = {
+            "title": title[:500],
+            "description": fields.pop("description", "")[:1000],
+            "image": fields.pop("image", ""),
+        }
+        metadata.update(fields)
+        return metadata
+
+
+def extract_head_metadata(html: bytes, content_type: str = "") -> dict:
+    """Extract metadata from an already-downloaded document"""
+    extractor = HeadMetadataExtractor(content_type)
+    extractor.feed(html)
+    return extractor.close()
@@ -0,0 +1,301 @@
+import codecs
+import json
+import uuid
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from typing import AsyncIterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.cache import bump_generation
+from app.core.config import settings
+from app.models.entry import Entry, EntryTag
+from app.schemas.entry import (
+    ContentType,
+    EnrichmentStatus,
+    EntryImportError,
+    EntryImportResponse,
+    EntryImportRow,
+)
+from app.services.enrichment import enqueue_enrichment_many, enqueue_text_indexing
+from app.services.stats_service import count_entries_created
+from app.services.tag_service import get_or_create_tags
+from app.services.url_utils import canonicalize_url, url_hash
+
+# (line number, parsed row or error message)
+RawRow = Tuple[int, Union[dict, str]]
+
+MAX_REPORTED_ERRORS = 1000
+
+
+def guess_content_type(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    path = [p for p in urlsplit(url).path.split("/") if p]
+    if host in ("github.com", "www.github.com") and len(path) >= 2:
+        return ContentType.REPO.value
+    return ContentType.LINK.value
+
+
+async def iter_ndjson_rows(stream: AsyncIterator[bytes]) -> AsyncIterator[RawRow]:
+    """Parse an NDJSON body incrementally, one object per line"""
+    buffer = b""
+    line_no = 0
+
+    def parse(line: bytes) -> RawRow:
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            return line_no, f"Invalid JSON: {e}"
+        if not isinstance(row, dict):
+            return line_no, "Expected a JSON object"
+        return line_no, row
+
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield parse(line)
+
+    if buffer.strip():
+        line_no += 1
+        yield parse(buffer)
+
+
+class _BookmarkParser(HTMLParser):
+    """Collects <A HREF> links from a Netscape bookmarks file as it is fed.
+
+    The format leaves <DT> unclosed, which tree-building parsers treat as
+    ever-deeper nesting, so this works on the token stream instead.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: List[dict] = []
+        self._link: Optional[dict] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._link = dict(attrs)
+            self._text = []
+
+    def handle_data(self, data):
+        if self._link is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag != "a" or self._link is None:
+            return
+        link, self._link = self._link, None
+
+        href = link.get("href") or ""
+        if not href.startswith(("http://", "https://")):
+            return
+
+        title = " ".join("".join(self._text).split()) or href
+        row = {
+            "title": title[:500],
+            "content_type": guess_content_type(href),
+            "url": href,
+            "tags": [
+                name
+                for tag in (link.get("tags") or "").split(",")
+                if (name := tag.strip())
+            ],
+        }
+        add_date = link.get("add_date") or ""
+        if add_date.isdigit():
+            row["created_at"] = datetime.fromtimestamp(
+                int(add_date), tz=timezone.utc
+            ).isoformat()
+        self.rows.append(row)
+
+
+async def iter_bookmark_rows(stream: AsyncIterator[bytes]) -> AsyncIterator[RawRow]:
+    """Parse a Netscape bookmarks export (browsers, Pocket, Raindrop)"""
+    parser = _BookmarkParser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    count = 0
+
+    async for chunk in stream:
+        parser.feed(decoder.decode(chunk))
+        for row in parser.rows:
+            count += 1
+            yield count, row
+        parser.rows = []
+
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    for row in parser.rows:
+        count += 1
+        yield count, row
+
+
+def _write_batch(
+    db: Session, user_id: uuid.UUID, batch: List[Tuple[int, EntryImportRow]]
+) -> Tuple[List[dict], int]:
+    """Insert one validated batch of entries and their tags in one transaction.
+
+    Links already in the vault, or repeated within the batch, are skipped.
+    Returns (inserted entries, number of duplicates skipped).
+    """
+    entries = []
+    entry_tags = []
+    duplicates = 0
+    tag_names = sorted({name for _, row in batch for name in row.tags})
+    tag_ids = get_or_create_tags(db, user_id, tag_names)
+
+    hashes = {str(row.url): url_hash(str(row.url)) for _, row in batch if row.url}
+    seen = {
+        hashed
+        for (hashed,) in db.execute(
+            select(Entry.url_hash).where(
+                Entry.user_id == user_id, Entry.url_hash.in_(set(hashes.values()))
+            )
+        )
+    }
+
+    for _, row in batch:
+        url = str(row.url) if row.url else None
+        if url:
+            if hashes[url] in seen:
+                duplicates += 1
+                continue
+            seen.add(hashes[url])
+        needs_enrichment = bool(url) and row.content_type in (
+            ContentType.LINK,
+            ContentType.REPO,
+        )
+        entry = {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "title": row.title,
+            "content_type": row.content_type.value,
+            "url": url,
+            "canonical_url": canonicalize_url(url) if url else None,
+            "url_hash": hashes[url] if url else None,
+            "content": row.content,
+            "entry_metadata": row.metadata or {},
+            "summary_status": "pending",
+            "enrichment_status": (
+                EnrichmentStatus.PENDING.value
+                if needs_enrichment
+                else EnrichmentStatus.SKIPPED.value
+            ),
+        }
+        if row.created_at:
+            entry["created_at"] = row.created_at
+        entries.append(entry)
+        entry_tags.extend(
+            {"entry_id": entry["id"], "tag_id": tag_ids[name]} for name in set(row.tags)
+        )
+
+    if not entries:
+        return entries, duplicates
+
+    # ORM bulk insert, sent as multi-row INSERTs via insertmanyvalues
+    db.execute(insert(Entry), entries)
+    count_entries_created(
+        db,
+        user_id,
+        [e["content_type"] for e in entries],
+        [e.get("created_at") for e in entries],
+    )
+    if entry_tags:
+        db.execute(pg_insert(EntryTag).values(entry_tags).on_conflict_do_nothing())
+
+    return entries, duplicates
+
+
+def _commit_batch(
+    db: Session, user_id: uuid.UUID, batch: List[Tuple[int, EntryImportRow]]
+) -> Tuple[List[dict], int]:
+    """Write and commit one batch, rolling back and re-raising on failure"""
+    try:
+        entries, duplicates = _write_batch(db, user_id, batch)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if entries:
+        bump_generation(user_id)
+    return entries, duplicates
+
+
+async def import_entries(
+    db: Session,
+    user_id: uuid.UUID,
+    rows: AsyncIterator[RawRow],
+    summarize: bool = False,
+) -> EntryImportResponse:
+    """Validate and bulk-insert streamed rows in batched transactions.
+
+    Each batch is written with multi-row INSERTs in its own transaction, so
+    a bad batch only fails its own rows. Enrichment (and optionally AI
+    summaries) is queued for the background workers after each commit.
+    """
+    result = EntryImportResponse(imported=0, failed=0)
+
+    def fail(line: int, error: str):
+        result.failed += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(EntryImportError(line=line, error=error))
+
+    async def flush(batch: List[Tuple[int, EntryImportRow]]):
+        try:
+            # The sync Session's inserts and commit stay off the event loop
+            entries, duplicates = await run_in_threadpool(
+                _commit_batch, db, user_id, batch
+            )
+        except Exception as e:
+            logger.error(f"Import batch failed for user {user_id}: {e}")
+            for line, _ in batch:
+                fail(line, "Database error while importing batch")
+            return
+
+        result.imported += len(entries)
+        result.duplicates += duplicates
+        if not entries:
+            return
+        await enqueue_enrichment_many(
+            [
+                e["id"]
+                for e in entries
+                if e["enrichment_status"] == EnrichmentStatus.PENDING.value
+            ]
+        )
+        if summarize:
+            await enqueue_enrichment_many([e["id"] for e in entries], kind="summary")
+        await enqueue_text_indexing([e["id"] for e in entries])
+
+    batch: List[Tuple[int, EntryImportRow]] = []
+    async for line, raw in rows:
+        if isinstance(raw, str):
+            fail(line, raw)
+            continue
+        try:
+            batch.append((line, EntryImportRow.model_validate(raw)))
+        except ValidationError as e:
+            fail(
+                line,
+                "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                    for err in e.errors()
+                ),
+            )
+            continue
+
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            await flush(batch)
+            batch = []
+
+    if batch:
+        await flush(batch)
+
+    return result
@@ -0,0 +1,270 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional, Set
+from urllib.parse import urlsplit
+import redis
+from loguru import logger
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.http import HostUnavailable, RetryAfter
+from app.core.redis import redis_client
+from app.models.url_metadata import UrlMetadata
+from app.services.url_utils import canonicalize_url
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a (possibly conditional) metadata fetch"""
+
+    metadata: Optional[dict] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+@dataclass
+class CacheRecord:
+    canonical_url: str
+    metadata: dict = field(default_factory=dict)
+    ok: bool = True
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+# loader(url, etag, last_modified) -> LoadResult
+Loader = Callable[[str, Optional[str], Optional[str]], Awaitable[LoadResult]]
+
+_revalidating: Set[str] = set()
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _cache_key(kind: str, canonical_url: str) -> str:
+    return hashlib.sha256(f"{kind}:{canonical_url}".encode("utf-8")).hexdigest()
+
+
+def _redis_key(cache_key: str) -> str:
+    return f"urlmeta:{cache_key}"
+
+
+def _host_key(url: str) -> str:
+    return f"urlmeta:host-down:{(urlsplit(url).hostname or '').lower()}"
+
+
+def _read_record(cache_key: str) -> Optional[CacheRecord]:
+    """Read from Redis, falling back to Postgres when Redis misses or is down"""
+    try:
+        raw = redis_client.get(_redis_key(cache_key))
+        if raw:
+            return CacheRecord(**json.loads(raw))
+    except redis.RedisError as e:
+        logger.warning(f"Metadata cache Redis read failed: {e}")
+
+    db = SessionLocal()
+    try:
+        row = db.query(UrlMetadata).filter(UrlMetadata.cache_key == cache_key).first()
+        if not row:
+            return None
+        record = CacheRecord(
+            canonical_url=row.canonical_url,
+            metadata=row.url_metadata or {},
+            ok=row.ok,
+            etag=row.etag,
+            last_modified=row.last_modified,
+            fetched_at=row.fetched_at.timestamp() if row.fetched_at else 0.0,
+        )
+    finally:
+        db.close()
+
+    _write_redis(cache_key, record)
+    return record
+
+
+def _write_redis(cache_key: str, record: CacheRecord):
+    ttl = (
+        settings.METADATA_CACHE_TTL_SECONDS + settings.METADATA_CACHE_STALE_SECONDS
+        if record.ok
+        else settings.METADATA_CACHE_NEGATIVE_TTL_SECONDS
+    )
+    try:
+        redis_client.setex(_redis_key(cache_key), ttl, json.dumps(record.__dict__))
+    except redis.RedisError as e:
+        logger.warning(f"Metadata cache Redis write failed: {e}")
+
+
+def _write_record(kind: str, cache_key: str, record: CacheRecord):
+    _write_redis(cache_key, record)
+
+    db = SessionLocal()
+    try:
+        row = db.query(UrlMetadata).filter(UrlMetadata.cache_key == cache_key).first()
+        if row is None:
+            row = UrlMetadata(cache_key=cache_key, kind=kind)
+            db.add(row)
+        row.canonical_url = record.canonical_url
+        row.url_metadata = record.metadata
+        row.ok = record.ok
+        row.etag = record.etag
+        row.last_modified = record.last_modified
+        row.fetched_at = datetime.fromtimestamp(record.fetched_at, tz=timezone.utc)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Metadata cache Postgres write failed: {e}")
+    finally:
+        db.close()
+
+
+def _host_is_down(url: str) -> bool:
+    try:
+        return bool(redis_client.exists(_host_key(url)))
+    except redis.RedisError:
+        return False
+
+
+def _mark_host_down(url: str):
+    try:
+        redis_client.setex(
+            _host_key(url), settings.METADATA_CACHE_NEGATIVE_TTL_SECONDS, "1"
+        )
+    except redis.RedisError:
+        pass
+
+
+async def _revalidate(
+    kind: str,
+    cache_key: str,
+    url: str,
+    canonical_url: str,
+    loader: Loader,
+    record: Optional[CacheRecord],
+) -> CacheRecord:
+    """Fetch the URL as saved; the canonical form is only the cache identity"""
+    etag = record.etag if record and record.ok else None
+    last_modified = record.last_modified if record and record.ok else None
+
+    try:
+        result = await loader(url, etag, last_modified)
+    except RetryAfter:
+        # Back-pressure from the host, not a verdict on the URL
+        if record and record.ok:
+            return record
+        raise
+    except Exception as e:
+        logger.warning(f"Metadata fetch failed for {url}: {e}")
+        if isinstance(e, HostUnavailable):
+            await run_in_threadpool(_mark_host_down, url)
+        if record and record.ok:
+            # Keep serving the stale copy rather than poisoning it
+            return record
+        negative = CacheRecord(
+            canonical_url=canonical_url, ok=False, fetched_at=time.time()
+        )
+        await run_in_threadpool(_write_record, kind, cache_key, negative)
+        return negative
+
+    if result.not_modified and record:
+        record.fetched_at = time.time()
+        record.etag = result.etag or record.etag
+        record.last_modified = result.last_modified or record.last_modified
+    else:
+        record = CacheRecord(
+            canonical_url=canonical_url,
+            metadata=result.metadata or {},
+            etag=result.etag,
+            last_modified=result.last_modified,
+            fetched_at=time.time(),
+        )
+
+    await run_in_threadpool(_write_record, kind, cache_key, record)
+    return record
+
+
+async def _revalidate_in_background(
+    kind: str,
+    cache_key: str,
+    url: str,
+    canonical_url: str,
+    loader: Loader,
+    record: CacheRecord,
+):
+    try:
+        await _revalidate(kind, cache_key, url, canonical_url, loader, record)
+    finally:
+        _revalidating.discard(cache_key)
+
+
+def _take_revalidation_lock(cache_key: str) -> bool:
+    try:
+        return bool(
+            redis_client.set(
+                f"urlmeta:lock:{cache_key}",
+                "1",
+                nx=True,
+                ex=int(settings.OUTBOUND_DEADLINE_SECONDS) + 5,
+            )
+        )
+    except redis.RedisError:
+        return True
+
+
+async def _claim_revalidation(cache_key: str) -> bool:
+    """Make sure only one worker in the deployment refreshes a stale entry"""
+    if cache_key in _revalidating:
+        return False
+    # Reserved locally before the Redis round-trip so concurrent requests in
+    # this worker don't race for the lock
+    _revalidating.add(cache_key)
+    claimed = await run_in_threadpool(_take_revalidation_lock, cache_key)
+    if not claimed:
+        _revalidating.discard(cache_key)
+    return claimed
+
+
+async def get_cached_metadata(kind: str, url: str, loader: Loader) -> Optional[Dict]:
+    """Return metadata for a URL, fetching at most once per TTL per deployment.
+
+    Fresh entries are served as-is. Stale entries are served immediately while
+    a single background task revalidates them with a conditional request.
+    Failures are cached briefly as negative entries so a broken host is not
+    hammered by every save. Redis and Postgres are read in the threadpool.
+
+    Returns None when the URL could not be fetched, and a possibly empty dict
+    when it was (e.g. a PDF has no metadata to extract).
+    """
+    canonical_url = canonicalize_url(url)
+    cache_key = _cache_key(kind, canonical_url)
+    record = await run_in_threadpool(_read_record, cache_key)
+
+    if record is not None:
+        age = record.age()
+        if not record.ok and age < settings.METADATA_CACHE_NEGATIVE_TTL_SECONDS:
+            return None
+        if record.ok and age < settings.METADATA_CACHE_TTL_SECONDS:
+            return record.metadata
+        if record.ok and age < (
+            settings.METADATA_CACHE_TTL_SECONDS + settings.METADATA_CACHE_STALE_SECONDS
+        ):
+            if await _claim_revalidation(cache_key):
+                task = asyncio.create_task(
+                    _revalidate_in_background(
+                        kind, cache_key, url, canonical_url, loader, record
+                    )
+                )
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+            return record.metadata
+
+    if await run_in_threadpool(_host_is_down, url):
+        return None
+
+    record = await _revalidate(kind, cache_key, url, canonical_url, loader, record)
+    return record.metadata if record.ok else None
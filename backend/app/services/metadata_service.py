@@ -0,0 +1,83 @@
+from typing import Dict, Optional
+import httpx
+from loguru import logger
+from app.core.config import settings
+from app.core.http import RetryAfter, outbound_client
+from app.services.github_client import github_client, parse_repo_url
+from app.services.html_metadata import HeadMetadataExtractor
+from app.services.metadata_cache import LoadResult, get_cached_metadata
+
+
+def _conditional_headers(
+    etag: Optional[str], last_modified: Optional[str]
+) -> Dict[str, str]:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+async def load_url_metadata(
+    url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> LoadResult:
+    """Fetch a page's <head> and extract its metadata, revalidating if cached"""
+    extractor: Optional[HeadMetadataExtractor] = None
+
+    def consume(headers: httpx.Headers, chunk: bytes) -> bool:
+        nonlocal extractor
+        if extractor is None:
+            content_type = headers.get("content-type", "")
+            if content_type and "html" not in content_type.lower():
+                # Nothing to extract from PDFs, images and the like
+                return True
+            extractor = HeadMetadataExtractor(content_type)
+        return extractor.feed(chunk)
+
+    response = await outbound_client.fetch(
+        url,
+        headers=_conditional_headers(etag, last_modified),
+        max_bytes=settings.HTML_HEAD_MAX_BYTES,
+        consumer=consume,
+    )
+    if response.status_code == 304:
+        return LoadResult(not_modified=True)
+    response.raise_for_status()
+
+    metadata = extractor.close() if extractor else {}
+    return LoadResult(
+        metadata=metadata,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+    )
+
+
+async def load_github_repo_metadata(
+    repo_url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> LoadResult:
+    """Fetch repository details from the GitHub API"""
+    owner, repo = parse_repo_url(repo_url)
+    return await github_client.get_repo(owner, repo, etag=etag)
+
+
+async def fetch_url_metadata(url: str) -> Optional[dict]:
+    """Fetch metadata from a URL; None if it could not be fetched"""
+    try:
+        return await get_cached_metadata("link", url, load_url_metadata)
+    except RetryAfter:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching metadata for {url}: {e}")
+        return None
+
+
+async def fetch_github_repo_metadata(repo_url: str) -> Optional[dict]:
+    """Fetch metadata from GitHub repository; None if it could not be fetched"""
+    try:
+        return await get_cached_metadata("repo", repo_url, load_github_repo_metadata)
+    except RetryAfter:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching GitHub metadata: {e}")
+        return None
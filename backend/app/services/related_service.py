@@ -0,0 +1,214 @@
+import hashlib
+import re
+from typing import Dict, List, Optional
+from uuid import UUID
+import numpy as np
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models.entry import Entry
+from app.models.related import EntryLshBucket, EntrySignature, RelatedEntry
+from app.services.ai_service import entry_embedding_text
+
+# 32 bands of 4 rows: entries with Jaccard around 0.4 or more almost always
+# share a bucket, while unrelated ones rarely do
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+
+RELATED_LIMIT = 10
+RELATED_MIN_SIMILARITY = 0.1
+RELATED_MAX_CANDIDATES = 500
+SIGNATURE_MAX_CHARS = 20000
+
+# Largest prime below 2**32, so (a * x + b) never overflows uint64
+_PRIME = np.uint64(4294967291)
+# Fixed seed: signatures must stay comparable across workers and restarts
+_rng = np.random.default_rng(20261017)
+_A = _rng.integers(1, int(_PRIME), size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+_WORD_RE = re.compile(r"\w{3,}")
+
+
+def shingles(text: str) -> np.ndarray:
+    """Hashed set of the distinct words in a text, ignoring very short ones"""
+    words = set(_WORD_RE.findall(text[:SIGNATURE_MAX_CHARS].lower()))
+    return np.fromiter(
+        (
+            int.from_bytes(
+                hashlib.blake2b(w.encode(), digest_size=4).digest(), "little"
+            )
+            for w in words
+        ),
+        dtype=np.uint64,
+        count=len(words),
+    )
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of a text, or None if it has no usable words"""
+    hashes = shingles(text) % _PRIME
+    if not len(hashes):
+        return None
+    permuted = (hashes[:, None] * _A + _B) % _PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def lsh_buckets(signature: np.ndarray) -> List[int]:
+    """One bucket key per band, as a signed 64-bit integer"""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(band.tobytes(), digest_size=8).digest(),
+            "little",
+            signed=True,
+        )
+        for band in signature.reshape(LSH_BANDS, LSH_ROWS)
+    ]
+
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Fraction of agreeing signature slots, an unbiased Jaccard estimate"""
+    return float(np.mean(a == b))
+
+
+def _unpack(signature: bytes) -> np.ndarray:
+    return np.frombuffer(signature, dtype=np.uint32)
+
+
+def update_related_entries(db: Session, entry_id: UUID):
+    """Re-sign an entry and refresh its neighbours, in both directions.
+
+    Only entries sharing an LSH bucket, or already listing this entry as a
+    neighbour, are compared, so the cost depends on the number of near
+    matches rather than on the size of the vault.
+    """
+    entry = db.query(Entry).filter(Entry.id == entry_id).first()
+    if not entry:
+        return
+
+    db.execute(delete(EntryLshBucket).where(EntryLshBucket.entry_id == entry_id))
+    db.execute(delete(RelatedEntry).where(RelatedEntry.entry_id == entry_id))
+
+    signature = minhash_signature(entry_embedding_text(entry))
+    if signature is None:
+        # Nothing left to compare, so it can't be anyone's neighbour either
+        db.execute(delete(RelatedEntry).where(RelatedEntry.related_id == entry_id))
+        db.execute(delete(EntrySignature).where(EntrySignature.entry_id == entry_id))
+        db.commit()
+        return
+
+    db.execute(
+        pg_insert(EntrySignature)
+        .values(entry_id=entry_id, user_id=entry.user_id, signature=signature.tobytes())
+        .on_conflict_do_update(
+            index_elements=["entry_id"],
+            set_={"signature": signature.tobytes(), "updated_at": func.now()},
+        )
+    )
+    buckets = [(band, bucket) for band, bucket in enumerate(lsh_buckets(signature))]
+    db.execute(
+        pg_insert(EntryLshBucket).values(
+            [
+                {
+                    "user_id": entry.user_id,
+                    "band": band,
+                    "bucket": bucket,
+                    "entry_id": entry_id,
+                }
+                for band, bucket in buckets
+            ]
+        )
+    )
+
+    candidates = (
+        select(EntryLshBucket.entry_id)
+        .where(
+            EntryLshBucket.user_id == entry.user_id,
+            tuple_(EntryLshBucket.band, EntryLshBucket.bucket).in_(buckets),
+            EntryLshBucket.entry_id != entry_id,
+        )
+        .distinct()
+        .limit(RELATED_MAX_CANDIDATES)
+    )
+    # Entries that list this one keep it only if they are still similar
+    referrers = {
+        referrer_id
+        for (referrer_id,) in db.execute(
+            select(RelatedEntry.entry_id).where(RelatedEntry.related_id == entry_id)
+        )
+    }
+    scores: Dict[UUID, float] = {}
+    for candidate_id, candidate_signature in db.execute(
+        select(EntrySignature.entry_id, EntrySignature.signature).where(
+            EntrySignature.entry_id.in_(candidates)
+            | EntrySignature.entry_id.in_(list(referrers))
+        )
+    ):
+        score = estimated_similarity(signature, _unpack(candidate_signature))
+        if score >= RELATED_MIN_SIMILARITY:
+            scores[candidate_id] = score
+
+    dropped = referrers - scores.keys()
+    if dropped:
+        db.execute(
+            delete(RelatedEntry).where(
+                RelatedEntry.entry_id.in_(list(dropped)),
+                RelatedEntry.related_id == entry_id,
+            )
+        )
+
+    neighbours = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    neighbours = neighbours[:RELATED_LIMIT]
+    rows = [
+        {"entry_id": entry_id, "related_id": neighbour_id, "score": score}
+        for neighbour_id, score in neighbours
+    ]
+    # Reverse edges: new neighbours gain this entry, existing referrers are
+    # re-scored; _trim_neighbours then keeps each list at RELATED_LIMIT
+    reverse = dict(neighbours)
+    reverse.update(
+        (referrer_id, scores[referrer_id]) for referrer_id in referrers & scores.keys()
+    )
+    rows.extend(
+        {"entry_id": neighbour_id, "related_id": entry_id, "score": score}
+        for neighbour_id, score in reverse.items()
+    )
+    if rows:
+        statement = pg_insert(RelatedEntry).values(rows)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["entry_id", "related_id"],
+                set_={"score": statement.excluded.score},
+            )
+        )
+        _trim_neighbours(db, list(reverse))
+
+    db.commit()
+
+
+def _trim_neighbours(db: Session, entry_ids: List[UUID]):
+    """Keep only the best RELATED_LIMIT neighbours of each entry"""
+    ranked = (
+        select(
+            RelatedEntry.entry_id,
+            RelatedEntry.related_id,
+            func.row_number()
+            .over(
+                partition_by=RelatedEntry.entry_id,
+                order_by=RelatedEntry.score.desc(),
+            )
+            .label("position"),
+        )
+        .where(RelatedEntry.entry_id.in_(entry_ids))
+        .subquery()
+    )
+    db.execute(
+        delete(RelatedEntry).where(
+            tuple_(RelatedEntry.entry_id, RelatedEntry.related_id).in_(
+                select(ranked.c.entry_id, ranked.c.related_id).where(
+                    ranked.c.position > RELATED_LIMIT
+                )
+            )
+        )
+    )
@@ -0,0 +1,432 @@
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import (
+    Date,
+    String,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models.entry import Entry, EntryTag, Tag
+from app.models.stats import UserActivity, UserStat
+from app.schemas.analytics import ActivityMetric, Granularity
+from app.schemas.entry import SummaryStatus
+
+CONTENT_TYPE = "content_type"
+SUMMARY_STATUS = "summary_status"
+OVERVIEW_TOP_TAGS = 10
+OVERVIEW_RECENT_ENTRIES = 5
+MAX_TIMESERIES_DAYS = 5 * 366
+
+
+def adjust_stats(db: Session, user_id: UUID, stat: str, deltas: Dict[str, int]):
+    """Add deltas to a user's counters inside the caller's transaction"""
+    rows = [
+        {"user_id": user_id, "stat": stat, "key": key, "value": delta}
+        for key, delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    statement = pg_insert(UserStat).values(rows)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["user_id", "stat", "key"],
+            set_={"value": UserStat.value + statement.excluded.value},
+        )
+    )
+
+
+def record_activity(
+    db: Session,
+    user_id: UUID,
+    metric: ActivityMetric,
+    counts: Dict[Tuple[date, str], int],
+):
+    """Add (day, key) counts to a user's daily buckets in the caller's transaction"""
+    rows = [
+        {"user_id": user_id, "metric": metric.value, "day": day, "key": key, "value": n}
+        for (day, key), n in counts.items()
+        if n
+    ]
+    if not rows:
+        return
+    statement = pg_insert(UserActivity).values(rows)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["user_id", "metric", "day", "key"],
+            set_={"value": UserActivity.value + statement.excluded.value},
+        )
+    )
+
+
+def _utc_day(moment: Optional[datetime] = None) -> date:
+    if moment is None:
+        return datetime.now(timezone.utc).date()
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date()
+
+
+def _summary_key(status: Optional[str]) -> str:
+    return status or SummaryStatus.PENDING.value
+
+
+def count_entries_created(
+    db: Session,
+    user_id: UUID,
+    content_types: Iterable[str],
+    created_at: Optional[Iterable[Optional[datetime]]] = None,
+):
+    """Record new entries of the given types (one item per entry).
+
+    New entries always start out with a pending summary. They are bucketed
+    by their created_at, when given, or else by today.
+    """
+    content_types = list(content_types)
+    days = [_utc_day(moment) for moment in created_at or [None] * len(content_types)]
+    types = Counter(content_types)
+    adjust_stats(db, user_id, CONTENT_TYPE, types)
+    adjust_stats(
+        db, user_id, SUMMARY_STATUS, {SummaryStatus.PENDING.value: sum(types.values())}
+    )
+    record_activity(
+        db, user_id, ActivityMetric.ENTRIES_SAVED, Counter(zip(days, content_types))
+    )
+
+
+def count_entries_deleted(db: Session, user_id: UUID, entries: Iterable[Entry]):
+    """Record removed entries, by type and summary status"""
+    entries = list(entries)
+    types = Counter(entry.content_type for entry in entries)
+    statuses = Counter(_summary_key(entry.summary_status) for entry in entries)
+    adjust_stats(db, user_id, CONTENT_TYPE, {k: -n for k, n in types.items()})
+    adjust_stats(db, user_id, SUMMARY_STATUS, {k: -n for k, n in statuses.items()})
+
+
+def count_summary_change(
+    db: Session, user_id: UUID, old: Optional[str], new: Optional[str]
+):
+    """Move one entry between summary-status counters"""
+    old, new = _summary_key(old), _summary_key(new)
+    if old != new:
+        adjust_stats(db, user_id, SUMMARY_STATUS, {old: -1, new: 1})
+        if new == SummaryStatus.COMPLETED.value:
+            record_activity(
+                db, user_id, ActivityMetric.SUMMARIES_COMPLETED, {(_utc_day(), ""): 1}
+            )
+
+
+def get_stats(db: Session, user_id: UUID, stat: str) -> Dict[str, int]:
+    """All of a user's counters for one stat, keyed by counter key"""
+    rows = db.execute(
+        select(UserStat.key, UserStat.value).where(
+            UserStat.user_id == user_id, UserStat.stat == stat
+        )
+    )
+    return {key: value for key, value in rows}
+
+
+def get_entry_total(
+    db: Session, user_id: UUID, content_type: Optional[str] = None
+) -> int:
+    """Number of entries a user has, optionally of one type, without COUNT(*)"""
+    counts = get_stats(db, user_id, CONTENT_TYPE)
+    if content_type:
+        return counts.get(content_type, 0)
+    return sum(counts.values())
+
+
+def _actual_counts(user_id: Optional[UUID] = None):
+    """Counters recomputed from the entries table, as (user_id, stat, key, value)"""
+    status = func.coalesce(Entry.summary_status, SummaryStatus.PENDING.value)
+    by_type = select(
+        Entry.user_id, literal(CONTENT_TYPE), Entry.content_type, func.count(Entry.id)
+    ).group_by(Entry.user_id, Entry.content_type)
+    by_status = select(
+        Entry.user_id, literal(SUMMARY_STATUS), status, func.count(Entry.id)
+    ).group_by(Entry.user_id, status)
+    if user_id:
+        by_type = by_type.where(Entry.user_id == user_id)
+        by_status = by_status.where(Entry.user_id == user_id)
+    return union_all(by_type, by_status).subquery()
+
+
+def find_stat_drift(
+    db: Session, user_id: Optional[UUID] = None
+) -> List[Tuple[UUID, str, str, int, int]]:
+    """Counters that disagree with the entries table.
+
+    Returns (user_id, stat, key, stored, actual) for each mismatch.
+    """
+    actual = _actual_counts(user_id)
+    user_col, stat_col, key_col, value_col = actual.c
+    stored = select(UserStat).where(UserStat.stat.in_([CONTENT_TYPE, SUMMARY_STATUS]))
+    if user_id:
+        stored = stored.where(UserStat.user_id == user_id)
+    stored = stored.subquery()
+
+    joined = stored.join(
+        actual,
+        (stored.c.user_id == user_col)
+        & (stored.c.stat == stat_col)
+        & (stored.c.key == key_col),
+        full=True,
+    )
+    stored_value = func.coalesce(stored.c.value, 0)
+    actual_value = func.coalesce(value_col, 0)
+    rows = db.execute(
+        select(
+            func.coalesce(stored.c.user_id, user_col),
+            func.coalesce(stored.c.stat, stat_col),
+            func.coalesce(stored.c.key, key_col),
+            stored_value,
+            actual_value,
+        )
+        .select_from(joined)
+        .where(stored_value != actual_value)
+    )
+    return [tuple(row) for row in rows]
+
+
+def reconcile_entry_counts(db: Session, user_id: Optional[UUID] = None) -> int:
+    """Rebuild content-type and summary-status counters from the entries table.
+
+    Repairs any drift (e.g. from rows changed outside the API). Returns the
+    number of counters written.
+    """
+    stale = delete(UserStat).where(UserStat.stat.in_([CONTENT_TYPE, SUMMARY_STATUS]))
+    if user_id:
+        stale = stale.where(UserStat.user_id == user_id)
+
+    db.execute(stale)
+    result = db.execute(
+        insert(UserStat).from_select(
+            ["user_id", "stat", "key", "value"], select(_actual_counts(user_id))
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _json_agg(expression, *order_by):
+    return func.coalesce(
+        func.jsonb_agg(aggregate_order_by(expression, *order_by)),
+        literal_column("'[]'::jsonb"),
+        type_=JSONB,
+    )
+
+
+def get_overview(db: Session, user_id: UUID) -> Dict[str, Any]:
+    """Dashboard totals, top tags and recent entries in one round-trip.
+
+    Totals come from the maintained counters, tags from their usage counts
+    and recent entries from idx_entries_user_created_id, so the cost does not
+    grow with the size of the vault.
+    """
+    counters = select(
+        _json_agg(
+            func.jsonb_build_array(UserStat.stat, UserStat.key, UserStat.value),
+            UserStat.stat,
+            UserStat.key,
+        )
+    ).where(UserStat.user_id == user_id, UserStat.value != 0)
+
+    top = (
+        select(Tag.name, Tag.usage_count)
+        .where(Tag.user_id == user_id, Tag.usage_count > 0)
+        .order_by(Tag.usage_count.desc(), Tag.name)
+        .limit(OVERVIEW_TOP_TAGS)
+        .subquery()
+    )
+    top_tags = select(
+        _json_agg(
+            func.jsonb_build_object("name", top.c.name, "count", top.c.usage_count),
+            top.c.usage_count.desc(),
+            top.c.name,
+        )
+    )
+
+    recent = (
+        select(Entry.id, Entry.title, Entry.content_type, Entry.created_at)
+        .where(Entry.user_id == user_id)
+        .order_by(Entry.created_at.desc())
+        .limit(OVERVIEW_RECENT_ENTRIES)
+        .subquery()
+    )
+    recent_entries = select(
+        _json_agg(
+            func.jsonb_build_object(
+                "id",
+                recent.c.id,
+                "title",
+                recent.c.title,
+                "content_type",
+                recent.c.content_type,
+                "created_at",
+                recent.c.created_at,
+            ),
+            recent.c.created_at.desc(),
+        )
+    )
+
+    stats, tags, entries = db.execute(
+        select(
+            counters.scalar_subquery(),
+            top_tags.scalar_subquery(),
+            recent_entries.scalar_subquery(),
+        )
+    ).one()
+
+    rollup: Dict[str, Dict[str, int]] = {CONTENT_TYPE: {}, SUMMARY_STATUS: {}}
+    for stat, key, value in stats:
+        rollup.setdefault(stat, {})[key] = value
+    for entry in entries:
+        # Match the isoformat() rendering used elsewhere in the API
+        entry["created_at"] = datetime.fromisoformat(entry["created_at"]).isoformat()
+
+    return {
+        "total_entries": sum(rollup[CONTENT_TYPE].values()),
+        "entries_by_type": rollup[CONTENT_TYPE],
+        "entries_by_summary_status": rollup[SUMMARY_STATUS],
+        "top_tags": tags,
+        "recent_entries": entries,
+    }
+
+
+def rebuild_activity(db: Session, user_id: Optional[UUID] = None) -> int:
+    """Rebuild daily activity buckets from the source tables.
+
+    History is reconstructed from the rows that still exist: entries by
+    created_at, completed summaries by the entry's updated_at and tag
+    assignments by their entry's created_at. Returns the buckets written.
+    """
+
+    def utc_day(column):
+        return cast(func.timezone("UTC", column), Date)
+
+    saved = select(
+        Entry.user_id,
+        literal(ActivityMetric.ENTRIES_SAVED.value),
+        utc_day(Entry.created_at),
+        Entry.content_type,
+        func.count(),
+    ).group_by(Entry.user_id, utc_day(Entry.created_at), Entry.content_type)
+    summarized = (
+        select(
+            Entry.user_id,
+            literal(ActivityMetric.SUMMARIES_COMPLETED.value),
+            utc_day(Entry.updated_at),
+            literal(""),
+            func.count(),
+        )
+        .where(Entry.summary_status == SummaryStatus.COMPLETED.value)
+        .group_by(Entry.user_id, utc_day(Entry.updated_at))
+    )
+    tagged = (
+        select(
+            Entry.user_id,
+            literal(ActivityMetric.TAGS_APPLIED.value),
+            utc_day(Entry.created_at),
+            cast(EntryTag.tag_id, String),
+            func.count(),
+        )
+        .join(EntryTag, EntryTag.entry_id == Entry.id)
+        .group_by(Entry.user_id, utc_day(Entry.created_at), EntryTag.tag_id)
+    )
+
+    stale = delete(UserActivity)
+    if user_id:
+        stale = stale.where(UserActivity.user_id == user_id)
+        saved = saved.where(Entry.user_id == user_id)
+        summarized = summarized.where(Entry.user_id == user_id)
+        tagged = tagged.where(Entry.user_id == user_id)
+
+    db.execute(stale)
+    result = db.execute(
+        insert(UserActivity).from_select(
+            ["user_id", "metric", "day", "key", "value"],
+            union_all(saved, summarized, tagged),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def bucket_start(day: date, granularity: Granularity) -> date:
+    """First day of the bucket containing a day (weeks start on Monday)"""
+    if granularity == Granularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == Granularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(day: date, granularity: Granularity) -> date:
+    if granularity == Granularity.WEEK:
+        return day + timedelta(weeks=1)
+    if granularity == Granularity.MONTH:
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def timeseries_start(end: date, span: str) -> date:
+    """First day of a span such as '30d', '12w', '6m' or '1y' ending on a day.
+
+    Month and year spans cover whole calendar months, the current one included.
+    """
+    count, unit = int(span[:-1]), span[-1]
+    if unit == "d":
+        return end - timedelta(days=count - 1)
+    if unit == "w":
+        return end - timedelta(weeks=count) + timedelta(days=1)
+    months = count * 12 if unit == "y" else count
+    index = end.year * 12 + end.month - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_timeseries(
+    db: Session,
+    user_id: UUID,
+    metric: ActivityMetric,
+    granularity: Granularity,
+    start: date,
+    end: date,
+    key: Optional[str] = None,
+) -> List[Tuple[date, int]]:
+    """Per-bucket totals from start to end, with empty buckets as zero.
+
+    Weeks and months are rolled up from the daily buckets in the database.
+    The first bucket is widened to start on its boundary.
+    """
+    start = bucket_start(start, granularity)
+    bucket = cast(func.date_trunc(granularity.value, UserActivity.day), Date)
+    query = (
+        select(bucket, func.sum(UserActivity.value))
+        .where(
+            UserActivity.user_id == user_id,
+            UserActivity.metric == metric.value,
+            UserActivity.day.between(start, end),
+        )
+        .group_by(bucket)
+    )
+    if key is not None:
+        query = query.where(UserActivity.key == key)
+    totals = {day: int(value) for day, value in db.execute(query)}
+
+    points = []
+    day = start
+    while day <= end:
+        points.append((day, totals.get(day, 0)))
+        day = _next_bucket(day, granularity)
+    return points
@@ -0,0 +1,91 @@
+import uuid
+from typing import Dict, List, Optional
+from sqlalchemy import delete, func, literal, select, true, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models.entry import Tag, EntryTag
+
+
+def get_or_create_tags(
+    db: Session, user_id: uuid.UUID, names: List[str]
+) -> Dict[str, uuid.UUID]:
+    """Create any missing tags and return name -> id for all of them"""
+    if not names:
+        return {}
+    db.execute(
+        pg_insert(Tag)
+        .values([{"id": uuid.uuid4(), "user_id": user_id, "name": n} for n in names])
+        .on_conflict_do_nothing(index_elements=["user_id", "name"])
+    )
+    rows = db.execute(
+        select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(names))
+    )
+    return {name: tag_id for name, tag_id in rows}
+
+
+def _unnest(ids: List[uuid.UUID], name: str):
+    """unnest() of a bound uuid[] as a one-column table"""
+    return (
+        func.unnest(literal(ids, ARRAY(PG_UUID(as_uuid=True))))
+        .table_valued(name)
+        .render_derived(name=f"{name}s")
+    )
+
+
+def add_entry_tags(
+    db: Session, entry_ids: List[uuid.UUID], tag_ids: List[uuid.UUID]
+) -> int:
+    """Link every entry to every tag in one statement; returns new links.
+
+    The cross product is built by Postgres from two arrays, so the statement
+    carries len(entry_ids) + len(tag_ids) values rather than their product.
+    """
+    if not entry_ids or not tag_ids:
+        return 0
+    entries, tags = _unnest(entry_ids, "entry_id"), _unnest(tag_ids, "tag_id")
+    pairs = select(entries.c.entry_id, tags.c.tag_id).select_from(
+        entries.join(tags, true())  # CROSS JOIN
+    )
+    result = db.execute(
+        pg_insert(EntryTag)
+        .from_select(["entry_id", "tag_id"], pairs)
+        .on_conflict_do_nothing()
+    )
+    return result.rowcount
+
+
+def remove_entry_tags(
+    db: Session, entry_ids: List[uuid.UUID], tag_ids: List[uuid.UUID]
+) -> int:
+    """Unlink every entry from every tag in one statement; returns removed links"""
+    if not entry_ids or not tag_ids:
+        return 0
+    result = db.execute(
+        delete(EntryTag).where(
+            EntryTag.entry_id.in_(entry_ids), EntryTag.tag_id.in_(tag_ids)
+        )
+    )
+    return result.rowcount
+
+
+def reconcile_tag_counts(db: Session, user_id: Optional[uuid.UUID] = None) -> int:
+    """Recount tags.usage_count from entry_tags; returns the tags corrected"""
+    actual = func.coalesce(
+        select(func.count())
+        .where(EntryTag.tag_id == Tag.id)
+        .correlate(Tag)
+        .scalar_subquery(),
+        0,
+    )
+    statement = (
+        update(Tag)
+        .where(Tag.usage_count != actual)
+        .values(usage_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    if user_id:
+        statement = statement.where(Tag.user_id == user_id)
+    result = db.execute(statement)
+    db.commit()
+    return result.rowcount
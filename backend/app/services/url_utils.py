@@ -0,0 +1,72 @@
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Click-tracking parameters that never change what a page shows
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "ref_src",
+    "_hsenc",
+    "_hsmi",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+GITHUB_HOSTS = {"github.com", "www.github.com"}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _github_path(path: str) -> str:
+    """Repo owner and name are case-insensitive and may carry a .git suffix"""
+    segments = path.strip("/").split("/")
+    if len(segments) < 2:
+        return path
+    owner, repo = segments[0].lower(), segments[1].lower()
+    if repo.endswith(".git"):
+        repo = repo[: -len(".git")]
+    return "/" + "/".join([owner, repo] + segments[2:])
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings map to the same string"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        userinfo = parts.username
+        if parts.password:
+            userinfo = f"{userinfo}:{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    query = urlencode(sorted(p for p in params if not _is_tracking_param(p[0])))
+
+    if host in GITHUB_HOSTS:
+        netloc = netloc.replace(host, "github.com", 1)
+        path = _github_path(path)
+
+    # Fragments never reach the server
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def url_hash(url: str) -> str:
+    """SHA-256 hex digest of a URL's canonical form"""
+    return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
@@ -0,0 +1,255 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.cache import get_generation, get_version
+from app.core.config import settings
+from app.models.embedding import EntryEmbedding
+from app.models.entry import Entry
+from app.services.ai_service import EMBEDDING_VERSION, embedding_dim, embedding_model
+
+try:
+    import hnswlib
+except ImportError:  # optional; brute force serves typical vaults fine
+    hnswlib = None
+
+# Rows written by transactions that commit after a sync can carry an older
+# updated_at, so each sync re-reads a short window behind the last one
+SYNC_OVERLAP = timedelta(minutes=5)
+HYBRID_CANDIDATE_FACTOR = 4
+
+
+class VectorIndex:
+    """Nearest-neighbour index over one user's entry embeddings.
+
+    Vectors sit in a float32 matrix with one slot per entry, and slots of
+    deleted entries are recycled. A query is one matrix-vector product, or an
+    HNSW graph lookup once the vault outgrows SEMANTIC_ANN_THRESHOLD and
+    hnswlib is installed.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.ids: List[Optional[UUID]] = []
+        self.slots: Dict[UUID, int] = {}
+        self.free: List[int] = []
+        # (cache generation, embedding version) as of the last sync
+        self.version: Optional[Tuple[int, int]] = None
+        self.synced_at: Optional[datetime] = None
+        self.lock = threading.Lock()
+        self._ann = None
+        self._ann_deleted: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _grow(self) -> int:
+        slot = len(self.ids)
+        if slot == len(self.vectors):
+            capacity = max(64, 2 * slot)
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            vectors[:slot] = self.vectors
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:slot] = self.alive
+            self.vectors, self.alive = vectors, alive
+            if self._ann is not None:
+                self._ann.resize_index(capacity)
+        self.ids.append(None)
+        return slot
+
+    def upsert(self, ids: List[UUID], vectors: np.ndarray):
+        slots = []
+        for entry_id, vector in zip(ids, vectors):
+            slot = self.slots.get(entry_id)
+            if slot is None:
+                slot = self.free.pop() if self.free else self._grow()
+                self.slots[entry_id] = slot
+                self.ids[slot] = entry_id
+                self.alive[slot] = True
+            self.vectors[slot] = vector
+            slots.append(slot)
+
+        if self._ann is not None and slots:
+            for slot in self._ann_deleted.intersection(slots):
+                self._ann.unmark_deleted(slot)
+            self._ann_deleted.difference_update(slots)
+            self._ann.add_items(self.vectors[slots], slots)
+
+    def remove(self, ids: Iterable[UUID]):
+        for entry_id in ids:
+            slot = self.slots.pop(entry_id, None)
+            if slot is None:
+                continue
+            self.ids[slot] = None
+            self.alive[slot] = False
+            self.vectors[slot] = 0
+            self.free.append(slot)
+            if self._ann is not None:
+                self._ann.mark_deleted(slot)
+                self._ann_deleted.add(slot)
+
+    def _build_ann(self):
+        ann = hnswlib.Index(space="ip", dim=self.dim)
+        ann.init_index(max_elements=len(self.vectors), ef_construction=200, M=16)
+        ann.set_ef(100)
+        slots = np.flatnonzero(self.alive)
+        ann.add_items(self.vectors[slots], slots)
+        self._ann = ann
+        self._ann_deleted = set()
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[UUID, float]]:
+        """Top-k entries by cosine similarity (vectors are unit length)"""
+        k = min(k, len(self))
+        if k == 0:
+            return []
+
+        if (
+            self._ann is None
+            and hnswlib is not None
+            and len(self) >= settings.SEMANTIC_ANN_THRESHOLD
+        ):
+            self._build_ann()
+        if self._ann is not None:
+            labels, distances = self._ann.knn_query(query, k=k)
+            return [
+                (self.ids[slot], 1.0 - float(distance))
+                for slot, distance in zip(labels[0], distances[0])
+            ]
+
+        size = len(self.ids)
+        scores = self.vectors[:size] @ query
+        scores[~self.alive[:size]] = -np.inf
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[slot], float(scores[slot])) for slot in top]
+
+    def score(self, ids: Iterable[UUID], query: np.ndarray) -> Dict[UUID, float]:
+        """Cosine similarity of specific entries to the query"""
+        found = [
+            (entry_id, self.slots[entry_id])
+            for entry_id in ids
+            if entry_id in self.slots
+        ]
+        if not found:
+            return {}
+        scores = self.vectors[[slot for _, slot in found]] @ query
+        return {entry_id: float(s) for (entry_id, _), s in zip(found, scores)}
+
+
+_indexes: "OrderedDict[UUID, VectorIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _load_rows(index: VectorIndex, rows: list):
+    if not rows:
+        return
+    vectors = np.frombuffer(b"".join(row.vector for row in rows), dtype=np.float32)
+    index.upsert([row.entry_id for row in rows], vectors.reshape(-1, index.dim))
+    latest = max(row.updated_at for row in rows)
+    if index.synced_at is None or latest > index.synced_at:
+        index.synced_at = latest
+
+
+def _sync(db: Session, user_id: UUID, index: VectorIndex):
+    """Apply embeddings written or deleted since the index last synced"""
+    model = embedding_model()
+    base = db.query(
+        EntryEmbedding.entry_id, EntryEmbedding.vector, EntryEmbedding.updated_at
+    ).filter(EntryEmbedding.user_id == user_id, EntryEmbedding.model == model)
+
+    changed = base
+    if index.synced_at is not None:
+        changed = base.filter(
+            EntryEmbedding.updated_at > index.synced_at - SYNC_OVERLAP
+        )
+    _load_rows(index, changed.all())
+
+    # Deletes cascade rows away, which an updated_at scan can't see
+    count = (
+        db.query(func.count())
+        .select_from(EntryEmbedding)
+        .filter(EntryEmbedding.user_id == user_id, EntryEmbedding.model == model)
+        .scalar()
+    )
+    if count != len(index):
+        live = {
+            entry_id
+            for (entry_id,) in db.query(EntryEmbedding.entry_id).filter(
+                EntryEmbedding.user_id == user_id, EntryEmbedding.model == model
+            )
+        }
+        index.remove([entry_id for entry_id in index.slots if entry_id not in live])
+        missing = live.difference(index.slots)
+        if missing:
+            _load_rows(index, base.filter(EntryEmbedding.entry_id.in_(missing)).all())
+
+
+def get_user_index(db: Session, user_id: UUID) -> VectorIndex:
+    """The user's vector index, synced if their data changed since last use.
+
+    New embeddings move the user's embedding version; deleted entries move
+    the cache generation. Either one triggers an incremental sync.
+    """
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is None or index.dim != embedding_dim():
+            index = _indexes[user_id] = VectorIndex(embedding_dim())
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > settings.SEMANTIC_INDEX_MAX_USERS:
+            _indexes.popitem(last=False)
+
+    version = (get_generation(user_id), get_version(EMBEDDING_VERSION, user_id))
+    with index.lock:
+        if index.version != version:
+            _sync(db, user_id, index)
+            index.version = version
+    return index
+
+
+def semantic_search(
+    db: Session,
+    user_id: UUID,
+    q: str,
+    query_vector: np.ndarray,
+    limit: int,
+    hybrid: bool = False,
+) -> List[Tuple[UUID, float]]:
+    """Rank a user's entries by similarity to the query, best first.
+
+    Hybrid mode blends cosine similarity with full-text rank over the union
+    of both methods' top candidates.
+    """
+    index = get_user_index(db, user_id)
+    if not hybrid:
+        with index.lock:
+            return index.search(query_vector, limit)
+
+    pool = limit * HYBRID_CANDIDATE_FACTOR
+    with index.lock:
+        semantic = dict(index.search(query_vector, pool))
+
+    search_query = func.websearch_to_tsquery("english", q)
+    text_rank = func.ts_rank_cd(Entry.search_vector, search_query, 32)
+    text = dict(
+        db.query(Entry.id, text_rank)
+        .filter(Entry.user_id == user_id, Entry.search_vector.op("@@")(search_query))
+        .order_by(text_rank.desc())
+        .limit(pool)
+        .all()
+    )
+    with index.lock:
+        semantic.update(index.score(text.keys() - semantic.keys(), query_vector))
+
+    weight = settings.SEMANTIC_HYBRID_WEIGHT
+    scores = {
+        entry_id: weight * semantic.get(entry_id, 0.0)
+        + (1 - weight) * text.get(entry_id, 0.0)
+        for entry_id in semantic.keys() | text.keys()
+    }
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
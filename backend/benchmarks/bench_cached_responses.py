@@ -0,0 +1,123 @@
+"""Cached list responses: raw JSON bytes vs the old parse-and-revalidate path.
+
+Before: the cached string was json.loads'd and returned as a dict, so
+FastAPI validated it against EntryListResponse and serialized it again.
+After: cached_json_response returns the stored bytes as-is. Both routes
+run in one in-process app driven through httpx's ASGI transport, against
+the configured Redis:
+
+    python -m benchmarks.bench_cached_responses --page-size 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+import httpx
+from fastapi import FastAPI
+from app.core.cache import cached_json_response, local_cache
+from app.core.redis import redis_client
+from app.schemas.entry import EntryListResponse, EntryResponse, Pagination
+from benchmarks.common import summarize
+
+BEFORE_KEY = "bench:before:page"
+AFTER_KEY = "bench:after:page"
+
+
+def sample_page(size: int) -> EntryListResponse:
+    user_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    tags = [
+        {"id": uuid.uuid4(), "user_id": user_id, "name": f"tag-{i}", "created_at": now}
+        for i in range(3)
+    ]
+    entries = [
+        EntryResponse(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            title=f"Entry {i}: notes on caching",
+            content_type="link",
+            url=f"https://example.com/articles/{i}",
+            content="Cached responses should skip validation. " * 20,
+            metadata={"description": "An article", "image": "", "site_name": "Ex"},
+            ai_summary="A short summary of the article. " * 3,
+            summary_status="completed",
+            enrichment_status="completed",
+            created_at=now,
+            updated_at=now,
+            tags=tags,
+        )
+        for i in range(size)
+    ]
+    return EntryListResponse(
+        data=entries,
+        pagination=Pagination(page=1, limit=size, total=10 * size, pages=10),
+    )
+
+
+def build_app(page: EntryListResponse) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=EntryListResponse)
+    async def before():
+        cached = redis_client.get(BEFORE_KEY)
+        if cached:
+            return json.loads(cached)
+        redis_client.setex(BEFORE_KEY, 300, json.dumps(page.model_dump(), default=str))
+        return page
+
+    @app.get("/after", response_model=EntryListResponse)
+    async def after():
+        return await cached_json_response("bench", AFTER_KEY, lambda: page, 300)
+
+    return app
+
+
+def clear():
+    redis_client.delete(BEFORE_KEY, AFTER_KEY)
+    local_cache.clear()
+
+
+async def run(client: httpx.AsyncClient, path: str, requests: int, miss: bool):
+    await client.get(path)
+    samples = []
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        if miss:
+            clear()
+        started = time.perf_counter()
+        response = await client.get(path)
+        samples.append(time.perf_counter() - started)
+        response.raise_for_status()
+    cpu = (time.process_time() - cpu_started) / requests
+    return samples, cpu
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    page = sample_page(args.page_size)
+    transport = httpx.ASGITransport(app=build_app(page))
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        clear()
+        before = (await client.get("/before")).json()
+        after = (await client.get("/after")).json()
+        assert before == after, "both paths must return the same document"
+
+        for miss in (False, True):
+            print("misses" if miss else "hits")
+            for path in ("/before", "/after"):
+                samples, cpu = await run(client, path, args.requests, miss)
+                print(f"  {path:8} {summarize(samples)} cpu={cpu * 1000:6.2f}ms/req")
+        clear()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""Memory and throughput of the streaming export over a large vault.
+
+Seeds (or reuses) a vault of ``--entries`` synthetic entries, then drains
+export_entries the way StreamingResponse would, sampling RSS as it goes.
+Fails if RSS grows by more than ``--max-growth-mb`` over the run:
+
+    python -m benchmarks.bench_export --entries 1000000 --format csv --gzip
+"""
+
+import argparse
+import sys
+import time
+from app.core.database import SessionLocal
+from app.services.export_service import export_entries
+from benchmarks.common import current_rss_mb, peak_rss_mb
+from benchmarks.seed import drop_vault, seed_vault
+
+SAMPLE_EVERY = 200
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv", "json"], default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--max-growth-mb", type=float, default=100.0)
+    parser.add_argument("--drop", action="store_true", help="delete the vault after")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        user_id = seed_vault(db, args.entries)
+    finally:
+        db.close()
+
+    baseline = current_rss_mb()
+    highest = baseline
+    size = 0
+    started = time.perf_counter()
+    stream = export_entries(user_id, args.format, args.gzip, args.batch_size)
+    for i, chunk in enumerate(stream):
+        size += len(chunk)
+        if i % SAMPLE_EVERY == 0:
+            highest = max(highest, current_rss_mb())
+    elapsed = time.perf_counter() - started
+    highest = max(highest, current_rss_mb())
+
+    print(
+        f"exported {args.entries} entries as {args.format}"
+        f"{'.gz' if args.gzip else ''}: {size / 1024 / 1024:.1f} MiB "
+        f"in {elapsed:.1f}s ({args.entries / elapsed:,.0f} entries/s)"
+    )
+    print(
+        f"RSS before={baseline:.0f}MiB highest={highest:.0f}MiB "
+        f"growth={highest - baseline:.0f}MiB (process peak {peak_rss_mb():.0f}MiB)"
+    )
+
+    if args.drop:
+        db = SessionLocal()
+        try:
+            drop_vault(db, args.entries)
+        finally:
+            db.close()
+
+    if highest - baseline > args.max_growth_mb:
+        print(f"RSS grew by more than {args.max_growth_mb:.0f}MiB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Head-only lxml extractor vs the old full-document BeautifulSoup parse.
+
+Each fixture in fixtures/html is a saved <head>; a synthetic body of
+``--body-kb`` is appended so the cost of parsing the whole page shows up.
+The extractor is fed in network-sized chunks and stops at </head>, like
+load_url_metadata. The old path needs beautifulsoup4, which is no longer
+in requirements.txt:
+
+    pip install beautifulsoup4
+    python -m benchmarks.bench_html_metadata --body-kb 2048
+"""
+
+import argparse
+import os
+import tracemalloc
+from app.services.html_metadata import HeadMetadataExtractor, detect_charset
+from benchmarks.common import measure, summarize
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+CHUNK_BYTES = 16 * 1024
+COMPARED_FIELDS = ("title", "description", "image")
+
+
+def synthetic_body(size: int) -> bytes:
+    paragraph = (
+        '<div class="post"><h2>Section</h2><p>Lorem ipsum dolor sit amet, '
+        '<a href="/next">consectetur</a> adipiscing elit, sed do eiusmod '
+        "tempor <em>incididunt</em> ut labore et dolore magna aliqua.</p>"
+        '<img src="/img/figure.png" alt="figure"></div>\n'
+    ).encode()
+    return paragraph * (size // len(paragraph) + 1) + b"</body></html>"
+
+
+def soup_metadata(html: bytes) -> dict:
+    """The pre-streaming implementation from fetch_url_metadata"""
+    from bs4 import BeautifulSoup
+
+    text = html.decode(detect_charset("", html) or "utf-8", errors="replace")
+    soup = BeautifulSoup(text, "html.parser")
+
+    title = soup.find("title")
+    meta_description = soup.find("meta", attrs={"name": "description"})
+    og_image = soup.find("meta", attrs={"property": "og:image"})
+    return {
+        "title": (title.get_text(strip=True) if title else "")[:500],
+        "description": (
+            meta_description.get("content", "") if meta_description else ""
+        )[:1000],
+        "image": og_image.get("content", "") if og_image else "",
+    }
+
+
+def head_metadata(html: bytes):
+    """Stream ``html`` through the extractor; returns (metadata, bytes read)"""
+    extractor = HeadMetadataExtractor("text/html")
+    read = 0
+    for start in range(0, len(html), CHUNK_BYTES):
+        chunk = html[start : start + CHUNK_BYTES]
+        read += len(chunk)
+        if extractor.feed(chunk):
+            break
+    return extractor.close(), read
+
+
+def peak_alloc_kb(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=FIXTURES)
+    parser.add_argument("--body-kb", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        import bs4  # noqa: F401
+
+        baseline = True
+    except ImportError:
+        print("beautifulsoup4 not installed; timing the extractor only\n")
+        baseline = False
+
+    body = synthetic_body(args.body_kb * 1024)
+    for name in sorted(os.listdir(args.fixtures)):
+        with open(os.path.join(args.fixtures, name), "rb") as f:
+            html = f.read() + body
+
+        metadata, read = head_metadata(html)
+        print(f"{name} ({len(html) // 1024} KiB, extractor read {read // 1024} KiB)")
+        samples = measure(lambda: head_metadata(html), args.repeat)
+        print(
+            f"  head/lxml  {summarize(samples)} "
+            f"peak={peak_alloc_kb(lambda: head_metadata(html)):9.0f}KiB"
+        )
+        if not baseline:
+            continue
+
+        samples = measure(lambda: soup_metadata(html), args.repeat)
+        print(
+            f"  full/bs4   {summarize(samples)} "
+            f"peak={peak_alloc_kb(lambda: soup_metadata(html)):9.0f}KiB"
+        )
+        # The extractor also falls back to OpenGraph/Twitter fields, so only
+        # values the old parser found are compared
+        expected = soup_metadata(html)
+        for field in COMPARED_FIELDS:
+            if expected[field] and metadata[field] != expected[field]:
+                print(f"  {field} differs: {metadata[field]!r} != {expected[field]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""MinHash signature throughput and quality against exact Jaccard.
+
+The default corpus is generated from a fixed seed: base documents plus
+variants with a growing share of words replaced, so pair similarities
+cover the whole 0..1 range. ``--corpus`` takes an NDJSON export from
+GET /entries/export instead. Reports signatures per second, the error of
+the estimate per Jaccard band, how often LSH makes similar pairs
+candidates, and recall of the top related entries:
+
+    python -m benchmarks.bench_related --documents 1000
+"""
+
+import argparse
+import json
+import random
+import time
+from itertools import combinations
+import numpy as np
+from app.services.related_service import (
+    RELATED_LIMIT,
+    RELATED_MIN_SIMILARITY,
+    estimated_similarity,
+    lsh_buckets,
+    minhash_signature,
+    shingles,
+)
+
+VARIANT_EDIT_RATES = (0.05, 0.2, 0.4, 0.7)
+BANDS = ((0.0, 0.1), (0.1, 0.4), (0.4, 0.7), (0.7, 1.01))
+
+
+def synthetic_corpus(documents: int, seed: int = 20261017):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i:04d}" for i in range(5000)]
+    texts = []
+    while len(texts) < documents:
+        base = rng.sample(vocabulary, rng.randint(40, 200))
+        texts.append(" ".join(base))
+        for rate in VARIANT_EDIT_RATES:
+            variant = [
+                w if rng.random() > rate else rng.choice(vocabulary) for w in base
+            ]
+            texts.append(" ".join(variant))
+    return texts[:documents]
+
+
+def exported_corpus(path: str, documents: int):
+    texts = []
+    with open(path) as f:
+        for line in f:
+            row = json.loads(line)
+            parts = (row.get("title"), row.get("ai_summary"), row.get("content"))
+            texts.append("\n".join(p for p in parts if p))
+            if len(texts) == documents:
+                break
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--corpus", help="NDJSON export to use instead")
+    args = parser.parse_args()
+
+    if args.corpus:
+        texts = exported_corpus(args.corpus, args.documents)
+    else:
+        texts = synthetic_corpus(args.documents)
+
+    started = time.perf_counter()
+    signatures = [minhash_signature(text) for text in texts]
+    buckets = [set(lsh_buckets(s)) if s is not None else set() for s in signatures]
+    elapsed = time.perf_counter() - started
+    chars = sum(len(text) for text in texts)
+    print(
+        f"signed {len(texts)} documents ({chars / len(texts):.0f} chars avg) "
+        f"in {elapsed:.2f}s: {len(texts) / elapsed:,.0f} signatures/s"
+    )
+
+    sets = [set(shingles(text).tolist()) for text in texts]
+    indices = [i for i, s in enumerate(signatures) if s is not None]
+    errors = {band: [] for band in BANDS}
+    candidates = {band: [] for band in BANDS}
+    exact = np.zeros((len(texts), len(texts)))
+    estimate = np.zeros((len(texts), len(texts)))
+    for i, j in combinations(indices, 2):
+        jaccard = len(sets[i] & sets[j]) / len(sets[i] | sets[j])
+        estimated = estimated_similarity(signatures[i], signatures[j])
+        exact[i, j] = exact[j, i] = jaccard
+        # Only pairs that share a bucket are ever scored
+        if buckets[i] & buckets[j]:
+            estimate[i, j] = estimate[j, i] = estimated
+        band = next(b for b in BANDS if b[0] <= jaccard < b[1])
+        errors[band].append(abs(estimated - jaccard))
+        candidates[band].append(bool(buckets[i] & buckets[j]))
+
+    print("exact Jaccard   pairs      mean |err|  max |err|  LSH candidates")
+    for band in BANDS:
+        if not errors[band]:
+            continue
+        print(
+            f"  {band[0]:.1f}-{min(band[1], 1.0):.1f}  {len(errors[band]):10d}  "
+            f"{np.mean(errors[band]):10.4f}  {np.max(errors[band]):9.4f}  "
+            f"{np.mean(candidates[band]):13.1%}"
+        )
+
+    # Top related entries as served (LSH candidates ranked by the estimate)
+    # against the true neighbours by exact Jaccard
+    hits = total = 0
+    for i in indices:
+        truth = [j for j in np.argsort(-exact[i]) if exact[i, j] >= 0.4]
+        truth = set(truth[:RELATED_LIMIT])
+        served = [
+            j
+            for j in np.argsort(-estimate[i])
+            if estimate[i, j] >= RELATED_MIN_SIMILARITY
+        ]
+        hits += len(truth & set(served[:RELATED_LIMIT]))
+        total += len(truth)
+    if total:
+        print(f"recall of neighbours with Jaccard >= 0.4: {hits / total:.1%}")
+
+
+if __name__ == "__main__":
+    main()
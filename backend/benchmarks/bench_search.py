@@ -0,0 +1,93 @@
+"""Full-text search over a large vault, with the plans Postgres picks.
+
+Seeds (or reuses) a vault of ``--entries`` synthetic entries and calls
+GET /entries/search in-process for each term, bumping the user's cache
+generation so every request reaches the database. Each statement that
+filters on search_vector is then run under EXPLAIN ANALYZE; the run fails
+if none of them uses the GIN index:
+
+    python -m benchmarks.bench_search --entries 1000000 --compare-old
+"""
+
+import argparse
+import sys
+from sqlalchemy import text
+from app.core.cache import bump_generation
+from app.core.database import SessionLocal
+from benchmarks.common import StatementLog, api_client, explain, measure, summarize
+from benchmarks.seed import seed_vault
+
+GIN_INDEX = "idx_entries_search_vector"
+# From common to rare; each title ends in its row number, which matches once
+TERMS = ["postgres", "latency cache", '"cache notes"', "kubernetes -docker"]
+
+# What search_entries ran before the stored column: no index can serve it
+_OLD_EXPRESSION_COUNT = text(
+    """
+    EXPLAIN (ANALYZE, BUFFERS)
+    SELECT count(*) FROM entries
+    WHERE user_id = :user_id
+      AND to_tsvector('english', coalesce(title, '') || ' ' ||
+          coalesce(content, '') || ' ' || coalesce(ai_summary, ''))
+          @@ websearch_to_tsquery('english', :q)
+    """
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--terms", nargs="+")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--compare-old", action="store_true")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        user_id = seed_vault(db, args.entries)
+    finally:
+        db.close()
+
+    client, headers = api_client(user_id)
+    terms = args.terms or TERMS + [str(args.entries // 3)]
+
+    def search(q):
+        bump_generation(user_id)
+        response = client.get(
+            "/api/v1/entries/search", params={"q": q}, headers=headers
+        )
+        response.raise_for_status()
+        return response
+
+    index_used = False
+    for q in terms:
+        with StatementLog() as log:
+            total = search(q).json()["pagination"]["total"]
+        samples = measure(lambda: search(q), args.repeat)
+        print(f"q={q!r} total={total}")
+        print(f"  uncached request {summarize(samples)}")
+
+        for statement, parameters in log.statements:
+            if "search_vector @@" not in statement:
+                continue
+            plan = explain(statement, parameters)
+            uses_index = GIN_INDEX in plan
+            index_used = index_used or uses_index
+            print(f"  {'uses' if uses_index else 'DOES NOT use'} {GIN_INDEX}:")
+            print("    " + plan.replace("\n", "\n    "))
+
+        if args.compare_old:
+            db = SessionLocal()
+            try:
+                rows = db.execute(_OLD_EXPRESSION_COUNT, {"user_id": user_id, "q": q})
+                print("  old per-row to_tsvector count:")
+                print("    " + "\n    ".join(row[0] for row in rows))
+            finally:
+                db.close()
+
+    if not index_used:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Typeahead latency over a large vault, keystroke by keystroke.
+
+Seeds (or reuses) a vault of ``--entries`` synthetic entries and types
+each word into GET /entries/suggest one character at a time, in-process.
+Every keystroke is timed uncached (the user's cache generation is bumped
+first, off the clock) and again cached. The plans for the last keystroke
+of each word are printed with ``--plans``. Exits non-zero if the uncached
+p50 misses ``--target-ms``:
+
+    python -m benchmarks.bench_suggest --entries 1000000
+"""
+
+import argparse
+import sys
+from app.core.cache import bump_generation
+from app.core.database import SessionLocal
+from benchmarks.common import (
+    StatementLog,
+    api_client,
+    explain,
+    measure,
+    percentile,
+    summarize,
+)
+from benchmarks.seed import seed_vault
+
+# Whole words, a tag prefix and a typo the trigram match should absorb
+WORDS = ["kubernetes", "typography", "topic-gui", "postgers", "latency notes 42"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--words", nargs="+", default=WORDS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=20.0)
+    parser.add_argument("--plans", action="store_true", help="print EXPLAIN output")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        user_id = seed_vault(db, args.entries)
+    finally:
+        db.close()
+
+    client, headers = api_client(user_id)
+
+    def suggest(q):
+        response = client.get(
+            "/api/v1/entries/suggest", params={"q": q}, headers=headers
+        )
+        response.raise_for_status()
+        return response
+
+    uncached, cached = [], []
+    for word in args.words:
+        for end in range(1, len(word) + 1):
+            q = word[:end]
+            # The bump is a Redis write of its own, so it stays off the clock
+            for _ in range(args.repeat):
+                bump_generation(user_id)
+                uncached += measure(lambda: suggest(q), 1, warmup=0)
+            cached += measure(lambda: suggest(q), args.repeat)
+
+        bump_generation(user_id)
+        with StatementLog() as log:
+            body = suggest(word).json()
+        top = body["entries"][0]["title"] if body["entries"] else None
+        print(f"{word!r}: top entry {top!r}, {len(body['tags'])} tags")
+        if args.plans:
+            for statement, parameters in log.statements:
+                if "suggest_terms" in statement or "similarity" in statement:
+                    plan = explain(statement, parameters)
+                    print("    " + plan.replace("\n", "\n    "))
+
+    print(f"uncached {summarize(uncached)}")
+    print(f"cached   {summarize(cached)}")
+    if percentile(uncached, 50) * 1000 > args.target_ms:
+        print(f"uncached p50 is over the {args.target_ms:.0f}ms target")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
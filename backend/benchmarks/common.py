@@ -0,0 +1,92 @@
+import os
+import resource
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> List[float]:
+    """Wall-clock seconds for each of ``repeat`` calls, after a warmup"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> str:
+    """p50/p99/mean in milliseconds"""
+    return (
+        f"p50={percentile(samples, 50) * 1000:8.2f}ms "
+        f"p99={percentile(samples, 99) * 1000:8.2f}ms "
+        f"mean={statistics.mean(samples) * 1000:8.2f}ms"
+    )
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (Linux reports KiB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process right now (Linux only)"""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class StatementLog:
+    """Records the SQL the app's engine sends while active"""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, object]] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        from sqlalchemy import event
+        from app.core.database import engine
+
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        from app.core.database import engine
+
+        event.remove(engine, "before_cursor_execute", self._record)
+
+
+def explain(statement: str, parameters) -> str:
+    """EXPLAIN ANALYZE a captured statement with its original parameters"""
+    from app.core.database import engine
+
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+        conn.rollback()
+        return plan
+    finally:
+        conn.close()
+
+
+def api_client(user_id):
+    """In-process client for the app, authenticated as ``user_id``"""
+    from fastapi.testclient import TestClient
+    from app.core.security import create_access_token
+    from app.main import app
+
+    token = create_access_token(data={"sub": str(user_id)})
+    return TestClient(app), {"Authorization": f"Bearer {token}"}
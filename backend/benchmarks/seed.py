@@ -0,0 +1,130 @@
+"""Synthetic vaults for the database benchmarks.
+
+Rows are generated inside Postgres with generate_series, so seeding a
+million entries takes minutes rather than hours. A vault is keyed by its
+size and reused by later runs until ``drop_vault`` removes it.
+"""
+
+import time
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.services.stats_service import reconcile_entry_counts
+
+WORDS = (
+    "python postgres redis async cache index query search vector token "
+    "stream cursor export import parser lexer compiler runtime memory thread "
+    "process socket kernel network latency throughput benchmark profile trace "
+    "garden recipe coffee travel music guitar piano novel poetry history "
+    "physics biology chemistry climate ocean forest mountain river desert "
+    "design typography color layout grid motion sketch prototype research "
+    "startup pricing marketing hiring roadmap retro feedback meeting budget "
+    "rust golang haskell kotlin swift docker kubernetes terraform linux git"
+).split()
+
+BATCH_ROWS = 100_000
+
+_INSERT_ENTRIES = text(
+    """
+    INSERT INTO entries (
+        id, user_id, title, content_type, url, canonical_url, url_hash,
+        content, metadata, summary_status, enrichment_status,
+        created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(), :user_id,
+        initcap(w[1 + (g * 7) % n]) || ' ' || w[1 + (g * 13) % n] || ' '
+            || w[1 + (g * 31) % n] || ' notes ' || g,
+        (ARRAY['link', 'note', 'repo'])[1 + g % 3],
+        'https://' || w[1 + (g * 17) % n] || '.example.com/'
+            || w[1 + (g * 29) % n] || '/' || g,
+        'https://' || w[1 + (g * 17) % n] || '.example.com/'
+            || w[1 + (g * 29) % n] || '/' || g,
+        encode(sha256(convert_to('https://' || w[1 + (g * 17) % n]
+            || '.example.com/' || w[1 + (g * 29) % n] || '/' || g, 'UTF8')), 'hex'),
+        'Thoughts on ' || w[1 + (g * 3) % n] || ' and ' || w[1 + (g * 11) % n]
+            || '. The ' || w[1 + (g * 19) % n] || ' ' || w[1 + (g * 23) % n]
+            || ' approach beats plain ' || w[1 + (g * 37) % n] || ' for '
+            || w[1 + (g * 41) % n] || ' workloads.',
+        '{}'::jsonb, 'pending', 'skipped',
+        now() - g * interval '1 minute', now() - g * interval '1 minute'
+    FROM generate_series(CAST(:low AS int), CAST(:high AS int)) AS g,
+        (SELECT CAST(:words AS text[]) AS w, CAST(:n AS int) AS n) AS vocabulary
+    """
+)
+
+_INSERT_TAGS = text(
+    """
+    INSERT INTO tags (id, user_id, name, usage_count, created_at)
+    SELECT gen_random_uuid(), :user_id, 'topic-' || w, 0, now()
+    FROM unnest(CAST(:words AS text[])) AS w
+    """
+)
+
+# Tags spread deterministically from the entry id's hash
+_INSERT_ENTRY_TAGS = text(
+    """
+    INSERT INTO entry_tags (entry_id, tag_id)
+    SELECT DISTINCT e.id, t.ids[1 + (abs(hashtext(e.id::text)) + i * 7) % t.n]
+    FROM entries e,
+        generate_series(0, :per_entry - 1) AS i,
+        (SELECT array_agg(id) AS ids, count(*)::int AS n
+         FROM tags WHERE user_id = :user_id) AS t
+    WHERE e.user_id = :user_id
+    """
+)
+
+
+def vault_email(count: int) -> str:
+    return f"bench-{count}@example.com"
+
+
+def seed_vault(db: Session, count: int, tags_per_entry: int = 2) -> UUID:
+    """Return the id of a user owning ``count`` synthetic entries"""
+    user = db.query(User).filter(User.email == vault_email(count)).first()
+    if user:
+        return user.id
+
+    user = User(
+        email=vault_email(count),
+        username=f"bench-{count}",
+        password_hash="not-a-real-hash",
+    )
+    db.add(user)
+    db.commit()
+
+    started = time.perf_counter()
+    for low in range(1, count + 1, BATCH_ROWS):
+        high = min(count, low + BATCH_ROWS - 1)
+        db.execute(
+            _INSERT_ENTRIES,
+            {
+                "user_id": user.id,
+                "low": low,
+                "high": high,
+                "words": WORDS,
+                "n": len(WORDS),
+            },
+        )
+        db.commit()
+        print(f"  seeded {high}/{count} entries ({time.perf_counter() - started:.0f}s)")
+
+    db.execute(_INSERT_TAGS, {"user_id": user.id, "words": WORDS})
+    db.execute(_INSERT_ENTRY_TAGS, {"user_id": user.id, "per_entry": tags_per_entry})
+    reconcile_entry_counts(db, user.id)
+    db.commit()
+
+    # Fresh statistics so the planner sees the new rows
+    db.execute(text("ANALYZE entries"))
+    db.execute(text("ANALYZE entry_tags"))
+    db.execute(text("ANALYZE tags"))
+    db.commit()
+    print(f"  seeded vault in {time.perf_counter() - started:.0f}s")
+    return user.id
+
+
+def drop_vault(db: Session, count: int):
+    """Delete a seeded vault; entries and tags go with the user"""
+    db.query(User).filter(User.email == vault_email(count)).delete()
+    db.commit()
@@ -0,0 +1,77 @@
+import os
+import uuid
+
+# Jobs queue in-process; nothing drains them during API tests
+os.environ.setdefault("ENRICHMENT_QUEUE_BACKEND", "local")
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.core.database import SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models.user import User
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_db():
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    # No lifespan: the enrichment workers and pub/sub listener stay off
+    return TestClient(app)
+
+
+@pytest.fixture
+def user(db):
+    suffix = uuid.uuid4().hex[:12]
+    user = User(
+        email=f"{suffix}@example.com",
+        username=f"user-{suffix}",
+        password_hash="not-a-real-hash",
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    token = create_access_token(data={"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+class QueryCounter:
+    """Counts the SQL statements the app's engine sends"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter)
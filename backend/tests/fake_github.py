@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+class FakeGitHub:
+    """Local stand-in for the GitHub repos API, served on a real socket.
+
+    Tests set ``status``, ``headers`` and ``delay`` to script the next
+    responses and read ``requests`` to see what the client actually sent.
+    """
+
+    etag = '"v1"'
+
+    def __init__(self):
+        self.status = 200
+        self.headers: Dict[str, str] = {}
+        self.delay = 0.0
+        self.requests: List[Dict[str, str]] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.requests.append({"path": self.path, **dict(self.headers)})
+                time.sleep(fake.delay)
+
+                status = fake.status
+                if status == 200 and self.headers.get("If-None-Match") == fake.etag:
+                    status = 304
+                owner, repo = self.path.split("/")[2:4]
+                body = b""
+                if status == 200:
+                    body = json.dumps(
+                        {
+                            "name": repo,
+                            "full_name": f"{owner}/{repo}",
+                            "description": "A fake repository",
+                            "stargazers_count": 42,
+                            "language": "Python",
+                            "forks_count": 7,
+                            "html_url": f"https://github.com/{owner}/{repo}",
+                        }
+                    ).encode()
+                elif status != 304:
+                    body = b'{"message": "API rate limit exceeded"}'
+
+                self.send_response(status)
+                self.send_header("ETag", fake.etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in fake.headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,149 @@
+import json
+import pytest
+from app.core import cache
+from app.core.cache import cache_stats, get_generation
+
+API = "/api/v1"
+
+
+def redis_misses(namespace="entries"):
+    return cache_stats().get(f"{namespace}.redis", {}).get("misses", 0)
+
+
+@pytest.fixture
+def entry(client, auth_headers):
+    response = client.post(
+        f"{API}/entries",
+        json={"title": "Cache test", "content_type": "note", "content": "hello"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+def tag(client, auth_headers):
+    response = client.post(f"{API}/tags", json={"name": "cached"}, headers=auth_headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+def assert_invalidates(client, user, auth_headers):
+    """Run a write and check it bumped the generation and missed the cache"""
+
+    def check(write, expected_status):
+        client.get(f"{API}/entries", headers=auth_headers)
+        misses = redis_misses()
+        assert client.get(f"{API}/entries", headers=auth_headers).status_code == 200
+        assert redis_misses() == misses, "warm read should be served from cache"
+
+        generation = get_generation(user.id)
+        response = write()
+        assert response.status_code == expected_status, response.text
+        assert get_generation(user.id) > generation
+
+        assert client.get(f"{API}/entries", headers=auth_headers).status_code == 200
+        assert redis_misses() == misses + 1, "read after a write should miss"
+        return response
+
+    return check
+
+
+def test_create_entry(client, auth_headers, assert_invalidates):
+    assert_invalidates(
+        lambda: client.post(
+            f"{API}/entries",
+            json={"title": "New", "content_type": "note", "content": "text"},
+            headers=auth_headers,
+        ),
+        201,
+    )
+
+
+def test_import_entries(client, auth_headers, assert_invalidates):
+    body = "\n".join(
+        json.dumps({"title": f"Imported {i}", "content_type": "note"}) for i in range(3)
+    )
+    response = assert_invalidates(
+        lambda: client.post(
+            f"{API}/entries/import",
+            content=body,
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        ),
+        200,
+    )
+    assert response.json()["imported"] == 3
+
+
+def test_update_entry(client, auth_headers, entry, assert_invalidates):
+    assert_invalidates(
+        lambda: client.put(
+            f"{API}/entries/{entry['id']}",
+            json={"title": "Renamed"},
+            headers=auth_headers,
+        ),
+        200,
+    )
+
+
+def test_delete_entry(client, auth_headers, entry, assert_invalidates):
+    assert_invalidates(
+        lambda: client.delete(f"{API}/entries/{entry['id']}", headers=auth_headers),
+        204,
+    )
+
+
+def test_create_tag(client, auth_headers, assert_invalidates):
+    assert_invalidates(
+        lambda: client.post(f"{API}/tags", json={"name": "new"}, headers=auth_headers),
+        201,
+    )
+
+
+def test_assign_tag(client, auth_headers, entry, tag, assert_invalidates):
+    assert_invalidates(
+        lambda: client.post(
+            f"{API}/entries/{entry['id']}/tags/{tag['id']}", headers=auth_headers
+        ),
+        201,
+    )
+
+
+def test_remove_tag(client, auth_headers, entry, tag, assert_invalidates):
+    path = f"{API}/entries/{entry['id']}/tags/{tag['id']}"
+    assert client.post(path, headers=auth_headers).status_code == 201
+    assert_invalidates(lambda: client.delete(path, headers=auth_headers), 204)
+
+
+@pytest.mark.parametrize("action", ["add", "remove"])
+def test_batch_tag_entries(
+    client, auth_headers, entry, tag, assert_invalidates, action
+):
+    if action == "remove":
+        path = f"{API}/entries/{entry['id']}/tags/{tag['id']}"
+        assert client.post(path, headers=auth_headers).status_code == 201
+    assert_invalidates(
+        lambda: client.post(
+            f"{API}/entries/tags:batch",
+            json={"entry_ids": [entry["id"]], "tag_ids": [tag["id"]], "action": action},
+            headers=auth_headers,
+        ),
+        200,
+    )
+
+
+def test_generation_read_racing_a_bump_is_not_kept(user, monkeypatch):
+    key = f"cache:gen:{user.id}"
+    cache.local_cache.invalidate_tag(str(user.id))
+
+    class RacingRedis:
+        """Answers with the old generation, then the bump's message lands"""
+
+        def get(self, name):
+            cache.local_cache.invalidate_tag(str(user.id))
+            return "5"
+
+    monkeypatch.setattr(cache, "redis_client", RacingRedis())
+    assert get_generation(user.id) == 5
+    assert cache.local_cache.get(key) is None
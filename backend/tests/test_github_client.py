@@ -0,0 +1,93 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from fake_github import FakeGitHub
+from app.core.http import OutboundClient
+from app.core.redis import redis_client
+from app.services.github_client import (
+    RATE_LIMIT_KEY,
+    GitHubClient,
+    GitHubRateLimited,
+)
+
+
+@pytest.fixture
+def fake_github():
+    redis_client.delete(RATE_LIMIT_KEY)
+    server = FakeGitHub()
+    server.start()
+    yield server
+    server.stop()
+    redis_client.delete(RATE_LIMIT_KEY)
+
+
+@pytest_asyncio.fixture
+async def github(fake_github):
+    http = OutboundClient()
+    yield GitHubClient(http=http, api_url=fake_github.url, token="test-token")
+    await http.close()
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_returns_not_modified(fake_github, github):
+    first = await github.get_repo("octo", "demo")
+    assert first.metadata["full_name"] == "octo/demo"
+    assert first.etag == FakeGitHub.etag
+
+    second = await github.get_repo("octo", "demo", etag=first.etag)
+    assert second.not_modified
+    assert second.etag == FakeGitHub.etag
+    assert "If-None-Match" not in fake_github.requests[0]
+    assert fake_github.requests[1]["If-None-Match"] == FakeGitHub.etag
+    assert fake_github.requests[1]["Authorization"] == "Bearer test-token"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_request(fake_github, github):
+    fake_github.delay = 0.2
+    results = await asyncio.gather(
+        *(github.get_repo("octo", "Demo" if i % 2 else "demo") for i in range(10))
+    )
+    assert len(fake_github.requests) == 1
+    assert all(result is results[0] for result in results)
+
+    # Once the shared request finished, later lookups go out again
+    await github.get_repo("octo", "demo")
+    assert len(fake_github.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_stops_requests_until_reset(fake_github, github):
+    reset = int(time.time()) + 60
+    fake_github.headers = {
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(reset),
+    }
+
+    # The last request in the window still succeeds
+    result = await github.get_repo("octo", "demo")
+    assert result.metadata["name"] == "demo"
+
+    with pytest.raises(GitHubRateLimited) as exc_info:
+        await github.get_repo("octo", "other")
+    assert exc_info.value.retry_at == reset
+    assert len(fake_github.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_shared_across_workers(fake_github, github):
+    fake_github.status = 403
+    fake_github.headers = {"Retry-After": "30", "X-RateLimit-Remaining": "10"}
+
+    before = time.time()
+    with pytest.raises(GitHubRateLimited) as exc_info:
+        await github.get_repo("octo", "demo")
+    assert before + 30 <= exc_info.value.retry_at <= time.time() + 30
+
+    # Another worker's client sees the shared back-off and doesn't call out
+    other = GitHubClient(http=github.http, api_url=fake_github.url)
+    with pytest.raises(GitHubRateLimited) as exc_info:
+        await other.get_repo("octo", "demo")
+    assert exc_info.value.retry_at == pytest.approx(before + 30, abs=2)
+    assert len(fake_github.requests) == 1
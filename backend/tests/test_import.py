@@ -0,0 +1,43 @@
+import asyncio
+import threading
+from app.services import import_service
+
+
+def test_batches_are_written_off_the_event_loop(db, user, monkeypatch):
+    write_threads = []
+    write_batch = import_service._write_batch
+
+    def recording_write_batch(*args):
+        write_threads.append(threading.get_ident())
+        return write_batch(*args)
+
+    monkeypatch.setattr(import_service, "_write_batch", recording_write_batch)
+
+    async def rows():
+        for i in range(3):
+            yield i + 1, {"title": f"Imported {i}", "content_type": "note"}
+
+    async def run():
+        result = await import_service.import_entries(db, user.id, rows())
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(run())
+    assert result.imported == 3
+    assert write_threads and loop_thread not in write_threads
+
+
+def test_bookmark_tags_skip_blank_names(client, auth_headers):
+    html = (
+        "<!DOCTYPE NETSCAPE-Bookmark-file-1>\n<DL><p>\n"
+        '<DT><A HREF="https://example.com/a" TAGS="a, ,b,">Example</A>\n'
+        "</DL><p>\n"
+    )
+    response = client.post(
+        "/api/v1/entries/import",
+        content=html,
+        headers={**auth_headers, "Content-Type": "text/html"},
+    )
+    assert response.json()["imported"] == 1
+
+    tags = client.get("/api/v1/tags", headers=auth_headers).json()
+    assert sorted(tag["name"] for tag in tags) == ["a", "b"]
@@ -0,0 +1,6 @@
+from app.core.config import settings
+
+
+def test_cache_metrics_hidden_outside_debug(client):
+    assert not settings.DEBUG
+    assert client.get("/metrics/cache").status_code == 404
@@ -0,0 +1,64 @@
+import json
+import pytest
+
+API = "/api/v1"
+
+# Statements per request, including the user lookup in get_current_user.
+# These must not grow with the number of entries or tags on the page.
+LIST_MAX_QUERIES = 4
+SEARCH_MAX_QUERIES = 5
+DETAIL_MAX_QUERIES = 3
+
+
+@pytest.fixture(params=[5, 60])
+def entries(request, client, auth_headers):
+    body = "\n".join(
+        json.dumps(
+            {
+                "title": f"Python notes {i}",
+                "content_type": "note",
+                "content": f"Notes about python generators, part {i}",
+                "tags": [f"tag-{i % 7}", f"tag-{i % 3}-b", "python"],
+            }
+        )
+        for i in range(request.param)
+    )
+    response = client.post(
+        f"{API}/entries/import",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.json()["imported"] == request.param
+    return client.get(f"{API}/entries?limit=100", headers=auth_headers).json()["data"]
+
+
+def counted_get(client, query_counter, path, headers):
+    query_counter.count = 0
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return response, query_counter.count
+
+
+def test_list_entries(client, auth_headers, entries, query_counter):
+    # A new page size is a new cache key, so this goes to the database
+    response, count = counted_get(
+        client, query_counter, f"{API}/entries?limit=50", auth_headers
+    )
+    assert len(response.json()["data"]) == min(len(entries), 50)
+    assert count <= LIST_MAX_QUERIES
+
+
+def test_search_entries(client, auth_headers, entries, query_counter):
+    response, count = counted_get(
+        client, query_counter, f"{API}/entries/search?q=python&limit=50", auth_headers
+    )
+    assert len(response.json()["data"]) == min(len(entries), 50)
+    assert count <= SEARCH_MAX_QUERIES
+
+
+def test_get_entry(client, auth_headers, entries, query_counter):
+    response, count = counted_get(
+        client, query_counter, f"{API}/entries/{entries[0]['id']}", auth_headers
+    )
+    assert len(response.json()["tags"]) == 3
+    assert count <= DETAIL_MAX_QUERIES
@@ -0,0 +1,66 @@
+from app.models.entry import SuggestTerm
+
+API = "/api/v1"
+
+
+def create_entry(client, auth_headers, title, url=None):
+    response = client.post(
+        f"{API}/entries",
+        json={"title": title, "content_type": "link", "url": url},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def suggested_titles(client, auth_headers, q):
+    response = client.get(
+        f"{API}/entries/suggest", params={"q": q}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    return [entry["title"] for entry in response.json()["entries"]]
+
+
+def term_counts(db, user):
+    db.expire_all()
+    rows = db.query(SuggestTerm).filter(SuggestTerm.user_id == user.id)
+    return {row.term: row.entry_count for row in rows}
+
+
+def test_suggest_finishes_and_fixes_words(client, auth_headers):
+    create_entry(client, auth_headers, "Postgres vacuum notes")
+    create_entry(client, auth_headers, "Kubernetes operators", "https://k8s.io/docs")
+
+    assert suggested_titles(client, auth_headers, "po") == ["Postgres vacuum notes"]
+    assert suggested_titles(client, auth_headers, "kube") == ["Kubernetes operators"]
+    assert suggested_titles(client, auth_headers, "postgers") == [
+        "Postgres vacuum notes"
+    ]
+    assert suggested_titles(client, auth_headers, "postgres vac") == [
+        "Postgres vacuum notes"
+    ]
+    # URL words count too; unknown words match nothing
+    assert suggested_titles(client, auth_headers, "docs") == ["Kubernetes operators"]
+    assert suggested_titles(client, auth_headers, "zzzqqq") == []
+
+
+def test_vocabulary_follows_entry_writes(client, db, user, auth_headers):
+    entry = create_entry(client, auth_headers, "Haskell lenses lenses")
+    create_entry(client, auth_headers, "Rust lenses")
+    counts = term_counts(db, user)
+    assert counts["haskell"] == 1 and counts["lenses"] == 2
+
+    response = client.put(
+        f"{API}/entries/{entry['id']}",
+        json={"title": "Rust borrowck"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    counts = term_counts(db, user)
+    assert counts["haskell"] == 0 and counts["lenses"] == 1
+    assert counts["rust"] == 2 and counts["borrowck"] == 1
+
+    response = client.delete(f"{API}/entries/{entry['id']}", headers=auth_headers)
+    assert response.status_code == 204
+    counts = term_counts(db, user)
+    assert counts["rust"] == 1 and counts["borrowck"] == 0